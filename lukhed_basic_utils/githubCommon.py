@@ -4,11 +4,154 @@ from lukhed_basic_utils import requestsCommon as rC
 from lukhed_basic_utils import timeCommon as tC
 from github import Github
 from github.Repository import Repository
-from github.GithubException import UnknownObjectException
+from github.GithubException import UnknownObjectException, GithubException
+from github.InputGitTreeElement import InputGitTreeElement
+from github.ContentFile import ContentFile
 import json
 from typing import Optional
 import zipfile
 import shutil
+import base64
+import fnmatch
+import hashlib
+import os
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+
+class GithubContentCache:
+    def __init__(self, max_memory_bytes=32 * 1024 * 1024, cache_dir=None, max_disk_bytes=256 * 1024 * 1024):
+        """
+        LRU cache of GitHub contents API responses keyed by (repo, path, ref), held in memory and optionally on
+        disk. Each entry keeps the ETag of the response so it can be revalidated with If-None-Match: GitHub answers
+        304 Not Modified (which does not count against the rate limit) and the cached data is re-used.
+
+        Parameters:
+            max_memory_bytes (int, optional): Size cap of the in-memory entries. Least recently used entries are
+                evicted beyond it. Defaults to 32 MiB.
+            cache_dir (str, optional): Directory for the on-disk cache, which survives between runs. Defaults to
+                None (memory only). Note that cached files are stored unencrypted.
+            max_disk_bytes (int, optional): Size cap of the on-disk cache, evicted by last use. Defaults to 256 MiB.
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.stats = {"hits": 0, "misses": 0, "not_modified": 0, "evictions": 0}
+        self._entries = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, hashlib.sha256(json.dumps(key).encode('utf-8')).hexdigest() + '.json')
+
+    def get(self, key):
+        """
+        Returns the cached entry {'etag': str, 'data': contents API response} for key, or None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry
+
+        if self.cache_dir is not None:
+            path = self._disk_path(key)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+                os.utime(path)
+            except (OSError, ValueError):
+                entry = None
+            if entry is not None:
+                self._remember(key, entry)
+                with self._lock:
+                    self.stats["hits"] += 1
+                return entry
+
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    def set(self, key, etag, data):
+        """
+        Stores the contents API response data with its ETag under key, a (repo, path, ref) tuple.
+        """
+        if self.cache_dir is not None:
+            path = self._disk_path(key)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({"etag": etag, "data": data}, f)
+            os.replace(temp_path, path)
+            self._prune_disk()
+        entry = {"etag": etag, "data": data}
+        self._remember(key, entry)
+        return entry
+
+    def _remember(self, key, entry):
+        size = len(json.dumps(entry["data"]))
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= previous["_size"]
+            if size > self.max_memory_bytes:
+                return
+            entry["_size"] = size
+            self._entries[key] = entry
+            self._memory_bytes += size
+            while self._memory_bytes > self.max_memory_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._memory_bytes -= evicted["_size"]
+                self.stats["evictions"] += 1
+
+    def _prune_disk(self):
+        files = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.json'):
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def record_not_modified(self):
+        with self._lock:
+            self.stats["not_modified"] += 1
+
+    def clear(self):
+        """
+        Removes all entries from memory and disk.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._memory_bytes = 0
+        if self.cache_dir is not None:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.json'):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+    def get_stats(self):
+        """
+        Returns:
+            dict: hits, misses, not_modified (revalidations answered with 304), evictions, entries and memory_bytes
+        """
+        with self._lock:
+            return dict(self.stats, entries=len(self._entries), memory_bytes=self._memory_bytes)
 
 
 class GithubHelper:
@@ -68,6 +211,9 @@ class GithubHelper:
         self.active_project = None
         self.repo = None                                        # type: Optional[Repository]
         self._gh_object = None                                  # type: Optional[Github]
+        self._file_shas = {}                                    # repo path -> blob SHA on the default branch
+        self._repo_trees = {}                                   # ref (None for default branch) -> {path: entry}
+        self._content_cache = None                              # type: Optional[GithubContentCache]
         self._check_setup()
 
         if repo_name is not None:
@@ -240,6 +386,8 @@ class GithubHelper:
     ###################
     def _activate_repo(self, repo_name):
         self.repo = self._gh_object.get_repo(self.user + "/" + repo_name)
+        self._file_shas = {}
+        self._repo_trees = {}
         self._check_print(f"INFO: {repo_name} repo was activated")
         
     def _parse_repo_dir_list_input(self, repo_dir_list):
@@ -274,9 +422,96 @@ class GithubHelper:
                 print(f"OK, no action taken to activate a repo")
                 return None
             
-    def _get_repo_contents(self, repo_path):
-        contents = self.repo.get_contents(repo_path)
-        return contents
+    def _get_repo_contents(self, repo_path, ref=None, need_content=False):
+        # need_content: the caller decodes the file. Files over 1 MB come without content from the contents API;
+        # they are then downloaded once and the cached entry is completed with the content.
+        if self._content_cache is None:
+            return self.repo.get_contents(repo_path) if ref is None else self.repo.get_contents(repo_path, ref=ref)
+
+        # Conditional request against the cached copy; a 304 answer has no body and re-uses the cached data
+        key = (self.repo.full_name, repo_path, ref or "")
+        entry = self._content_cache.get(key)
+        headers, data = self.repo.requester.requestJsonAndCheck(
+            "GET",
+            f"{self.repo.url}/contents/{urllib.parse.quote(repo_path)}",
+            parameters={"ref": ref} if ref else None,
+            headers={"If-None-Match": entry["etag"]} if entry else None,
+            follow_302_redirect=True
+        )
+        if data is None and entry is not None:
+            self._content_cache.record_not_modified()
+            etag, data, store = entry["etag"], entry["data"], False
+        else:
+            etag, store = headers.get("etag"), True
+
+        if need_content and isinstance(data, dict) and data.get("type") == "file" and not data.get("content") \
+                and data.get("download_url"):
+            response = rC.make_request(data["download_url"])
+            response.raise_for_status()
+            data = dict(data, content=base64.b64encode(response.content).decode('ascii'), encoding="base64")
+            store = True
+        if store and etag:
+            self._content_cache.set(key, etag, data)
+
+        if isinstance(data, list):
+            return [ContentFile(self.repo.requester, headers, item, completed=(item["type"] != "file"))
+                    for item in data]
+        return ContentFile(self.repo.requester, headers, data, completed=True)
+
+    def enable_content_cache(self, max_memory_bytes=32 * 1024 * 1024, cache_dir=None, max_disk_bytes=256 * 1024 * 1024):
+        """
+        Caches file and directory contents read from the repository (retrieve_file_content, file_exists,
+        get_files_in_repo_path). Every read still asks GitHub whether the content changed, using the cached ETag;
+        unchanged content is answered with 304 Not Modified, which is fast and does not count against the rate limit.
+
+        Parameters:
+            max_memory_bytes (int, optional): Size cap of the in-memory cache, LRU evicted. Defaults to 32 MiB.
+            cache_dir (str, optional): Directory to also keep the cache on disk so it survives between runs.
+                Defaults to None (memory only).
+            max_disk_bytes (int, optional): Size cap of the on-disk cache. Defaults to 256 MiB.
+
+        Returns:
+            GithubContentCache: The cache now in use.
+        """
+        self._content_cache = GithubContentCache(max_memory_bytes=max_memory_bytes, cache_dir=cache_dir,
+                                                 max_disk_bytes=max_disk_bytes)
+        return self._content_cache
+
+    def disable_content_cache(self):
+        self._content_cache = None
+
+    def _get_file_sha(self, repo_path):
+        # Blob SHA of the file, from the local cache or with one contents request. None if the file does not exist.
+        if repo_path not in self._file_shas:
+            self.retrieve_file_content(repo_path, decode=False)
+        return self._file_shas.get(repo_path)
+
+    def _with_fresh_sha(self, repo_path, write):
+        # Runs write(sha) with the known SHA of the file. A cached SHA is stale if the file was changed outside this
+        # helper; GitHub then rejects the write and it is retried once with a freshly fetched SHA.
+        cached = repo_path in self._file_shas
+        try:
+            return write(self._get_file_sha(repo_path))
+        except GithubException as e:
+            if not cached or e.status not in (404, 409, 422):
+                raise
+            self._file_shas.pop(repo_path, None)
+            return write(self._get_file_sha(repo_path))
+
+    def _put_file(self, repo_path, content, message, sha):
+        # Creates (sha None) or updates the file and keeps the new SHA from the commit response for the next write
+        if sha is None:
+            status = self.repo.create_file(path=repo_path, message=message, content=content)
+        else:
+            status = self.repo.update_file(repo_path, message=message, content=content, sha=sha)
+        self._file_shas[repo_path] = status['content'].sha
+        self._repo_trees = {}
+        return status
+
+    def _content_to_bytes(self, content):
+        if isinstance(content, (bytes, bytearray)):
+            return bytes(content)
+        return self._parse_content_for_upload(content).encode('utf-8')
     
     def create_repo(self, repo_name, description="Repo created by lukhed-basic-utils", private=True, 
                     create_readme=False, readme_content=None):
@@ -364,23 +599,73 @@ class GithubHelper:
         if activated and repo_name is not None:
             self._set_repo(repo_name)
 
-    def get_files_in_repo_path(self, path_as_list_or_str=None):
+    def _get_repo_tree(self, ref=None, refresh=False):
+        # {path: entry} for every file and directory of the branch/commit, usually from one recursive tree request.
+        # The listing is kept until refresh is requested or a file is written through this helper.
+        if refresh or ref not in self._repo_trees:
+            self._repo_trees[ref] = {path: {'path': path, 'type': x.type, 'size': x.size, 'sha': x.sha}
+                                     for path, x in self._walk_git_tree(ref or self.repo.default_branch)}
+        return self._repo_trees[ref]
+
+    def _walk_git_tree(self, tree_sha, prefix=""):
+        # Yields (full path, GitTreeElement) for everything in the tree. GitHub truncates recursive listings of very
+        # large trees (100,000 entries / 7 MB); a truncated tree is listed one level instead, and each of its
+        # subtrees recursively on its own.
+        tree = self.repo.get_git_tree(tree_sha, recursive=True)
+        if not tree.truncated:
+            for x in tree.tree:
+                yield prefix + x.path, x
+            return
+
+        for x in self.repo.get_git_tree(tree_sha).tree:
+            yield prefix + x.path, x
+            if x.type == 'tree':
+                yield from self._walk_git_tree(x.sha, prefix + x.path + "/")
+
+    def get_files_in_repo_path(self, path_as_list_or_str=None, recursive=False, pattern=None, ref=None,
+                               refresh=False):
         """
         Retrieves a list of file paths in the specified repository path.
 
+        By default only the directory itself is listed (one request per directory, and GitHub cuts the listing off
+        at 1,000 entries). With recursive=True, the whole repository is listed with one Git Trees API request and
+        everything below the path is returned. If GitHub truncates the listing (over 100,000 entries), the tree is
+        walked one directory level at a time instead, with one request per subtree. The listing is cached, and
+        file_exists answers from it without a request until a file is written through this helper or refresh=True
+        is given.
+
         Parameters:
             path_as_list_or_str (list | str, optional): Path to a directory in the repository.
             Can be provided as a list of directory segments or a single string. Defaults to None.
+            recursive (bool, optional): If True, list all files and directories below the path. Defaults to False.
+            pattern (str, optional): Glob pattern matched against the full repository path, e.g. "data/*.json".
+                Note that * also matches "/". Defaults to None (no filtering).
+            ref (str, optional): Branch, tag or commit SHA to list (recursive only). Defaults to None (default
+                branch).
+            refresh (bool, optional): If True, re-read a cached recursive listing. Defaults to False.
 
         Returns:
-            list: A list of file paths (str) found at the specified location in the repository.
+            list: A list of file paths (str) found at the specified location in the repository. With recursive=True,
+            a list of dicts with the keys 'path', 'type' ('blob' for files, 'tree' for directories), 'size'
+            (None for directories) and 'sha'.
+
+        Example:
+            >>> self.get_files_in_repo_path("games", recursive=True, pattern="*.json")
+            [{'path': 'games/2024/week1.json', 'type': 'blob', 'size': 5120, 'sha': '3b18e512...'}, ...]
         """
         repo_path = self._parse_repo_dir_list_input(path_as_list_or_str)
-        contents = self._get_repo_contents(repo_path)
 
-        return [x.path for x in contents]
+        if not recursive:
+            paths = [x.path for x in self._get_repo_contents(repo_path)]
+            if pattern is not None:
+                paths = [x for x in paths if fnmatch.fnmatchcase(x, pattern)]
+            return paths
+
+        prefix = repo_path.strip('/') + '/' if repo_path.strip('/') else ''
+        return [entry.copy() for path, entry in self._get_repo_tree(ref, refresh).items()
+                if path.startswith(prefix) and (pattern is None or fnmatch.fnmatchcase(path, pattern))]
 
-    def retrieve_file_content(self, path_as_list_or_str, decode=True):
+    def retrieve_file_content(self, path_as_list_or_str, decode=True, ref=None):
         """
         Retrieves the content of a file in the repository. Optionally decodes the content
         and returns either raw text/binary or JSON (if the file is .json).
@@ -393,6 +678,8 @@ class GithubHelper:
                 returns a Python dictionary; otherwise returns the raw decoded data. If False,
                 returns a ContentFile object. Defaults to True.
 
+            ref (str, optional): Branch, tag or commit SHA to read from. Defaults to None (default branch).
+
         Returns:
             dict | str | None: Decoded JSON object if .json file and decode=True, string content
             for other file types if decode=True, ContentFile object if decode=False, or None
@@ -407,11 +694,16 @@ class GithubHelper:
         repo_path = self._parse_repo_dir_list_input(path_as_list_or_str)
 
         try:
-            contents = self._get_repo_contents(repo_path)
+            contents = self._get_repo_contents(repo_path, ref, need_content=decode)
         except UnknownObjectException as e:
             # file not found exception
+            if ref is None:
+                self._file_shas.pop(repo_path, None)
             return None
 
+        if ref is None and not isinstance(contents, list):
+            self._file_shas[repo_path] = contents.sha
+
         if decode:
             if contents.encoding == "base64":
                 decoded = contents.decoded_content
@@ -423,14 +715,93 @@ class GithubHelper:
             else:
                 raise ValueError(f"Unexpected file encoding: {contents.encoding}")
         
-            if '.json' in repo_path:
-                return json.loads(decoded)
-            else:
-                return decoded
+            return self._decode_file_content(repo_path, decoded)
 
         else:
             return contents
 
+    def _decode_file_content(self, repo_path, decoded):
+        if '.json' in repo_path:
+            return json.loads(decoded)
+        else:
+            return decoded
+
+    def _get_tree_blob_shas(self, ref=None):
+        # path -> blob SHA for every file of the branch/commit, from a fresh recursive tree listing
+        tree = self._get_repo_tree(ref, refresh=True)
+        return {path: entry['sha'] for path, entry in tree.items() if entry['type'] == 'blob'}
+
+    def _wait_for_rate_limit(self, reserve):
+        # Sleeps until the rate limit resets when no more than reserve requests are left
+        if self._gh_object is None:
+            return
+        remaining, limit = self._gh_object.rate_limiting
+        if remaining > reserve:
+            return
+        wait_seconds = max(0, self._gh_object.rate_limiting_resettime - time.time()) + 1
+        self._check_print(f"INFO: {remaining} GitHub API requests left, waiting {wait_seconds:.0f} seconds for the "
+                          f"rate limit reset")
+        time.sleep(wait_seconds)
+
+    def retrieve_many(self, paths, max_workers=8, decode=True, use_tree=False, ref=None, min_rate_limit_remaining=50):
+        """
+        Retrieves many files from the repository in parallel and yields each one as soon as it arrives.
+
+        Files are fetched on a bounded thread pool, so only a few requests are in flight at a time no matter how many
+        paths are given. Before each request the remaining rate limit is checked (from the headers of previous
+        responses); once it drops to min_rate_limit_remaining the retrieval pauses until the limit resets.
+
+        With use_tree=True, the file SHAs are taken from one recursive tree listing and the files are fetched as git
+        blobs by SHA. Missing files are then known without a request, and files over 1 MB need no separate
+        download. Without it, each file goes through retrieve_file_content (and the content cache, if enabled).
+
+        Parameters:
+            paths (list): Paths of the files to retrieve, each as a list of directory segments or a single string.
+            max_workers (int, optional): Maximum number of concurrent requests. Defaults to 8.
+            decode (bool, optional): If True, contents are decoded as in retrieve_file_content (JSON files are
+                parsed). If False, the ContentFile (or GitBlob with use_tree) is returned. Defaults to True.
+            use_tree (bool, optional): If True, use one recursive tree listing plus blob fetches. Defaults to False.
+            ref (str, optional): Branch, tag or commit SHA to read from. Defaults to None (default branch).
+            min_rate_limit_remaining (int, optional): Number of API requests to leave untouched. Defaults to 50.
+
+        Yields:
+            tuple: (path, content) in completion order. content is None for files that do not exist.
+
+        Example:
+            >>> for path, data in self.retrieve_many([f"games/{week}.json" for week in range(1, 19)]):
+            ...     print(path, len(data))
+        """
+        repo_paths = [self._parse_repo_dir_list_input(x) for x in paths]
+        blob_shas = self._get_tree_blob_shas(ref) if use_tree else None
+
+        def fetch(repo_path):
+            if not use_tree:
+                return repo_path, self.retrieve_file_content(repo_path, decode=decode, ref=ref)
+            if repo_path not in blob_shas:
+                return repo_path, None
+            blob = self.repo.get_git_blob(blob_shas[repo_path])
+            if not decode:
+                return repo_path, blob
+            return repo_path, self._decode_file_content(repo_path, base64.b64decode(blob.content))
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        pending = set()
+        try:
+            for repo_path in repo_paths:
+                if len(pending) >= max_workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+                self._wait_for_rate_limit(min_rate_limit_remaining + len(pending))
+                pending.add(executor.submit(fetch, repo_path))
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
     def create_file(self, content, path_as_list_or_str, message="no message"):
         """
         Creates a new file in the repository with the specified content.
@@ -452,8 +823,7 @@ class GithubHelper:
         """
         repo_path = self._parse_repo_dir_list_input(path_as_list_or_str)
         content = self._parse_content_for_upload(content)
-        status = self.repo.create_file(path=repo_path, message=message, content=content)
-        return status
+        return self._put_file(repo_path, content, message, None)
 
     def delete_file(self, path_as_list_or_str, message="Delete file"):
         """
@@ -469,12 +839,16 @@ class GithubHelper:
             or an error message if deletion fails.
         """
         repo_path = self._parse_repo_dir_list_input(path_as_list_or_str)
-        try:
-            # Get the file from the repository
-            file = self.repo.get_contents(repo_path)
 
-            # Delete the file
-            status = self.repo.delete_file(path=repo_path, message=message, sha=file.sha)
+        def delete(sha):
+            if sha is None:
+                raise FileNotFoundError(f"'{repo_path}' does not exist in the repository")
+            return self.repo.delete_file(path=repo_path, message=message, sha=sha)
+
+        try:
+            status = self._with_fresh_sha(repo_path, delete)
+            self._file_shas.pop(repo_path, None)
+            self._repo_trees = {}
             return status
         except Exception as e:
             return e
@@ -500,17 +874,24 @@ class GithubHelper:
             >>> print(update_status["commit"].sha)
             83b2fa1c...
         """
+        repo_path = self._parse_repo_dir_list_input(path_as_list_or_str)
         new_content = self._parse_content_for_upload(new_content)
-        existing_contents = self.retrieve_file_content(path_as_list_or_str, decode=False)
 
-        status = self.repo.update_file(existing_contents.path, message=message, content=new_content, 
-                                       sha=existing_contents.sha)
-        return status
+        def update(sha):
+            if sha is None:
+                raise FileNotFoundError(f"'{repo_path}' does not exist in the repository")
+            return self._put_file(repo_path, new_content, message, sha)
+
+        return self._with_fresh_sha(repo_path, update)
 
     def create_update_file(self, path_as_list_or_str, content, message="create_update_file update"):
         """
         Creates a new file or updates an existing file with the given content.
 
+        The file's SHA is looked up with a single request the first time and then kept from the responses of each
+        write, so repeated writes to the same file cost one API call each. If the file was changed elsewhere in the
+        meantime, the write is retried once with the current SHA.
+
         Parameters:
             path_as_list_or_str (list | str): Path to the file in the repository, either as a list
             of directory segments or a single string.
@@ -526,16 +907,16 @@ class GithubHelper:
             >>> print(status["commit"].message)
             Updated content
         """
-        if self.file_exists(path_as_list_or_str):
-            status = self.update_file(content, path_as_list_or_str, message=message)
-        else:
-            status = self.create_file(content, path_as_list_or_str, message=message)
-
-        return status
+        repo_path = self._parse_repo_dir_list_input(path_as_list_or_str)
+        content = self._parse_content_for_upload(content)
+        return self._with_fresh_sha(repo_path, lambda sha: self._put_file(repo_path, content, message, sha))
 
     def file_exists(self, repo_dir_list):
         """
-        Checks if a file exists in the repository.
+        Checks if a file exists in the repository. If the repository was listed with
+        get_files_in_repo_path(recursive=True), the cached listing is used and no request is made. That listing is
+        only renewed by writes made through this helper, so files added or deleted elsewhere (another process, the
+        GitHub website) are not seen until get_files_in_repo_path(recursive=True, refresh=True) is called.
 
         Parameters:
             repo_dir_list (list | str): Path to the file in the repository,
@@ -544,13 +925,116 @@ class GithubHelper:
         Returns:
             bool: True if the file exists, False otherwise.
         """
-        self._parse_repo_dir_list_input(repo_dir_list)
+        repo_path = self._parse_repo_dir_list_input(repo_dir_list)
+        if None in self._repo_trees:
+            return repo_path.strip('/') == '' or repo_path.strip('/') in self._repo_trees[None]
+
         res = self.retrieve_file_content(repo_dir_list, decode=False)
         if res is None:
             return False
         else:
             return True
         
+    def commit_files(self, files, message="no message", branch=None, max_workers=8, skip_unchanged=True,
+                     max_inline_bytes=65536):
+        """
+        Creates, updates and deletes many files in a single commit using the Git Data API.
+
+        Instead of one commit (and several API calls) per file, the changes are written as git objects and applied
+        with one tree, one commit and one ref update. Small text files are sent inline with the tree; larger or
+        binary files are uploaded as blobs concurrently. The current tree is read once, so existing files keep
+        their mode (executables, symlinks) and deletions of files that do not exist are left out. With
+        skip_unchanged, files whose content is already identical are left out too, so re-publishing unchanged data
+        makes no commit.
+
+        Parameters:
+            files (dict): {path: content}. Paths are strings or tuples of directory segments (see create_file).
+                Content may be str, bytes, dict or list (dicts and lists are converted to JSON). None deletes the
+                file.
+            message (str, optional): Commit message. Defaults to "no message".
+            branch (str, optional): Branch to commit to. Defaults to the repository's default branch.
+            max_workers (int, optional): Number of blobs uploaded at once. Defaults to 8.
+            skip_unchanged (bool, optional): If True, skips files whose content would not change. Defaults to
+                True.
+            max_inline_bytes (int, optional): Text files up to this size are sent inside the tree request instead
+                of as separate blobs. Defaults to 65536.
+
+        Returns:
+            dict: {'commit': the new GitCommit or None if nothing changed, 'updated': list of paths written,
+            'deleted': list of paths deleted, 'unchanged': list of paths skipped}
+
+        Example:
+            >>> status = self.commit_files({"data/a.json": {"x": 1}, "data/b.json": {"x": 2}, "old.txt": None},
+            ...                            "Publish data")
+            >>> print(status["commit"].sha)
+            1c9e5b7d...
+        """
+        branch = branch or self.repo.default_branch
+        ref = self.repo.get_git_ref(f"heads/{branch}")
+        base_commit = self.repo.get_git_commit(ref.object.sha)
+
+        # The current files give the modes to keep (executables, symlinks) and tell which deletions apply
+        existing = {path: x for path, x in self._walk_git_tree(base_commit.tree.sha) if x.type == 'blob'}
+
+        status = {'commit': None, 'updated': [], 'deleted': [], 'unchanged': []}
+        new_shas = {}
+        elements = []
+        uploads = []
+        for path_as_list_or_str, content in files.items():
+            repo_path = self._parse_repo_dir_list_input(path_as_list_or_str)
+            current = existing.get(repo_path)
+            if content is None:
+                if current is None:
+                    status['unchanged'].append(repo_path)
+                else:
+                    elements.append(InputGitTreeElement(repo_path, '100644', 'blob', sha=None))
+                    status['deleted'].append(repo_path)
+                continue
+
+            data = self._content_to_bytes(content)
+            new_shas[repo_path] = _git_blob_sha(data)
+            if skip_unchanged and current is not None and current.sha == new_shas[repo_path]:
+                status['unchanged'].append(repo_path)
+                continue
+
+            mode = current.mode if current is not None else '100644'
+            status['updated'].append(repo_path)
+            try:
+                text = data.decode('utf-8')
+            except UnicodeDecodeError:
+                text = None
+            if text is not None and len(data) <= max_inline_bytes:
+                elements.append(InputGitTreeElement(repo_path, mode, 'blob', content=text))
+            else:
+                uploads.append((repo_path, mode, data))
+
+        if not elements and not uploads:
+            self._check_print("INFO: No changes to commit")
+            return status
+
+        def upload_blob(upload):
+            repo_path, mode, data = upload
+            blob = self.repo.create_git_blob(base64.b64encode(data).decode('ascii'), 'base64')
+            return InputGitTreeElement(repo_path, mode, 'blob', sha=blob.sha)
+
+        if uploads:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(uploads)))) as executor:
+                elements.extend(executor.map(upload_blob, uploads))
+
+        new_tree = self.repo.create_git_tree(elements, base_commit.tree)
+        new_commit = self.repo.create_git_commit(message, new_tree, [base_commit])
+        ref.edit(new_commit.sha)
+        status['commit'] = new_commit
+        self._repo_trees = {}
+
+        if branch == self.repo.default_branch:
+            self._file_shas.update(new_shas)
+            for repo_path in status['deleted']:
+                self._file_shas.pop(repo_path, None)
+        self._check_print(f"INFO: Committed {len(status['updated'])} updated and {len(status['deleted'])} deleted "
+                          f"file(s) to {branch}")
+        return status
+
     def download_repository(self, download_dir, extract=False, rename_internal_folder=True):
         """
         Downloads the repository archive as a ZIP file into the specified download directory.
@@ -674,6 +1158,7 @@ class KeyManager(GithubHelper):
         self.key_data = None
         if self._config_type == 'github':
             super().__init__(project=key_name, repo_name=self._gh_repo, essential_print_only=True)
+            self.enable_content_cache()
             
             if not self._check_load_config_from_github():
                 if not self._skip_project_setup:
@@ -687,18 +1172,19 @@ class KeyManager(GithubHelper):
         self.get_key_data()
 
     def _check_load_config_from_github(self):
-        if self.file_exists(self.key_file_name):
-            if self._provided_key_data:
-                # rewrite the data stored on github
-                self.create_update_file(self.key_file_name, self._provided_key_data, 
-                                        'Updated key data based on provided key data input')
-                self._config_dict = self._provided_key_data
-            else:
-                # get the key data from github
-                self._config_dict = self.retrieve_file_content(self.key_file_name)
-            return True
-        else:
+        # One (cached, conditional) read tells whether the key file exists and gives its content and SHA
+        stored_config = self.retrieve_file_content(self.key_file_name)
+        if stored_config is None:
             return False
+
+        if self._provided_key_data:
+            # rewrite the data stored on github
+            self.create_update_file(self.key_file_name, self._provided_key_data, 
+                                    'Updated key data based on provided key data input')
+            self._config_dict = self._provided_key_data
+        else:
+            self._config_dict = stored_config
+        return True
         
     def _check_load_config_from_local(self):
         config_path = osC.check_create_dir_structure(['lukhedConfig'], return_path=True)
@@ -825,6 +1311,11 @@ class KeyManager(GithubHelper):
             print("INFO: Key updated successfully")
 
 
+def _git_blob_sha(data):
+    # The object id git (and GitHub) gives a file with this content, used to detect unchanged files locally
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
 def get_github_json(owner, repo, path, provide_full_url=None):
     """
     Fetches a JSON file from a GitHub repository.
@@ -1,15 +1,2239 @@
 from lukhed_basic_utils import classCommon
 from typing import Optional
 from mysql.connector.connection import MySQLConnection
+from mysql.connector.constants import FieldType
 import mysql.connector
 import atexit
 import json
+import re
 import psycopg2
 import atexit
 from psycopg2 import sql
+from psycopg2 import extensions as pg_extensions
+from psycopg2 import extras as pg_extras
 import io
+import csv
+import gzip
+import base64
+import collections
+import copy
+import datetime
+import decimal
+import struct
+import sys
+import uuid
+import weakref
+import functools
+import itertools
+import asyncio
+import threading
+import time
+import contextlib
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+
+
+class SqlConnectionPool:
+    def __init__(self, connect_function, ping_function, reset_function=None, min_size=1, max_size=10,
+                 idle_timeout=300, checkout_timeout=30, health_check_interval=30):
+        """
+        A thread-safe pool of database connections used by the SQL helpers in pooled mode.
+
+        Connections are created lazily up to max_size and handed out one per checkout. Idle connections above
+        min_size are closed once they have been idle for longer than idle_timeout, and any connection that has been
+        idle longer than health_check_interval is pinged before it is handed out again.
+
+        Parameters
+        ----------
+        connect_function : callable
+            Function with no arguments that returns a new, open connection
+        ping_function : callable
+            Function that takes a connection and returns True if it is still usable
+        reset_function : callable, optional
+            Function that takes a connection being checked in and returns it to a clean state (e.g. rolls back an
+            open transaction). If it raises, the connection is discarded, by default None
+        min_size : int, optional
+            Number of connections to keep open even when idle, by default 1
+        max_size : int, optional
+            Maximum number of connections open at once (idle + checked out), by default 10
+        idle_timeout : int or float, optional
+            Seconds an idle connection above min_size is kept before it is closed, by default 300
+        checkout_timeout : int or float, optional
+            Seconds checkout() waits for a free connection before raising TimeoutError, by default 30
+        health_check_interval : int or float, optional
+            Connections idle for longer than this many seconds are pinged on checkout, by default 30
+        """
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1.")
+
+        self._connect_function = connect_function
+        self._ping_function = ping_function
+        self._reset_function = reset_function
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self.health_check_interval = health_check_interval
+
+        self._idle = collections.deque()                # (connection, last_used) with most recently used on the right
+        self._size = 0
+        self._checked_out = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+        self.stats = {"created": 0, "closed": 0, "checkouts": 0, "waits": 0, "failed_health_checks": 0}
+
+        for _ in range(min_size):
+            self._size += 1
+            self._idle.append((self._create_connection(), time.monotonic()))
+
+    def _create_connection(self):
+        try:
+            connection = self._connect_function()
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+        self.stats["created"] += 1
+        return connection
+
+    def _close_quietly(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+        self.stats["closed"] += 1
+
+    def _prune_idle(self):
+        # Called with the condition held. The oldest idle connections sit on the left of the deque.
+        now = time.monotonic()
+        expired = []
+        while self._idle and self._size > self.min_size and now - self._idle[0][1] > self.idle_timeout:
+            expired.append(self._idle.popleft()[0])
+            self._size -= 1
+        return expired
+
+    def checkout(self):
+        """
+        Take a connection from the pool, opening a new one if the pool is below max_size.
+
+        Returns
+        -------
+        connection
+            An open database connection. It must be handed back with checkin().
+
+        Raises
+        ------
+        TimeoutError
+            If no connection becomes available within checkout_timeout seconds
+        """
+        deadline = time.monotonic() + self.checkout_timeout
+        while True:
+            connection = None
+            last_used = None
+            with self._condition:
+                if self._closed:
+                    raise RuntimeError("The connection pool has been closed.")
+
+                expired = self._prune_idle()
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"Timed out after {self.checkout_timeout}s waiting for a pooled "
+                                           f"connection (max_size={self.max_size}).")
+                    self.stats["waits"] += 1
+                    self._condition.wait(remaining)
+
+                if self._idle:
+                    connection, last_used = self._idle.pop()
+                else:
+                    self._size += 1
+                self._checked_out += 1
+                self.stats["checkouts"] += 1
+
+            for expired_connection in expired:
+                self._close_quietly(expired_connection)
+
+            if connection is None:
+                try:
+                    return self._create_connection()
+                except Exception:
+                    with self._condition:
+                        self._checked_out -= 1
+                    raise
+
+            if time.monotonic() - last_used <= self.health_check_interval:
+                return connection
+
+            try:
+                healthy = self._ping_function(connection)
+            except Exception:
+                healthy = False
+
+            if healthy:
+                return connection
+
+            # Stale connection, drop it and try again
+            self.stats["failed_health_checks"] += 1
+            self.checkin(connection, discard=True)
+
+    def checkin(self, connection, discard=False):
+        """
+        Return a connection to the pool.
+
+        Parameters
+        ----------
+        connection : connection
+            A connection previously obtained from checkout()
+        discard : bool, optional
+            If True, the connection is closed instead of being kept for re-use, by default False
+        """
+        if not discard and self._reset_function is not None:
+            try:
+                self._reset_function(connection)
+            except Exception:
+                discard = True
+
+        with self._condition:
+            self._checked_out -= 1
+            if discard or self._closed:
+                self._size -= 1
+            else:
+                self._idle.append((connection, time.monotonic()))
+                connection = None
+            self._condition.notify()
+
+        if connection is not None:
+            self._close_quietly(connection)
+
+    @contextmanager
+    def connection(self):
+        """
+        Context manager that checks a connection out and always checks it back in.
+
+        A connection is discarded instead of re-used if the block raises.
+        """
+        connection = self.checkout()
+        discard = False
+        try:
+            yield connection
+        except Exception:
+            discard = True
+            raise
+        finally:
+            self.checkin(connection, discard=discard)
+
+    def close_all(self):
+        """
+        Close every idle connection. Connections currently checked out are closed when they are checked in.
+        """
+        with self._condition:
+            idle = [connection for connection, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+
+        for connection in idle:
+            self._close_quietly(connection)
+
+    def close(self):
+        """
+        Close the pool. No further checkouts are allowed.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self.close_all()
+
+    def get_pool_status(self):
+        """
+        Returns
+        -------
+        dict
+            Current size, idle and checked out counts, plus lifetime counters
+        """
+        with self._condition:
+            status = {"size": self._size, "idle": len(self._idle), "checked_out": self._checked_out,
+                      "min_size": self.min_size, "max_size": self.max_size}
+        status.update(self.stats)
+        return status
+
+
+class SchemaCache:
+    def __init__(self, ttl=300):
+        """
+        In-process cache of table metadata (table lists, column lists, existence checks, foreign keys) used by the
+        SQL helpers. Entries are keyed by (database, table) and expire after ttl seconds. The helpers invalidate
+        the affected entries whenever they run DDL.
+
+        Parameters
+        ----------
+        ttl : int or float or None, optional
+            Seconds an entry stays valid, by default 300. None keeps entries until they are invalidated.
+        """
+        self.ttl = ttl
+        self._entries = {}                              # (database, table_name, kind) -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, database, table_name, kind):
+        """
+        Returns
+        -------
+        The cached value, or None if there is no valid entry
+        """
+        key = (database, table_name, kind)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (entry[0] is not None and entry[0] < time.monotonic()):
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self.hits += 1
+            return copy.deepcopy(entry[1])
+
+    def set(self, database, table_name, kind, value):
+        expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[(database, table_name, kind)] = (expires_at, copy.deepcopy(value))
+
+    def invalidate(self, database, table_name=None):
+        """
+        Drop the entries of one table (plus the database's table list), or of the whole database if table_name is
+        None.
+        """
+        with self._lock:
+            for key in list(self._entries):
+                if key[0] != database:
+                    continue
+                if table_name is None or key[1] == table_name or key[1] is None:
+                    del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_CACHE_MISS = object()
+
+
+def _estimate_result_size(value):
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        for item in value:
+            size += _estimate_result_size(item) if isinstance(item, (list, tuple)) else sys.getsizeof(item)
+    return size
+
+
+class QueryResultCache:
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024, ttl=60):
+        """
+        Thread-safe LRU cache of query results used by the SQL helpers. Entries are keyed by database, normalized SQL
+        text and parameters, and are tagged with the table they read from so writes can invalidate them.
+
+        Parameters
+        ----------
+        max_entries : int, optional
+            Maximum number of cached results, by default 1024
+        max_bytes : int, optional
+            Approximate memory cap across all entries, by default 64 MiB. Single results larger than this are not
+            cached.
+        ttl : int or float or None, optional
+            Seconds a result stays valid, by default 60. None disables expiry.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        self._entries = collections.OrderedDict()      # key -> (expires_at, size, table_key, value)
+        self._keys_by_table = collections.defaultdict(set)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _make_key(database, query, params):
+        query_text = query if isinstance(query, str) else repr(query)
+        normalized = " ".join(query_text.split())
+        key = (database, normalized, tuple(params) if params is not None else None)
+        hash(key)
+        return key
+
+    def _remove(self, key):
+        _, size, table_key, _ = self._entries.pop(key)
+        self._bytes -= size
+        self._keys_by_table[table_key].discard(key)
+        if not self._keys_by_table[table_key]:
+            del self._keys_by_table[table_key]
+
+    def get(self, database, query, params):
+        """
+        Returns
+        -------
+        The cached result, or the module's _CACHE_MISS sentinel if there is none (results can legitimately be None)
+        """
+        try:
+            key = self._make_key(database, query, params)
+        except TypeError:
+            return _CACHE_MISS
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (entry[0] is not None and entry[0] < time.monotonic()):
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return _CACHE_MISS
+            self._entries.move_to_end(key)
+            self.hits += 1
+            value = entry[3]
+        return copy.deepcopy(value)
+
+    def set(self, database, table_name, query, params, value):
+        try:
+            key = self._make_key(database, query, params)
+        except TypeError:
+            # Unhashable parameters (e.g. lists), just don't cache
+            return
+
+        size = _estimate_result_size(value)
+        if size > self.max_bytes:
+            return
+
+        expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+        table_key = (database, table_name)
+        value = copy.deepcopy(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, size, table_key, value)
+            self._keys_by_table[table_key].add(key)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, database, table_name=None):
+        """
+        Drop the cached results of one table, or of the whole database if table_name is None.
+        """
+        with self._lock:
+            table_keys = [table_key for table_key in self._keys_by_table
+                          if table_key[0] == database and (table_name is None or table_key[1] == table_name)]
+            for table_key in table_keys:
+                for key in list(self._keys_by_table.get(table_key, ())):
+                    self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_table.clear()
+            self._bytes = 0
+
+    def get_stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "entries": len(self._entries), "bytes": self._bytes}
+
+
+_DDL_KEYWORDS = ('CREATE', 'ALTER', 'DROP', 'RENAME', 'TRUNCATE', 'COMMENT')
+
+
+class StatementCache:
+    def __init__(self, max_entries=1024):
+        """
+        LRU cache of generated SQL statements, keyed by (method, table, column signature).
+
+        The hot helper methods build the same SQL text over and over from f-strings and condition tuples; with this
+        cache a statement is built once per shape. Hits return the identical object, which also lets prepared
+        cursors recognise a statement they already prepared.
+
+        Parameters
+        ----------
+        max_entries : int, optional
+            Maximum number of cached statements, by default 1024
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            statement = self._entries.get(key)
+            if statement is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return statement
+            self.misses += 1
+
+        statement = build()
+        with self._lock:
+            statement = self._entries.setdefault(key, statement)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return statement
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+def _split_condition_groups(condition_tuples):
+    """
+    Split query_table_by_columns style conditions (pairs, or groups of pairs ORed together) into a tuple of column
+    name groups, usable as a statement cache signature, and the flat list of values.
+    """
+    groups = condition_tuples if isinstance(condition_tuples[0][0], (tuple, list)) else [condition_tuples]
+    return (tuple(tuple(column for column, _ in group) for group in groups),
+            [value for group in groups for _, value in group])
+
+
+def _split_lookup_conditions(lookup_condition_tuples):
+    """
+    Split single-row lookup conditions (pairs, or one list of pairs) into a tuple of column names and the values.
+    """
+    if isinstance(lookup_condition_tuples[0][0], (tuple, list)):
+        lookup_condition_tuples = lookup_condition_tuples[0]
+    return tuple(column for column, _ in lookup_condition_tuples), [value for _, value in lookup_condition_tuples]
+
+
+_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+_LATENCY_BUCKET_LABELS = tuple(f"<={bound * 1000:g}ms" if bound < 1 else f"<={bound:g}s" for bound in _LATENCY_BUCKETS) \
+    + (f">{_LATENCY_BUCKETS[-1]:g}s",)
+_EXPLAINABLE_STATEMENT = re.compile(r"^\s*(SELECT|INSERT|UPDATE|DELETE|REPLACE|WITH|EXECUTE)\b", re.IGNORECASE)
+_SHAPE_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_SHAPE_NUMBER_LITERAL = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_SHAPE_REPEATED_GROUPS = re.compile(r"(\((?:%s|\?)(?:, ?(?:%s|\?))*\))(?:, ?\((?:%s|\?)(?:, ?(?:%s|\?))*\))+")
+_SHAPE_REPEATED_VALUES = re.compile(r"((?:%s|\?))(?:, ?(?:%s|\?)){3,}")
+
+
+def _statement_shape(query_text):
+    """
+    Reduce a SQL statement to its shape for grouping: literals become ?, whitespace is collapsed and long runs of
+    placeholders or value tuples (multi-row inserts, IN lists) are folded.
+    """
+    shape = _SHAPE_STRING_LITERAL.sub("?", query_text)
+    shape = _SHAPE_NUMBER_LITERAL.sub("?", shape)
+    shape = " ".join(shape.split())
+    shape = _SHAPE_REPEATED_GROUPS.sub(r"\1, ...", shape)
+    shape = _SHAPE_REPEATED_VALUES.sub(r"\1, ...", shape)
+    return shape if len(shape) <= 500 else shape[:497] + "..."
+
+
+class QueryInstrumentation:
+    def __init__(self, slow_query_threshold=None, explain_slow_queries=False, max_slow_queries=100,
+                 log_slow_queries=True):
+        """
+        Collects timing for every statement a SQL helper executes. Created by enable_query_instrumentation.
+
+        Each statement produces an event dict with method, statement (shape), param_count, rows, seconds,
+        connection_wait, error and explain. Events are passed to the registered hooks, and those slower than
+        slow_query_threshold are kept in a bounded slow-query log. Helper method calls are timed into per-method
+        latency histograms.
+
+        Parameters
+        ----------
+        slow_query_threshold : int or float, optional
+            Statements taking at least this many seconds are logged as slow, by default None (no slow log)
+        explain_slow_queries : bool, optional
+            If True, the EXPLAIN plan of each slow statement is captured with it, by default False
+        max_slow_queries : int, optional
+            Number of most recent slow queries kept, by default 100
+        log_slow_queries : bool, optional
+            If True, slow queries are also printed as they happen, by default True
+        """
+        self.slow_query_threshold = slow_query_threshold
+        self.explain_slow_queries = explain_slow_queries
+        self.log_slow_queries = log_slow_queries
+        self.hooks = []
+        self.slow_queries = collections.deque(maxlen=max_slow_queries)
+        self._method_stats = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def current_method(self):
+        stack = getattr(self._local, 'methods', None)
+        return stack[-1] if stack else None
+
+    @contextmanager
+    def method_scope(self, method_name):
+        stack = getattr(self._local, 'methods', None)
+        if stack is None:
+            stack = self._local.methods = []
+        stack.append(method_name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stack.pop()
+            self._record_method(method_name, time.perf_counter() - start)
+
+    def _method_entry(self, method_name):
+        entry = self._method_stats.get(method_name)
+        if entry is None:
+            entry = self._method_stats[method_name] = {
+                "calls": 0, "statements": 0, "total_seconds": 0.0, "max_seconds": 0.0,
+                "histogram": [0] * len(_LATENCY_BUCKET_LABELS)
+            }
+        return entry
+
+    def _record_method(self, method_name, seconds):
+        bucket = next((i for i, bound in enumerate(_LATENCY_BUCKETS) if seconds <= bound), len(_LATENCY_BUCKETS))
+        with self._lock:
+            entry = self._method_entry(method_name)
+            entry["calls"] += 1
+            entry["total_seconds"] += seconds
+            entry["max_seconds"] = max(entry["max_seconds"], seconds)
+            entry["histogram"][bucket] += 1
+
+    def is_slow(self, seconds):
+        return self.slow_query_threshold is not None and seconds >= self.slow_query_threshold
+
+    def record(self, event):
+        with self._lock:
+            self._method_entry(event["method"])["statements"] += 1
+            if self.is_slow(event["seconds"]):
+                self.slow_queries.append(event)
+
+        if self.log_slow_queries and self.is_slow(event["seconds"]):
+            print(f"Slow query ({event['seconds'] * 1000:,.1f} ms) in {event['method']}: {event['statement']}")
+
+        for hook in list(self.hooks):
+            try:
+                hook(event)
+            except Exception as e:
+                print(f"Query hook {hook!r} failed: {e}")
+
+    def get_stats(self):
+        with self._lock:
+            stats = {}
+            for method_name, entry in self._method_stats.items():
+                calls = entry["calls"]
+                stats[method_name] = {
+                    "calls": calls,
+                    "statements": entry["statements"],
+                    "total_seconds": entry["total_seconds"],
+                    "mean_seconds": entry["total_seconds"] / calls if calls else 0.0,
+                    "max_seconds": entry["max_seconds"],
+                    "histogram": dict(zip(_LATENCY_BUCKET_LABELS, entry["histogram"]))
+                }
+            return stats
+
+    def reset(self):
+        with self._lock:
+            self._method_stats.clear()
+            self.slow_queries.clear()
+
+
+class _InstrumentedCursor:
+    """
+    Cursor proxy that times execute/executemany/copy_expert and reports them to the helper's QueryInstrumentation.
+    Everything else is forwarded to the wrapped cursor.
+    """
+    def __init__(self, cursor, helper, label=None, explainable=True):
+        self._cursor = cursor
+        self._helper = helper
+        self._label = label
+        self._explainable = explainable
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._cursor.__exit__(exc_type, exc_value, traceback)
+
+    def execute(self, query, params=None, *args, **kwargs):
+        param_count = len(params) if params is not None else 0
+        return self._timed(self._cursor.execute, query, params, param_count, (query, params) + args, kwargs)
+
+    def executemany(self, query, seq_params, *args, **kwargs):
+        seq_params = list(seq_params)
+        return self._timed(self._cursor.executemany, query, None, sum(len(p) for p in seq_params),
+                           (query, seq_params) + args, kwargs)
+
+    def copy_expert(self, query, *args, **kwargs):
+        return self._timed(self._cursor.copy_expert, query, None, 0, (query,) + args, kwargs)
+
+    def _timed(self, function, query, params, param_count, args, kwargs):
+        instrumentation = self._helper._instrumentation
+        if instrumentation is None:
+            return function(*args, **kwargs)
+
+        connection_wait = self._helper._take_connection_wait()
+        error = None
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            query_text = self._helper._query_text(query, self._cursor)
+            rowcount = getattr(self._cursor, 'rowcount', -1)
+            event = {
+                "method": instrumentation.current_method() or self._label or "execute",
+                "statement": _statement_shape(query_text),
+                "param_count": param_count,
+                "rows": rowcount if rowcount is not None and rowcount >= 0 else None,
+                "seconds": seconds,
+                "connection_wait": connection_wait,
+                "error": None if error is None else repr(error),
+                "explain": None
+            }
+            if (error is None and self._explainable and instrumentation.explain_slow_queries
+                    and instrumentation.is_slow(seconds) and _EXPLAINABLE_STATEMENT.match(query_text)):
+                event["explain"] = self._helper._explain_statement(query_text, params)
+            instrumentation.record(event)
+
+
+def _and_conditions(columns):
+    return " AND ".join(f"{column} = %s" for column in columns)
+
+
+def _is_ddl_statement(query):
+    if not isinstance(query, str):
+        return True
+    words = query.lstrip().split(None, 1)
+    return bool(words) and words[0].upper() in _DDL_KEYWORDS
+
+
+_NO_SCOPE = contextlib.nullcontext()
+
+
+def _borrows_connection(method):
+    """
+    Decorator for helper methods that talk to the database. In pooled mode the calling thread borrows a connection
+    for the duration of the call (nested helper calls re-use the same connection).
+
+    If the call fails because the connection was lost, the connection is dropped so the next call reconnects.
+    Methods marked with _idempotent_read are then run once more on a fresh connection, unless they were called from
+    another helper method or inside batch()/transaction().
+    """
+    retry_on_lost_connection = getattr(method, 'idempotent_read', False)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        scope = _NO_SCOPE if self._instrumentation is None else self._instrumentation.method_scope(method.__name__)
+        with scope:
+            call_depth = getattr(self._local, 'call_depth', 0)
+            retry = retry_on_lost_connection and call_depth == 0
+            while True:
+                self._local.call_depth = call_depth + 1
+                try:
+                    with (_NO_SCOPE if self._pool is None else self._leased_connection()):
+                        try:
+                            result = method(self, *args, **kwargs)
+                        except Exception as e:
+                            if not self._drop_lost_connection(e) or not retry or self._get_transaction() is not None:
+                                raise
+                        else:
+                            # A successful call proves the shared connection is alive, see set_liveness_check_interval
+                            if self._pool is None and self._shared_connection is not None:
+                                self._connection_verified_at = time.monotonic()
+                            return result
+                finally:
+                    self._local.call_depth = call_depth
+                retry = False
+    wrapper.borrows_connection = True
+    return wrapper
+
+
+def _idempotent_read(method):
+    """
+    Marks a read-only helper method that _borrows_connection may safely run again after a lost connection. Apply it
+    below @_borrows_connection.
+    """
+    method.idempotent_read = True
+    return method
+
+
+def _build_where_clause(condition_tuples):
+    """
+    Build a WHERE clause from column-value condition tuples, following the convention of query_table_by_columns:
+    a flat set of tuples is ANDed together, while a list of tuple groups is ANDed within each group and ORed between
+    groups.
+
+    Parameters
+    ----------
+    condition_tuples : tuple
+        The *condition_tuples argument as received by a helper method
+
+    Returns
+    -------
+    tuple
+        (where_sql, values) where where_sql is '' if no conditions were given
+    """
+    if not condition_tuples:
+        return "", []
+
+    if isinstance(condition_tuples[0][0], (tuple, list)):
+        groups = condition_tuples
+    else:
+        groups = [condition_tuples]
+
+    conditions_list = [" AND ".join([f"{column} = %s" for column, _ in group]) for group in groups]
+    values = [value for group in groups for _, value in group]
+
+    if len(conditions_list) == 1:
+        return conditions_list[0], values
+    return " OR ".join([f"({conditions})" for conditions in conditions_list]), values
+
+
+_MYSQL_ESCAPED_CHARACTERS = ("'", '"', '\\', '\0', '\n', '\r', '\x1a')
+
+
+def _estimate_sql_literal_size(value):
+    """
+    Estimate (slightly over) how many bytes a value takes once escaped into a MySQL statement.
+    """
+    if value is None:
+        return 4
+    if isinstance(value, (bool, int, float, decimal.Decimal)):
+        return len(str(value)) + 2
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return 2 * len(value) + 3
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    text = str(value)
+    escapes = sum(text.count(character) for character in _MYSQL_ESCAPED_CHARACTERS)
+    return len(text.encode('utf-8')) + escapes + 2
+
+
+def _chunk_rows_by_size(rows, max_bytes, row_overhead=0, max_rows=None):
+    """
+    Group rows into lists whose estimated statement size stays under max_bytes.
+
+    Parameters
+    ----------
+    rows : iterable
+        Rows (lists or tuples) to group. Consumed lazily.
+    max_bytes : int
+        Byte budget for the values of one chunk. A single row larger than the budget gets a chunk of its own.
+    row_overhead : int, optional
+        Bytes added per row for the surrounding syntax, by default 0
+    max_rows : int, optional
+        Upper bound on rows per chunk, by default None (no limit)
+
+    Yields
+    ------
+    list
+        A chunk of rows
+    """
+    chunk = []
+    chunk_bytes = 0
+    for row in rows:
+        row_bytes = row_overhead + sum(_estimate_sql_literal_size(value) for value in row)
+        if chunk and (chunk_bytes + row_bytes > max_bytes or (max_rows is not None and len(chunk) >= max_rows)):
+            yield chunk
+            chunk = []
+            chunk_bytes = 0
+        chunk.append(row)
+        chunk_bytes += row_bytes
+    if chunk:
+        yield chunk
+
+
+# NumPy dtype used for each result column type in columnar fetches. Types not listed (text, decimal, json, tz-aware
+# timestamps, ...) are kept as Python objects so no precision or information is lost.
+_MYSQL_COLUMN_DTYPES = {
+    FieldType.TINY: 'int64', FieldType.SHORT: 'int64', FieldType.LONG: 'int64', FieldType.INT24: 'int64',
+    FieldType.LONGLONG: 'int64', FieldType.YEAR: 'int64',
+    FieldType.FLOAT: 'float64', FieldType.DOUBLE: 'float64',
+    FieldType.DATE: 'datetime64[D]', FieldType.NEWDATE: 'datetime64[D]',
+    FieldType.DATETIME: 'datetime64[us]', FieldType.TIMESTAMP: 'datetime64[us]',
+    FieldType.TIME: 'timedelta64[us]',
+}
+
+_PG_COLUMN_DTYPES = {
+    16: 'bool',
+    20: 'int64', 21: 'int64', 23: 'int64', 26: 'int64',
+    700: 'float64', 701: 'float64',
+    1082: 'datetime64[D]', 1114: 'datetime64[us]', 1186: 'timedelta64[us]',
+}
+
+
+def _column_batch_to_array(values, dtype):
+    """
+    Convert one fetched batch of a column to a NumPy array. Integer columns containing NULLs are widened to float64
+    (NULL becomes NaN) and boolean columns containing NULLs fall back to object, the same way pandas handles them.
+    """
+    if dtype is not None:
+        kind = np.dtype(dtype).kind
+        if kind in 'iub' and any(value is None for value in values):
+            dtype = 'float64' if kind in 'iu' else None
+    if dtype is not None:
+        try:
+            return np.array(values, dtype=dtype)
+        except (TypeError, ValueError, OverflowError):
+            pass
+    return np.fromiter(values, dtype=object, count=len(values))
+
+
+def _concatenate_column_batches(batches, dtype):
+    if not batches:
+        return np.array([], dtype=dtype or object)
+    if len(batches) == 1:
+        return batches[0]
+    return np.concatenate(batches)
+
+
+def _prepare_existence_keys(columns, rows):
+    """
+    Normalize filter_existing input: returns (columns as a list, de-duplicated key tuples, single_column flag). A
+    single column given as a string takes plain values as rows. Keys containing None are dropped since NULL never
+    compares equal in SQL.
+    """
+    single_column = isinstance(columns, str)
+    columns = [columns] if single_column else list(columns)
+    keys = ((row,) if single_column else tuple(row) for row in rows)
+    unique_keys = list(dict.fromkeys(key for key in keys if None not in key))
+    return columns, unique_keys, single_column
+
+
+def _group_append_values(key_value_pairs, single_key, column_count):
+    """
+    Merge the (lookup key, values) pairs of bulk_append_values_to_columns into one staging row per key:
+    [*key, [values for column 1], [values for column 2], ...], keeping the order in which values were given.
+    """
+    grouped = {}
+    for key, values in key_value_pairs:
+        if len(values) != column_count:
+            raise ValueError(f"Expected {column_count} values to append for key {key!r}, got {len(values)}")
+        arrays = grouped.setdefault((key,) if single_key else tuple(key), [[] for _ in range(column_count)])
+        for array, value in zip(arrays, values):
+            array.append(value)
+    return [list(key) + arrays for key, arrays in grouped.items()]
+
+
+_EXPORT_FORMATS = ('csv', 'jsonl', 'parquet')
+
+_PARQUET_TYPES_BY_DTYPE = {
+    'int64': 'int64', 'float64': 'float64', 'bool': 'bool_', 'datetime64[D]': 'date32',
+}
+
+
+def _resolve_export_format(path, file_format=None, compress=None):
+    """
+    Work out (format, gzip) for an export or import from the explicit arguments or the file name, e.g. 'games.csv.gz'.
+    """
+    name = str(path).lower()
+    if compress is None:
+        compress = name.endswith('.gz')
+    if name.endswith('.gz'):
+        name = name[:-3]
+    if file_format is None:
+        file_format = name.rsplit('.', 1)[-1] if '.' in name else 'csv'
+        file_format = 'jsonl' if file_format in ('json', 'ndjson') else file_format
+    file_format = file_format.lower()
+    if file_format not in _EXPORT_FORMATS:
+        raise ValueError(f"Unsupported file format: {file_format}. Use one of {_EXPORT_FORMATS}.")
+    if file_format == 'parquet' and compress:
+        raise ValueError("Parquet files are compressed internally; gzip is only available for csv and jsonl.")
+    return file_format, compress
+
+
+def _open_export_file(path, compress, binary=False):
+    if compress:
+        return gzip.open(path, 'wb' if binary else 'wt', encoding=None if binary else 'utf-8',
+                         newline=None if binary else '')
+    return open(path, 'wb' if binary else 'w', encoding=None if binary else 'utf-8', newline=None if binary else '')
+
+
+def _export_json_default(value):
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds()
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return base64.b64encode(bytes(value)).decode('ascii')
+    if isinstance(value, set):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _export_csv_value(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=_export_json_default)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return base64.b64encode(bytes(value)).decode('ascii')
+    return value
+
+
+def _parquet_column(values, arrow_type, pa):
+    """
+    Build one Parquet column from a batch of values. Returns (array, type); the type of the first batch is kept for
+    the whole file. JSON values are stored as text, decimals as decimal128(38, scale) and columns that cannot be
+    typed fall back to strings.
+    """
+    if any(isinstance(value, (dict, list)) for value in values):
+        values = [None if value is None else json.dumps(value, default=_export_json_default) for value in values]
+    try:
+        array = pa.array(values, type=arrow_type)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, OverflowError):
+        if arrow_type is not None and arrow_type != pa.string():
+            raise
+        array = pa.array([None if value is None else str(value) for value in values], type=pa.string())
+    if arrow_type is None and pa.types.is_null(array.type):
+        array = array.cast(pa.string())
+    elif arrow_type is None and pa.types.is_decimal(array.type):
+        # Later batches may hold larger numbers; the scale of the first batch is kept
+        array = array.cast(pa.decimal128(38, array.type.scale))
+    return array, array.type
+
+
+def _open_import_file(path, compress):
+    # utf-8-sig drops the byte order mark spreadsheet programs put at the start of CSV files
+    if compress:
+        return gzip.open(path, 'rt', encoding='utf-8-sig', newline='')
+    return open(path, 'r', encoding='utf-8-sig', newline='')
+
+
+def _iter_import_records(path, file_format, compress, batch_size):
+    """
+    Read an import file lazily. Yields (line number, record, error) where record is a dict of file column -> value,
+    or the raw content together with an error message for lines that cannot be parsed. Parquet files are read one
+    row group batch at a time and numbered by row.
+    """
+    if file_format == 'parquet':
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet import requires pyarrow: pip install pyarrow")
+        row_number = 0
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+            for record in batch.to_pylist():
+                row_number += 1
+                yield row_number, record, None
+        return
+
+    with _open_import_file(path, compress) as import_file:
+        if file_format == 'csv':
+            reader = csv.reader(import_file)
+            header = next(reader, None)
+            for values in reader:
+                if not values:
+                    continue
+                if len(values) != len(header):
+                    yield reader.line_num, values, f"Expected {len(header)} fields, found {len(values)}"
+                else:
+                    yield reader.line_num, dict(zip(header, values)), None
+        else:
+            for line_number, line in enumerate(import_file, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    yield line_number, line.rstrip('\r\n'), f"Invalid JSON: {e}"
+                    continue
+                if isinstance(record, dict):
+                    yield line_number, record, None
+                else:
+                    yield line_number, record, "Expected a JSON object"
+
+
+_IMPORT_TRUE_STRINGS = frozenset(('true', 't', 'yes', 'y', '1'))
+_IMPORT_FALSE_STRINGS = frozenset(('false', 'f', 'no', 'n', '0'))
+
+
+def _parse_import_bool(value):
+    if not isinstance(value, str):
+        return bool(value)
+    text = value.strip().lower()
+    if text in _IMPORT_TRUE_STRINGS:
+        return True
+    if text in _IMPORT_FALSE_STRINGS:
+        return False
+    raise ValueError(f"Invalid boolean value: {value!r}")
+
+
+def _parse_import_int(value):
+    if isinstance(value, str):
+        text = value.strip()
+        if text.lower() in _IMPORT_TRUE_STRINGS or text.lower() in _IMPORT_FALSE_STRINGS:
+            return int(_parse_import_bool(text))
+        return int(text)
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError(f"Invalid integer value: {value!r}")
+    return int(value)
+
+
+def _parse_import_date(value):
+    if not isinstance(value, str):
+        return value
+    try:
+        return datetime.date.fromisoformat(value.strip())
+    except ValueError:
+        return datetime.datetime.fromisoformat(value.strip()).date()
+
+
+def _parse_import_datetime(value):
+    return datetime.datetime.fromisoformat(value.strip()) if isinstance(value, str) else value
+
+
+def _import_passthrough(value):
+    # Text, decimal, JSON and other types are left to the server; nested JSON values are sent as JSON text
+    return json.dumps(value, default=_export_json_default) if isinstance(value, (dict, list)) else value
+
+
+# Client-side conversion of file values by the NumPy dtype of the target column (see _MYSQL/_PG_COLUMN_DTYPES)
+_IMPORT_CONVERTERS = {
+    'int64': _parse_import_int, 'float64': float, 'bool': _parse_import_bool,
+    'datetime64[D]': _parse_import_date, 'datetime64[us]': _parse_import_datetime,
+}
+
+
+def _build_import_row_converter(converters, null_values):
+    """
+    Returns a function turning a list of file values into a row for the target columns. Values in null_values (and
+    None) become NULL; the rest go through the converter of their column and raise ValueError/TypeError if invalid.
+    """
+    def convert_row(values):
+        row = []
+        for converter, value in zip(converters, values):
+            if value is None or (isinstance(value, str) and value in null_values):
+                row.append(None)
+            else:
+                row.append(converter(value))
+        return row
+
+    return convert_row
+
+
+class _PooledConnectionMixin:
+    """
+    Connection plumbing shared by SqlHelper and PostgresSqlHelper.
+
+    `db_connection` and `cursor` resolve to the calling thread's leased connection when a pool is enabled and to
+    the single shared connection otherwise, so the helper methods read the same way in both modes. Subclasses
+    provide `_open_connection`, `_open_cursor`, `_ping_connection` and `_reset_connection`, plus `_stream_query`
+    and `_build_table_select` for the streaming and columnar readers, and `_column_type_codes`,
+    `_build_insert_statement` and `_bulk_load_rows` for import_file.
+    """
+    _pool = None                                        # type: Optional[SqlConnectionPool]
+    _column_dtypes = {}
+    _instrumentation = None                             # type: Optional[QueryInstrumentation]
+
+    def _init_connection_state(self):
+        self._pool = None
+        self._local = threading.local()
+        self._shared_connection = None
+        self._shared_cursor = None
+        self._schema_cache = None                       # type: Optional[SchemaCache]
+        self._result_cache = None                       # type: Optional[QueryResultCache]
+        self._statement_cache = StatementCache()
+        self._statement_generation = 0
+        self._prepare_statements = False
+        self._max_prepared_per_connection = 100
+        self._connection_statements = weakref.WeakKeyDictionary()
+        self._connection_statements_lock = threading.Lock()
+        self._instrumentation = None
+        self._liveness_interval = 30
+        self._connection_verified_at = None
+
+    def _get_lease(self):
+        return getattr(self._local, 'lease', None)
+
+    @property
+    def db_connection(self):
+        lease = self._get_lease()
+        return lease['connection'] if lease is not None else self._shared_connection
+
+    @db_connection.setter
+    def db_connection(self, value):
+        self._shared_connection = value
+
+    @property
+    def cursor(self):
+        lease = self._get_lease()
+        cursor = lease['cursor'] if lease is not None else self._shared_cursor
+        return cursor if cursor is None else self._instrument_cursor(cursor)
+
+    @cursor.setter
+    def cursor(self, value):
+        self._shared_cursor = value
+
+    def _bind_lease(self):
+        if self._get_lease() is None:
+            start = time.perf_counter()
+            connection = self._pool.checkout()
+            try:
+                cursor = self._open_cursor(connection)
+            except Exception:
+                self._pool.checkin(connection, discard=True)
+                raise
+            self._local.lease = {'connection': connection, 'cursor': cursor, 'depth': 0,
+                                 'wait': time.perf_counter() - start}
+        return self._get_lease()
+
+    def _release_lease(self, discard=False):
+        lease = self._get_lease()
+        if lease is None:
+            return
+        self._local.lease = None
+
+        # The cursor is deliberately not closed so result sets already returned to the caller stay readable
+        self._pool.checkin(lease['connection'], discard=discard or lease.get('lost', False))
+
+    @contextmanager
+    def _leased_connection(self):
+        lease = self._bind_lease()
+        lease['depth'] += 1
+        try:
+            yield lease
+        finally:
+            lease['depth'] -= 1
+            if lease['depth'] == 0:
+                self._release_lease()
+
+    def set_liveness_check_interval(self, seconds=30):
+        """
+        Set how long the shared (non-pooled) connection is trusted after it was last verified or used successfully.
+        Within the interval helper methods use the connection without checking it first, so a query costs a single
+        round trip; a connection left idle for longer is pinged once (MySQL) before being used again. PostgreSQL
+        connections are never pinged here as psycopg2 tracks the connection state locally.
+
+        A connection dropped while trusted is detected from the error of the failing query: it is discarded so the
+        next call reconnects, and read-only methods (query_table_by_columns, get_single_value_from_table, ...) are
+        retried once on the new connection. Pooled connections are checked by the pool instead, see
+        enable_connection_pool(health_check_interval).
+
+        Parameters
+        ----------
+        seconds : int or float, optional
+            Seconds to trust a verified connection, by default 30. 0 checks the connection before every call.
+        """
+        self._liveness_interval = seconds
+        self._connection_verified_at = None
+
+    def _connection_trusted(self):
+        verified_at = self._connection_verified_at
+        return verified_at is not None and time.monotonic() - verified_at < self._liveness_interval
+
+    def _drop_lost_connection(self, error):
+        # Returns True if error means the connection is gone. The connection is then dropped (or, in pooled mode,
+        # discarded when the lease ends) so the next call opens a new one.
+        try:
+            lost = self._connection_lost(error)
+        except Exception:
+            lost = False
+        if not lost:
+            return False
+
+        self._connection_verified_at = None
+        lease = self._get_lease()
+        if lease is not None:
+            lease['lost'] = True
+        elif self._shared_connection is not None and self._get_transaction() is None:
+            connection, self._shared_connection, self._shared_cursor = self._shared_connection, None, None
+            try:
+                connection.close()
+            except Exception:
+                pass
+        return True
+
+    @contextmanager
+    def _dedicated_connection(self):
+        # Connection for long-lived work such as streaming cursors. In pooled mode it is checked out separately from
+        # the thread's lease so the caller can keep using the helper while the stream is open.
+        if self._pool is None:
+            self._check_connect_db()
+            yield self.db_connection
+        else:
+            with self._pool.connection() as connection:
+                yield connection
+
+    def _get_transaction(self):
+        return getattr(self._local, 'transaction', None)
+
+    def _commit(self, *written_tables):
+        # Helper methods call this instead of committing directly so commits can be deferred by transaction()/batch().
+        # written_tables are the tables the method changed; their cached query results are dropped.
+        for table_name in written_tables:
+            self.invalidate_result_cache(table_name)
+
+        transaction = self._get_transaction()
+        if transaction is None:
+            self.db_connection.commit()
+            return
+
+        transaction['written_tables'].update(written_tables)
+        transaction['pending'] += 1
+        if transaction['commit_every'] is not None and transaction['pending'] >= transaction['commit_every']:
+            self.db_connection.commit()
+            self._invalidate_transaction_tables(transaction)
+            transaction['pending'] = 0
+            transaction['commits'] += 1
+
+    def _rollback(self, error=None):
+        # Helper methods call this when a write fails. Inside transaction()/batch() the connection is not rolled back
+        # here, as that would also discard the earlier work of the block; the block is marked failed instead and
+        # rolls everything back when it ends.
+        transaction = self._get_transaction()
+        if transaction is None:
+            self.db_connection.rollback()
+        elif transaction['failed'] is None:
+            transaction['failed'] = error or RuntimeError("A helper method failed inside the block")
+
+    def _drop_staging_table(self, stage_table, drop_query):
+        # Cleanup for the staging tables of the bulk methods. A failure is only reported so it never replaces the
+        # error of the method itself.
+        try:
+            self.cursor.execute(drop_query)
+        except Exception as e:
+            print(f"Could not drop the staging table {stage_table}: {e}")
+
+    def _invalidate_transaction_tables(self, transaction):
+        # Reads made inside the transaction may have cached uncommitted (or rolled back) data
+        for table_name in transaction['written_tables']:
+            self.invalidate_result_cache(table_name)
+        transaction['written_tables'].clear()
+
+    @contextmanager
+    def batch(self, commit_every=1000):
+        """
+        Group the commits of helper write methods. Inside the block, methods such as insert_data or
+        update_single_value_in_table no longer commit on every call; a single commit is issued every commit_every
+        calls and once more when the block ends. If the block raises, the uncommitted work is rolled back. A helper
+        method that fails inside the block marks it failed: even if the error is caught, leaving the block rolls back
+        the uncommitted work and raises RuntimeError.
+
+        Nested batch()/transaction() blocks join the outermost one. In pooled mode the block keeps one connection
+        for its whole duration. Note that MySQL DDL statements (CREATE, ALTER, DROP) always commit implicitly.
+
+        Parameters
+        ----------
+        commit_every : int or None, optional
+            Commit after this many deferred commits, by default 1000. None defers everything to the end of the block.
+
+        Example
+        -------
+        >>> with db.batch(commit_every=500):
+        ...     for game_id, score in scores:
+        ...         db.update_single_value_in_table('games', 'score', score, ('id', game_id))
+        """
+        if self._get_transaction() is not None:
+            yield self
+            return
+
+        with (self._leased_connection() if self._pool is not None else contextlib.nullcontext()):
+            self._check_connect_db()
+            transaction = {'commit_every': commit_every, 'pending': 0, 'commits': 0, 'written_tables': set(),
+                           'failed': None}
+            self._local.transaction = transaction
+            try:
+                yield self
+            except BaseException:
+                self._local.transaction = None
+                self.db_connection.rollback()
+                self._invalidate_transaction_tables(transaction)
+                raise
+            self._local.transaction = None
+            if transaction['failed'] is not None:
+                self.db_connection.rollback()
+                self._invalidate_transaction_tables(transaction)
+                raise RuntimeError("A helper method failed inside the block, the uncommitted work was rolled back"
+                                   ) from transaction['failed']
+            self.db_connection.commit()
+            self._invalidate_transaction_tables(transaction)
+
+    def transaction(self):
+        """
+        Run the helper methods inside the block as one transaction: everything is committed once when the block
+        ends, or rolled back if it raises. Equivalent to batch(commit_every=None).
+
+        Example
+        -------
+        >>> with db.transaction():
+        ...     db.insert_data('orders', ['id', 'total'], [1, 9.99])
+        ...     db.update_single_value_in_table('customers', 'balance', 0, ('id', 7))
+        """
+        return self.batch(commit_every=None)
+
+    def enable_schema_cache(self, ttl=300):
+        """
+        Cache the results of get_all_tables, table_exists, get_columns_in_table (and get_foreign_keys on MySQL) so
+        repeated metadata lookups do not hit the server. DDL run through this helper (create_table, add_column_to_table,
+        rename_column, delete_column, execute_query with DDL, ...) invalidates the affected entries automatically.
+        Changes made by other clients are picked up once entries expire, or call invalidate_schema_cache().
+
+        Parameters
+        ----------
+        ttl : int or float or None, optional
+            Seconds a cached entry stays valid, by default 300. None keeps entries until invalidated.
+
+        Returns
+        -------
+        SchemaCache
+            The cache now in use
+        """
+        self._schema_cache = SchemaCache(ttl=ttl)
+        return self._schema_cache
+
+    def disable_schema_cache(self):
+        self._schema_cache = None
+
+    def invalidate_schema_cache(self, table_name=None):
+        """
+        Drop cached metadata for a table, or for the whole current database if table_name is None.
+        """
+        if self._schema_cache is not None:
+            self._schema_cache.invalidate(self.database_name, table_name)
+        # Prepared plans may depend on the old table definition
+        self._statement_generation += 1
+
+    def _schema_cache_lookup(self, kind, table_name):
+        if self._schema_cache is None:
+            return None
+        return self._schema_cache.get(self.database_name, table_name, kind)
+
+    def _schema_cache_store(self, kind, table_name, value):
+        if self._schema_cache is not None:
+            self._schema_cache.set(self.database_name, table_name, kind, value)
+        return value
+
+    def enable_result_cache(self, max_entries=1024, max_bytes=64 * 1024 * 1024, ttl=60):
+        """
+        Cache the results of get_single_value_from_table, query_table_by_columns, get_column_data_as_list (and
+        get_distinct_column_values on PostgreSQL). Identical calls are answered from memory until the entry expires,
+        is evicted, or a write to the same table through this helper invalidates it. Writes made by other clients
+        are only picked up once entries expire, so choose ttl accordingly.
+
+        Parameters
+        ----------
+        max_entries : int, optional
+            Maximum number of cached results, by default 1024
+        max_bytes : int, optional
+            Approximate memory cap for all cached results, by default 64 MiB
+        ttl : int or float or None, optional
+            Seconds a result stays valid, by default 60. None keeps results until evicted or invalidated.
+
+        Returns
+        -------
+        QueryResultCache
+            The cache now in use
+        """
+        self._result_cache = QueryResultCache(max_entries=max_entries, max_bytes=max_bytes, ttl=ttl)
+        return self._result_cache
+
+    def disable_result_cache(self):
+        self._result_cache = None
+
+    def invalidate_result_cache(self, table_name=None):
+        """
+        Drop cached query results for a table, or for the whole current database if table_name is None.
+        """
+        if self._result_cache is not None:
+            self._result_cache.invalidate(self.database_name, table_name)
+
+    def get_result_cache_stats(self):
+        """
+        Returns
+        -------
+        dict or None
+            hits, misses, evictions, entries and bytes of the result cache, or None if it is not enabled
+        """
+        return None if self._result_cache is None else self._result_cache.get_stats()
+
+    def _result_cache_lookup(self, table_name, query, params):
+        if self._result_cache is None:
+            return _CACHE_MISS
+        return self._result_cache.get(self.database_name, query, params)
+
+    def _result_cache_store(self, table_name, query, params, value):
+        if self._result_cache is not None:
+            self._result_cache.set(self.database_name, table_name, query, params, value)
+        return value
+
+    def query_to_arrays(self, query, params=None, columns=None, batch_size=10000, dtypes=None):
+        """
+        Run a SELECT query and return its result as one NumPy array per column.
+
+        Rows are streamed from the server in batches (see iter_query) and each batch is converted straight into
+        typed column arrays, so no list-of-lists copy of the full result is ever held in memory. Column dtypes are
+        inferred from the cursor description: integers become int64 (float64 if the column has NULLs), floats
+        float64, dates and timestamps datetime64, booleans bool; everything else is kept as Python objects.
+
+        Parameters
+        ----------
+        query : str
+            The SELECT query to run
+        params : tuple or list, optional
+            Parameters to be passed to the query
+        columns : list of str, optional
+            Only build arrays for these result columns, by default all of them
+        batch_size : int, optional
+            Number of rows fetched from the server per round, by default 10000
+        dtypes : dict, optional
+            Column name to NumPy dtype overrides for the inferred types, e.g. {'price': 'float64'} for a decimal
+            column. None keeps values as Python objects.
+
+        Returns
+        -------
+        dict
+            Column name to numpy.ndarray, in result column order
+        """
+        dtypes = dtypes or {}
+        stream = self._stream_query(query, params, batch_size)
+        try:
+            description = next(stream)
+            names = [column[0] for column in description]
+            if columns is None:
+                selected = list(range(len(names)))
+            else:
+                unknown = [column for column in columns if column not in names]
+                if unknown:
+                    raise ValueError(f"Columns not in the query result: {unknown}")
+                selected = [names.index(column) for column in columns]
+
+            column_dtypes = [dtypes[names[i]] if names[i] in dtypes else
+                             self._column_dtypes.get(description[i][1]) for i in selected]
+            batches = [[] for _ in selected]
+
+            for rows in stream:
+                for position, index in enumerate(selected):
+                    values = [row[index] for row in rows]
+                    batches[position].append(_column_batch_to_array(values, column_dtypes[position]))
+        finally:
+            stream.close()
+
+        return {names[index]: _concatenate_column_batches(batches[position], column_dtypes[position])
+                for position, index in enumerate(selected)}
+
+    def get_table_as_frame(self, table_name, *condition_tuples, columns=None, batch_size=10000, dtypes=None):
+        """
+        Load a table (optionally filtered) into a pandas DataFrame without going through get_table_as_list.
+
+        Only the requested columns are selected and the frame is built from the typed column arrays of
+        query_to_arrays, so large analytical pulls use a fraction of the memory of a list of lists.
+
+        Parameters
+        ----------
+        table_name : str
+            Name of the table
+        condition_tuples : tuple(s) or list of tuples, optional
+            Column-value conditions, same format as query_table_by_columns. If not given, all rows are loaded.
+        columns : list of str, optional
+            Columns to select, by default all columns
+        batch_size : int, optional
+            Number of rows fetched from the server per round, by default 10000
+        dtypes : dict, optional
+            Column name to NumPy dtype overrides, see query_to_arrays
+
+        Returns
+        -------
+        pandas.DataFrame
+            The table data, one column per selected table column
+
+        Example
+        -------
+        >>> df = db.get_table_as_frame('games', ('season', 2024), columns=['game_id', 'home_score', 'away_score'])
+        """
+        query, values = self._build_table_select(table_name, condition_tuples, columns)
+        arrays = self.query_to_arrays(query, values or None, batch_size=batch_size, dtypes=dtypes)
+        return pd.DataFrame(arrays, copy=False)
+
+    def iter_pages(self, table_name, order_columns, *condition_tuples, page_size=1000, columns=None,
+                   descending=False, start_after=None):
+        """
+        Page through a table with keyset (seek) pagination instead of OFFSET.
+
+        Each page is fetched with `WHERE (order columns) > (last seen values) ORDER BY order columns LIMIT page_size`,
+        so with an index on the order columns every page costs the same no matter how deep into the table it is.
+        Pages are separate queries, so no connection is held between pages and rows written meanwhile are seen
+        if they sort after the current position.
+
+        Parameters
+        ----------
+        table_name : str
+            Name of the table
+        order_columns : str or list of str
+            Column(s) that uniquely order the rows, e.g. 'id' or ['season', 'game_id']. They should be NOT NULL
+            and covered by an index; rows with NULL in an order column are never returned.
+        condition_tuples : tuple(s) or list of tuples, optional
+            Column-value filters, same format as query_table_by_columns
+        page_size : int, optional
+            Rows per page, by default 1000
+        columns : list of str, optional
+            Columns to select, by default all. Must include the order columns.
+        descending : bool, optional
+            If True, pages go from the highest key down, by default False
+        start_after : tuple or list, optional
+            Order column values of the last row already processed, to resume paging after it
+
+        Yields
+        ------
+        list
+            A page of rows (lists of values); the last page may be shorter than page_size
+
+        Example
+        -------
+        >>> for page in db.iter_pages('games', ['season', 'game_id'], ('league', 'nfl'), page_size=5000):
+        ...     process(page)
+        """
+        if isinstance(order_columns, str):
+            order_columns = [order_columns]
+        if columns is not None and any(column not in columns for column in order_columns):
+            raise ValueError("columns must include all order_columns.")
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1.")
+
+        last_key = list(start_after) if start_after is not None else None
+        if last_key is not None and len(last_key) != len(order_columns):
+            raise ValueError("start_after needs one value per order column.")
+
+        key_indexes = None
+        while True:
+            query, values = self._build_page_query(table_name, order_columns, condition_tuples, columns, descending,
+                                                   after_key=last_key is not None)
+            names, rows = self._fetch_page(query, values + (last_key or []) + [page_size])
+            if not rows:
+                return
+            yield rows
+            if len(rows) < page_size:
+                return
+
+            if key_indexes is None:
+                key_indexes = [names.index(column) for column in order_columns]
+            last_key = [rows[-1][index] for index in key_indexes]
+
+    def purge_rows(self, table_name, order_column, *condition_tuples, max_rows=None, until=None, chunk_size=1000,
+                   pause=0.1, max_rows_per_second=None, descending=False, resume_from=None, progress_callback=None,
+                   stop_event=None):
+        """
+        Delete rows in small, separately committed chunks so large purges do not hold locks or build up undo for
+        the whole run. Meant for pruning big log/history tables while normal traffic continues.
+
+        Rows are deleted in order_column order (lowest first, or highest first if descending). Each chunk looks up
+        the next chunk_size keys with an index seek and deletes that key range in its own transaction, then waits
+        `pause` seconds and, if max_rows_per_second is set, long enough to stay under that rate. Every chunk is
+        capped with LIMIT, so chunk_size and max_rows are honoured exactly even when order_column has duplicates;
+        rows sharing the boundary value are picked up by the next chunk.
+
+        Parameters
+        ----------
+        table_name : str
+            Name of the table
+        order_column : str
+            Indexed, NOT NULL column that orders the rows, e.g. the primary key or a timestamp
+        condition_tuples : tuple(s) or list of tuples, optional
+            Column-value filters, same format as query_table_by_columns. Only matching rows are deleted.
+        max_rows : int, optional
+            Maximum number of rows to delete in total, by default no limit
+        until : optional
+            Only delete rows whose order_column sorts before this value (exclusive), e.g. a retention cutoff date
+        chunk_size : int, optional
+            Rows deleted and committed per statement, by default 1000
+        pause : int or float, optional
+            Seconds to sleep between chunks, by default 0.1
+        max_rows_per_second : int or float, optional
+            Deletion rate budget, by default None (only `pause` throttles)
+        descending : bool, optional
+            If True, delete from the highest order_column value down, by default False
+        resume_from : optional
+            The `resume_from` value returned by an interrupted purge, to continue from the last deleted key
+        progress_callback : callable, optional
+            Called after every chunk with a copy of the stats dict
+        stop_event : threading.Event, optional
+            Set it (e.g. from another thread) to stop after the current chunk; the stats allow resuming
+
+        Returns
+        -------
+        dict
+            deleted, chunks, seconds, rows_per_second, resume_from (last deleted key) and completed (False if the
+            purge was stopped before running out of rows)
+
+        Example
+        -------
+        >>> stats = db.purge_rows('request_log', 'created_at', until=cutoff, chunk_size=5000, max_rows_per_second=20000)
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+
+        stats = {"deleted": 0, "chunks": 0, "seconds": 0.0, "rows_per_second": 0.0, "resume_from": resume_from,
+                 "completed": False}
+        start = time.perf_counter()
+        last_key = resume_from
+
+        while stop_event is None or not stop_event.is_set():
+            limit = chunk_size if max_rows is None else min(chunk_size, max_rows - stats["deleted"])
+            if limit <= 0:
+                stats["completed"] = True
+                break
+
+            # The seek includes last_key: those rows were deleted, apart from ties left over by the LIMIT
+            query, values = self._build_page_query(table_name, [order_column], condition_tuples, [order_column],
+                                                   descending, after_key=last_key is not None, inclusive=True)
+            _, rows = self._fetch_page(query, values + ([last_key] if last_key is not None else []) + [limit])
+            keys = [row[0] for row in rows if row[0] is not None]
+            if until is not None:
+                keys = [key for key in keys if (key > until if descending else key < until)]
+            if not keys:
+                stats["completed"] = True
+                break
+
+            deleted = self._delete_key_range(table_name, order_column, condition_tuples, last_key, keys[-1],
+                                             descending, len(keys))
+            last_key = keys[-1]
+            stats["deleted"] += deleted
+            stats["chunks"] += 1
+            stats["resume_from"] = last_key
+            stats["seconds"] = time.perf_counter() - start
+            stats["rows_per_second"] = stats["deleted"] / stats["seconds"] if stats["seconds"] else 0.0
+            if progress_callback is not None:
+                progress_callback(dict(stats))
+
+            if len(keys) < limit:
+                stats["completed"] = True
+                break
+
+            wait = pause or 0
+            if max_rows_per_second:
+                wait = max(wait, stats["deleted"] / max_rows_per_second - (time.perf_counter() - start))
+            if wait > 0:
+                if stop_event is not None:
+                    stop_event.wait(wait)
+                else:
+                    time.sleep(wait)
+
+        stats["seconds"] = time.perf_counter() - start
+        stats["rows_per_second"] = stats["deleted"] / stats["seconds"] if stats["seconds"] else 0.0
+        print(f"Purged {stats['deleted']:,} rows from {table_name} in {stats['chunks']} chunks "
+              f"({stats['rows_per_second']:,.0f} rows/sec)" + ("" if stats["completed"] else ", stopped early"))
+        return stats
+
+    @_borrows_connection
+    @_idempotent_read
+    def _fetch_page(self, query, params):
+        self._check_connect_db()
+        self.cursor.execute(query, params)
+        names = [column[0] for column in self.cursor.description]
+        return names, [list(row) for row in self.cursor.fetchall()]
+
+    def enable_prepared_statements(self, max_per_connection=100):
+        """
+        Execute the hot single-row helpers (query_table_by_columns, get_single_value_from_table, insert_data,
+        update_single_value_in_table, append_values_to_columns, check_if_data_exists,
+        check_if_value_exists_in_column) as server-side prepared statements, so tight loops of identically shaped
+        calls skip the server parse and plan as well as the Python string building.
+
+        Statements are prepared lazily per connection (mysql-connector prepared cursors, PostgreSQL PREPARE) and
+        dropped after any schema change made through the helper.
+
+        Parameters
+        ----------
+        max_per_connection : int, optional
+            Prepared statements kept open per connection, least recently used are closed first, by default 100
+        """
+        self._max_prepared_per_connection = max_per_connection
+        self._prepare_statements = True
+
+    def disable_prepared_statements(self):
+        self._prepare_statements = False
+        self._statement_generation += 1
+
+    def get_statement_cache_stats(self):
+        """
+        Returns
+        -------
+        dict
+            hits, misses and entries of the SQL statement cache
+        """
+        return self._statement_cache.get_stats()
+
+    def _statement(self, key, build):
+        # SQL text (or psycopg2 Composed) for key, built by build() on the first call for that statement shape
+        return self._statement_cache.get_or_build(key, build)
+
+    def _get_connection_statements(self):
+        connection = self.db_connection
+        with self._connection_statements_lock:
+            state = self._connection_statements.get(connection)
+            if state is None:
+                state = {"generation": self._statement_generation, "prepared": collections.OrderedDict()}
+                self._connection_statements[connection] = state
+
+        if state["generation"] != self._statement_generation:
+            self._drop_prepared_statements(list(state["prepared"].values()))
+            state["prepared"].clear()
+            state["generation"] = self._statement_generation
+        return state
+
+    def _execute_statement(self, key, query, params, fetch=True):
+        """
+        Execute a statement from the statement cache on the current connection, prepared if enabled. Returns all
+        result rows if fetch is True, else the affected row count.
+        """
+        if not self._prepare_statements:
+            self.cursor.execute(query, params)
+            return self.cursor.fetchall() if fetch else self.cursor.rowcount
+
+        prepared = self._get_connection_statements()["prepared"]
+        handle = prepared.get(key)
+        if handle is None:
+            handle = self._prepare_statement(query)
+            prepared[key] = handle
+            if len(prepared) > self._max_prepared_per_connection:
+                self._drop_prepared_statements([prepared.popitem(last=False)[1]])
+        else:
+            prepared.move_to_end(key)
+        return self._execute_prepared(handle, query, params, fetch)
+
+    def enable_query_instrumentation(self, slow_query_threshold=None, explain_slow_queries=False,
+                                     max_slow_queries=100, log_slow_queries=True):
+        """
+        Time every statement the helper executes and every helper method call.
+
+        Each statement is reported with its shape (literals and long placeholder lists folded), parameter count,
+        rows returned/affected, latency and the time spent waiting for a pooled connection. Register callbacks with
+        add_query_hook, read per-method latency histograms with get_query_stats and slow statements with
+        get_slow_queries.
+
+        Parameters
+        ----------
+        slow_query_threshold : int or float, optional
+            Seconds at or above which a statement goes to the slow-query log, by default None (no slow log)
+        explain_slow_queries : bool, optional
+            If True, the EXPLAIN output of each slow statement is captured in its log entry, by default False
+        max_slow_queries : int, optional
+            Number of most recent slow queries kept, by default 100
+        log_slow_queries : bool, optional
+            If True, slow queries are also printed as they happen, by default True
+
+        Returns
+        -------
+        QueryInstrumentation
+            The instrumentation now in use
+
+        Example
+        -------
+        >>> db.enable_query_instrumentation(slow_query_threshold=0.25, explain_slow_queries=True)
+        >>> db.add_query_hook(lambda event: metrics.timing('sql.' + event['method'], event['seconds']))
+        """
+        hooks = self._instrumentation.hooks if self._instrumentation is not None else []
+        self._instrumentation = QueryInstrumentation(slow_query_threshold=slow_query_threshold,
+                                                     explain_slow_queries=explain_slow_queries,
+                                                     max_slow_queries=max_slow_queries,
+                                                     log_slow_queries=log_slow_queries)
+        self._instrumentation.hooks.extend(hooks)
+        return self._instrumentation
+
+    def disable_query_instrumentation(self):
+        self._instrumentation = None
+
+    def add_query_hook(self, hook):
+        """
+        Register a callback that receives the event dict of every executed statement (see
+        enable_query_instrumentation). Instrumentation is enabled with default settings if it is not already.
+        """
+        if self._instrumentation is None:
+            self.enable_query_instrumentation()
+        self._instrumentation.hooks.append(hook)
+
+    def remove_query_hook(self, hook):
+        if self._instrumentation is not None and hook in self._instrumentation.hooks:
+            self._instrumentation.hooks.remove(hook)
+
+    def get_query_stats(self):
+        """
+        Returns
+        -------
+        dict or None
+            Per helper method: calls, statements, total/mean/max seconds and a latency histogram. None if
+            instrumentation is not enabled.
+        """
+        return None if self._instrumentation is None else self._instrumentation.get_stats()
+
+    def get_slow_queries(self):
+        """
+        Returns
+        -------
+        list
+            Event dicts of the most recent slow statements, oldest first
+        """
+        return [] if self._instrumentation is None else list(self._instrumentation.slow_queries)
+
+    def reset_query_stats(self):
+        if self._instrumentation is not None:
+            self._instrumentation.reset()
+
+    def _instrument_cursor(self, cursor, label=None, explainable=True):
+        if self._instrumentation is None:
+            return cursor
+        return _InstrumentedCursor(cursor, self, label=label, explainable=explainable)
+
+    def _take_connection_wait(self):
+        # Pool wait of the current lease, reported once with the first statement run on it
+        lease = self._get_lease()
+        return 0.0 if lease is None else lease.pop('wait', 0.0)
+
+    @staticmethod
+    def _query_text(query, cursor):
+        if isinstance(query, bytes):
+            return query.decode('utf-8', 'replace')
+        if isinstance(query, str):
+            return query
+        try:
+            return query.as_string(cursor)
+        except Exception:
+            return repr(query)
+
+    def export_table(self, table_name, path, format=None, where=None, columns=None, batch_size=10000,
+                     compress=None, progress_callback=None):
+        """
+        Stream a table (optionally filtered) into a CSV, JSON Lines or Parquet file with bounded memory.
+
+        Rows are read from a server-side/unbuffered cursor in batches and written as they arrive, so the table is
+        never held in memory. CSV files get a header row; JSONL has one object per row; Parquet is written one row
+        group per batch (requires the optional pyarrow package). JSON values are written as JSON text, bytes as
+        base64 and dates/times in ISO format.
+
+        Parameters
+        ----------
+        table_name : str
+            Name of the table to export
+        path : str
+            Output file. The format and gzip compression are inferred from the name if not given, e.g. 'x.csv.gz'.
+        format : str, optional
+            'csv', 'jsonl' or 'parquet', by default inferred from path
+        where : tuple or list of tuples, optional
+            Column-value conditions in the same format as query_table_by_columns, by default all rows
+        columns : list of str, optional
+            Columns to export, by default all
+        batch_size : int, optional
+            Rows fetched and written per batch, by default 10000
+        compress : bool, optional
+            gzip the csv/jsonl output, by default inferred from a '.gz' suffix
+        progress_callback : callable, optional
+            Called with the number of rows written so far after every batch
+
+        Returns
+        -------
+        dict
+            rows, path, format, seconds and rows_per_second
+
+        Example
+        -------
+        >>> db.export_table('games', 'games_2024.jsonl.gz', where=[('season', 2024)])
+        """
+        file_format, compress = _resolve_export_format(path, format, compress)
+        query, values = self._build_table_select(table_name, tuple(where or ()), columns)
+        start_time = time.perf_counter()
+
+        stream = self._stream_query(query, values or None, batch_size)
+        try:
+            description = next(stream)
+            names = [column[0] for column in description]
+            if file_format == 'parquet':
+                rows = self._write_parquet_export(path, description, stream, progress_callback)
+            else:
+                rows = 0
+                with _open_export_file(path, compress) as export_file:
+                    if file_format == 'csv':
+                        writer = csv.writer(export_file)
+                        writer.writerow(names)
+                    for batch in stream:
+                        if file_format == 'csv':
+                            writer.writerows([_export_csv_value(value) for value in row] for row in batch)
+                        else:
+                            export_file.writelines(
+                                json.dumps(dict(zip(names, row)), default=_export_json_default) + "\n"
+                                for row in batch)
+                        rows += len(batch)
+                        if progress_callback is not None:
+                            progress_callback(rows)
+        finally:
+            stream.close()
+
+        return self._export_stats(table_name, path, file_format, rows, start_time)
+
+    def _write_parquet_export(self, path, description, stream, progress_callback):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet export requires pyarrow: pip install pyarrow")
+
+        names = [column[0] for column in description]
+        arrow_types = []
+        for column in description:
+            dtype = self._column_dtypes.get(column[1])
+            if dtype in _PARQUET_TYPES_BY_DTYPE:
+                arrow_types.append(getattr(pa, _PARQUET_TYPES_BY_DTYPE[dtype])())
+            elif dtype is not None and dtype.startswith('datetime64'):
+                arrow_types.append(pa.timestamp('us'))
+            elif dtype is not None and dtype.startswith('timedelta64'):
+                arrow_types.append(pa.duration('us'))
+            else:
+                arrow_types.append(None)
+
+        writer = None
+        rows = 0
+        try:
+            for batch in stream:
+                arrays = []
+                for index, values in enumerate(zip(*batch)):
+                    array, arrow_types[index] = _parquet_column(list(values), arrow_types[index], pa)
+                    arrays.append(array)
+                record_batch = pa.RecordBatch.from_arrays(arrays, names=names)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, record_batch.schema)
+                writer.write_batch(record_batch)
+                rows += len(batch)
+                if progress_callback is not None:
+                    progress_callback(rows)
+
+            if writer is None:
+                empty_types = [arrow_type or pa.string() for arrow_type in arrow_types]
+                writer = pq.ParquetWriter(path, pa.schema(list(zip(names, empty_types))))
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
+
+    @staticmethod
+    def _export_stats(table_name, path, file_format, rows, start_time):
+        seconds = time.perf_counter() - start_time
+        rows_per_second = rows / seconds if seconds > 0 else 0.0
+        print(f"Exported {rows:,} rows from {table_name} to {path} ({rows_per_second:,.0f} rows/sec)")
+        return {"rows": rows, "path": path, "format": file_format, "seconds": seconds,
+                "rows_per_second": rows_per_second}
+
+    @_borrows_connection
+    def import_file(self, table_name, path, format=None, column_map=None, batch_size=10000, compress=None,
+                    converters=None, null_values=('',), quarantine_path=None, max_errors=None,
+                    progress_callback=None):
+        """
+        Stream a CSV, JSON Lines or Parquet file into a table with bounded memory, setting aside rows that fail.
+
+        The file is read and loaded batch_size rows at a time using the fastest path of the database (COPY FROM
+        STDIN on PostgreSQL, multi-row INSERTs on MySQL), committing after every batch. Values are converted to the
+        types of the target columns (integers, floats, booleans, dates and timestamps) before they are sent; other
+        types are passed through for the server to parse.
+
+        Rows that cannot be parsed or converted, or that the database rejects (constraint violations, bad values),
+        are skipped and written to quarantine_path as JSON Lines: {"line": ..., "error": ..., "record": ...}. When a
+        batch fails it is rolled back to a savepoint and retried row by row, so only the offending rows are lost.
+
+        Parameters
+        ----------
+        table_name : str
+            Name of the table to load into
+        path : str
+            Input file. The format and gzip compression are inferred from the name if not given, e.g. 'x.csv.gz'.
+            CSV files must start with a header row.
+        format : str, optional
+            'csv', 'jsonl' or 'parquet', by default inferred from path. Parquet requires the optional pyarrow package.
+        column_map : dict, optional
+            {file column: table column}. Only mapped columns are loaded. By default every column of the file (CSV
+            header or keys of the first JSON object) is loaded into the table column of the same name. ValueError is
+            raised before anything is loaded if a mapped column is not in the file.
+        batch_size : int, optional
+            Rows loaded and committed per batch, by default 10000
+        compress : bool, optional
+            Whether the csv/jsonl file is gzipped, by default inferred from a '.gz' suffix
+        converters : dict, optional
+            {table column: callable} used instead of the default conversion for that column
+        null_values : tuple of str, optional
+            CSV field values loaded as NULL, by default ('',)
+        quarantine_path : str, optional
+            File the rejected rows are written to (gzipped if it ends in '.gz'), by default rejected rows are only
+            counted
+        max_errors : int, optional
+            Stop with ValueError once more than this many rows were rejected, by default no limit. Batches committed
+            before that stay in the table.
+        progress_callback : callable, optional
+            Called after each batch as progress_callback(rows_loaded, elapsed_seconds)
+
+        Returns
+        -------
+        dict
+            rows, rejected, batches, path, format, quarantine_path, seconds and rows_per_second
+
+        Example
+        -------
+        >>> db.import_file('games', 'games_2024.csv.gz', column_map={'Season': 'season', 'Team': 'team'},
+        ...                quarantine_path='games_2024_rejected.jsonl')
+        """
+        file_format, compress = _resolve_export_format(path, format, compress)
+        file_null_values = frozenset(null_values or ()) if file_format == 'csv' else frozenset()
+        converters = converters or {}
+        self._check_connect_db()
+
+        stats = {"rows": 0, "rejected": 0, "batches": 0}
+        start_time = time.perf_counter()
+        file_columns = table_columns = convert_row = None
+        batch = []
+        quarantine_file = None
+
+        def reject(line_number, record, error):
+            nonlocal quarantine_file
+            stats['rejected'] += 1
+            if quarantine_path is not None:
+                if quarantine_file is None:
+                    quarantine_file = _open_export_file(quarantine_path, str(quarantine_path).lower().endswith('.gz'))
+                quarantine_file.write(json.dumps({"line": line_number, "error": str(error), "record": record},
+                                                 default=_export_json_default) + "\n")
+            if max_errors is not None and stats['rejected'] > max_errors:
+                raise ValueError(f"Import of {path} stopped after {stats['rejected']} rejected rows "
+                                 f"(line {line_number}: {error})")
+
+        def load_batch():
+            failures = self._load_import_batch(table_name, table_columns, [row for _, _, row in batch])
+            self._commit(table_name)
+            stats['rows'] += len(batch) - len(failures)
+            stats['batches'] += 1
+            for index, error in failures:
+                reject(batch[index][0], batch[index][1], error)
+            batch.clear()
+            if progress_callback is not None:
+                progress_callback(stats['rows'], time.perf_counter() - start_time)
+
+        try:
+            for line_number, record, error in _iter_import_records(path, file_format, compress, batch_size):
+                if error is not None:
+                    reject(line_number, record, error)
+                    continue
+
+                if file_columns is None:
+                    unknown_columns = [column for column in column_map or () if column not in record]
+                    if unknown_columns:
+                        raise ValueError(f"column_map refers to columns that are not in {path}: "
+                                         f"{', '.join(map(str, unknown_columns))}")
+                    file_columns = list(column_map) if column_map else list(record)
+                    table_columns = [column_map[column] for column in file_columns] if column_map else file_columns
+                    dtypes = [self._column_dtypes.get(type_code)
+                              for type_code in self._column_type_codes(table_name, table_columns)]
+                    convert_row = _build_import_row_converter(
+                        [converters.get(column) or _IMPORT_CONVERTERS.get(dtype, _import_passthrough)
+                         for column, dtype in zip(table_columns, dtypes)], file_null_values)
+
+                try:
+                    row = convert_row([record.get(column) for column in file_columns])
+                except (ValueError, TypeError, OverflowError) as e:
+                    reject(line_number, record, e)
+                    continue
+
+                batch.append((line_number, record, row))
+                if len(batch) >= batch_size:
+                    load_batch()
+
+            if batch:
+                load_batch()
+        finally:
+            if quarantine_file is not None:
+                quarantine_file.close()
+
+        seconds = time.perf_counter() - start_time
+        rows_per_second = stats['rows'] / seconds if seconds > 0 else 0.0
+        print(f"Imported {stats['rows']:,} rows into {table_name} from {path} ({rows_per_second:,.0f} rows/sec)"
+              + (f", {stats['rejected']:,} rows rejected" if stats['rejected'] else ""))
+        stats.update({"path": path, "format": file_format,
+                      "quarantine_path": quarantine_path if stats['rejected'] else None,
+                      "seconds": seconds, "rows_per_second": rows_per_second})
+        return stats
+
+    def _load_import_batch(self, table_name, table_columns, rows):
+        # Loads one batch with the bulk path inside a savepoint. If the server rejects it the batch is rolled back and
+        # retried row by row, each row in its own savepoint. Returns [(index in rows, error)] for the failed rows.
+        self.cursor.execute("SAVEPOINT lukhed_import_batch")
+        try:
+            self._bulk_load_rows(table_name, table_columns, rows)
+        except Exception:
+            self.cursor.execute("ROLLBACK TO SAVEPOINT lukhed_import_batch")
+        else:
+            self.cursor.execute("RELEASE SAVEPOINT lukhed_import_batch")
+            return []
+
+        query = self._build_insert_statement(table_name, table_columns)
+        failures = []
+        for index, row in enumerate(rows):
+            self.cursor.execute("SAVEPOINT lukhed_import_row")
+            try:
+                self.cursor.execute(query, row)
+            except Exception as e:
+                self.cursor.execute("ROLLBACK TO SAVEPOINT lukhed_import_row")
+                failures.append((index, e))
+            else:
+                self.cursor.execute("RELEASE SAVEPOINT lukhed_import_row")
+        self.cursor.execute("RELEASE SAVEPOINT lukhed_import_batch")
+        return failures
+
+    def enable_connection_pool(self, min_size=1, max_size=10, idle_timeout=300, checkout_timeout=30,
+                               health_check_interval=30):
+        """
+        Switch the helper to pooled mode. Every helper method then borrows a connection from a thread-safe pool for
+        the duration of the call instead of sharing one connection and cursor, so the helper can be used from many
+        threads at once.
+
+        Parameters
+        ----------
+        min_size : int, optional
+            Connections kept open even when idle, by default 1
+        max_size : int, optional
+            Maximum connections open at once, by default 10
+        idle_timeout : int or float, optional
+            Seconds before an idle connection above min_size is closed, by default 300
+        checkout_timeout : int or float, optional
+            Seconds to wait for a free connection before raising TimeoutError, by default 30
+        health_check_interval : int or float, optional
+            Connections idle longer than this many seconds are pinged before re-use, by default 30
+
+        Returns
+        -------
+        SqlConnectionPool
+            The pool now in use
+        """
+        self.disable_connection_pool()
+        self._pool = SqlConnectionPool(self._open_connection, self._ping_connection,
+                                       reset_function=self._reset_connection, min_size=min_size, max_size=max_size,
+                                       idle_timeout=idle_timeout, checkout_timeout=checkout_timeout,
+                                       health_check_interval=health_check_interval)
+        return self._pool
+
+    def disable_connection_pool(self):
+        """
+        Close the connection pool (if any) and return to the single shared connection.
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    def get_pool_status(self):
+        """
+        Returns
+        -------
+        dict or None
+            Pool status (see SqlConnectionPool.get_pool_status) or None if pooling is not enabled
+        """
+        return None if self._pool is None else self._pool.get_pool_status()
+
+
+class SqlHelper(_PooledConnectionMixin, classCommon.LukhedAuth):
+    _column_dtypes = _MYSQL_COLUMN_DTYPES
 
-class SqlHelper(classCommon.LukhedAuth):
     def __init__(self, datbase_project, datbase_name, key_management='github', auth_type='basic', 
                  auth_dict=None):
         """
@@ -49,6 +2273,7 @@ class SqlHelper(classCommon.LukhedAuth):
         if self._auth_data is None:
             self._auth_setup()
 
+        self._init_connection_state()
         self.db_connection = None                       # type: Optional[MySQLConnection]
         self.cursor = None
         atexit.register(self.close_connection)
@@ -87,22 +2312,112 @@ class SqlHelper(classCommon.LukhedAuth):
             raise ValueError(f"Unsupported auth_type: {self.auth_type}")
         
     def _check_connect_db(self):
-        if self.db_connection is None:
-            self.connect()
-        elif self.db_connection.is_connected():
-            pass
+        if self._pool is not None:
+            self._bind_lease()
+        elif self.db_connection is not None and self._connection_trusted():
+            pass  # is_connected() pings the server, so a recently verified connection is used as is
         else:
-            self.connect()
-        
-    def connect(self):
-        self.db_connection = mysql.connector.connect(
+            if self.db_connection is None or not self.db_connection.is_connected():
+                self.connect()
+            self._connection_verified_at = time.monotonic()
+
+    def _connection_lost(self, error):
+        if not isinstance(error, (mysql.connector.errors.OperationalError, mysql.connector.errors.InterfaceError)):
+            return False
+        return self.db_connection is None or not self.db_connection.is_connected()
+
+    def _open_connection(self):
+        return mysql.connector.connect(
             host=self._auth_data['host'],
             user=self._auth_data['user'],
             password=self._auth_data['password'],
             database=self.database_name
         )
+
+    def _open_cursor(self, connection):
+        # Buffered so a cursor returned to the caller (execute_query) stays readable after the lease ends
+        return connection.cursor(buffered=True)
+
+    def _ping_connection(self, connection):
+        return connection.is_connected()
+
+    def _reset_connection(self, connection):
+        # End the implicit transaction so the next borrower does not see a stale snapshot
+        if connection.in_transaction:
+            connection.rollback()
+
+    def _prepare_statement(self, query):
+        # The prepared cursor prepares on its first execute and re-uses the statement while it is given the same
+        # (cached) query object
+        return self.db_connection.cursor(prepared=True)
+
+    def _execute_prepared(self, prepared_cursor, query, params, fetch):
+        prepared_cursor = self._instrument_cursor(prepared_cursor)
+        prepared_cursor.execute(query, params)
+        # Prepared cursors are unbuffered, so results are always read fully before the connection is used again
+        return prepared_cursor.fetchall() if fetch else prepared_cursor.rowcount
+
+    def _drop_prepared_statements(self, prepared_cursors):
+        for prepared_cursor in prepared_cursors:
+            try:
+                prepared_cursor.close()
+            except Exception:
+                pass
+
+    def _explain_statement(self, query_text, params):
+        try:
+            explain_cursor = self.db_connection.cursor(buffered=True)
+            try:
+                explain_cursor.execute("EXPLAIN " + query_text, params)
+                return [list(row) for row in explain_cursor.fetchall()]
+            finally:
+                explain_cursor.close()
+        except mysql.connector.Error as e:
+            return f"EXPLAIN failed: {e}"
+
+    def _get_statement_byte_budget(self):
+        # Size budget for generated multi-row statements: 90% of max_allowed_packet, capped at 16 MiB
+        self._check_connect_db()
+        self.cursor.execute("SELECT @@max_allowed_packet")
+        return min(int(self.cursor.fetchone()[0] * 0.9), 16 * 1024 * 1024)
+
+    def _column_type_codes(self, table_name, columns):
+        self.cursor.execute(f"SELECT {', '.join(columns)} FROM {table_name} LIMIT 0")
+        type_codes = [column[1] for column in self.cursor.description]
+        self.cursor.fetchall()
+        return type_codes
+
+    def _staging_index_clause(self, table_name, key_columns):
+        # Index definition for the key columns of a staging table, declared in CREATE TEMPORARY TABLE because a
+        # separate ALTER TABLE would commit implicitly (also inside transaction()/batch()). TEXT/BLOB columns can
+        # only be indexed on a prefix; JSON or spatial key columns cannot be indexed at all and get no index.
+        index_columns = []
+        for column, type_code in zip(key_columns, self._column_type_codes(table_name, key_columns)):
+            if type_code in (FieldType.JSON, FieldType.GEOMETRY):
+                return ""
+            if type_code in (FieldType.TINY_BLOB, FieldType.BLOB, FieldType.MEDIUM_BLOB, FieldType.LONG_BLOB):
+                index_columns.append(f"{column}(191)")
+            else:
+                index_columns.append(column)
+        return f" (INDEX ({', '.join(index_columns)}))"
+
+    def _build_insert_statement(self, table_name, columns):
+        return f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+
+    def _bulk_load_rows(self, table_name, table_columns, rows):
+        # Multi-row INSERTs sized to the server's packet limit, as in insert_data_as_table (no commit)
+        query_prefix = f"INSERT INTO {table_name} ({', '.join(table_columns)}) VALUES "
+        row_placeholders = "(" + ", ".join(["%s"] * len(table_columns)) + ")"
+        max_bytes = self._get_statement_byte_budget() - len(query_prefix)
+        for chunk in _chunk_rows_by_size(rows, max_bytes, 2 + len(table_columns) * 2):
+            self.cursor.execute(query_prefix + ", ".join([row_placeholders] * len(chunk)),
+                                [value for row in chunk for value in row])
+        
+    def connect(self):
+        self.db_connection = self._open_connection()
         self.cursor = self.db_connection.cursor()
 
+    @_borrows_connection
     def test_connection(self):
         self._check_connect_db()
         if self.db_connection.is_connected():
@@ -111,12 +2426,16 @@ class SqlHelper(classCommon.LukhedAuth):
             print("Failed to connect to the database")
 
     def close_connection(self):
+        self._connection_verified_at = None
+        if self._pool is not None:
+            self._pool.close_all()
         if self.db_connection and self.db_connection.is_connected():
             self.db_connection.close()
             print("Connection was closed to " + self.database_name)
 
     def change_database(self, database_name):
         self.close_connection()
+        self.invalidate_schema_cache()
         self.database_name = database_name
         print("New database is: " + self.database_name)
 
@@ -128,13 +2447,20 @@ class SqlHelper(classCommon.LukhedAuth):
 
     ##################
     # Table Management
+    @_borrows_connection
+    @_idempotent_read
     def get_all_tables(self):
+        cached = self._schema_cache_lookup('tables', None)
+        if cached is not None:
+            return cached
+
         self._check_connect_db()
         query = "SHOW TABLES;"
         self.cursor.execute(query)
         tables = [table[0] for table in self.cursor.fetchall()]
-        return tables
+        return self._schema_cache_store('tables', None, tables)
     
+    @_borrows_connection
     def create_table(self, table_name, *column_tuples, include_id=False, charset='utf8mb4'):
         """
         Create a new table with the specified name and columns.
@@ -163,8 +2489,10 @@ class SqlHelper(classCommon.LukhedAuth):
         query = f"CREATE TABLE {table_name} ({columns_str}) CHARACTER SET {charset};"
 
         self.cursor.execute(query)
-        self.db_connection.commit()
+        self._commit(table_name)
+        self.invalidate_schema_cache(table_name)
 
+    @_borrows_connection
     def delete_table(self, table_name, has_foreign_key=False):
         """
         Delete a table from the database.
@@ -185,13 +2513,16 @@ class SqlHelper(classCommon.LukhedAuth):
                 foreign_key_name = foreign_key['constraint_name']
                 query = f"ALTER TABLE {table_name} DROP FOREIGN KEY {foreign_key_name};"
                 self.cursor.execute(query)
-                self.db_connection.commit()
+                self._commit(table_name)
 
         # Drop the table
         query = f"DROP TABLE {table_name};"
         self.cursor.execute(query)
-        self.db_connection.commit()
+        self._commit(table_name)
+        self.invalidate_schema_cache(table_name)
 
+    @_borrows_connection
+    @_idempotent_read
     def table_exists(self, table_name):
         """
         Check if a table exists in the database.
@@ -206,14 +2537,19 @@ class SqlHelper(classCommon.LukhedAuth):
         bool
             True if the table exists, False otherwise
         """
+        cached = self._schema_cache_lookup('exists', table_name)
+        if cached is not None:
+            return cached
+
         self._check_connect_db()
 
         query = f"SHOW TABLES LIKE '{table_name}';"
         self.cursor.execute(query)
         result = self.cursor.fetchone()
 
-        return result is not None
+        return self._schema_cache_store('exists', table_name, result is not None)
     
+    @_borrows_connection
     def rename_table(self, old_table_name, new_table_name):
         """
         Rename a table.
@@ -229,8 +2565,11 @@ class SqlHelper(classCommon.LukhedAuth):
 
         query = f"ALTER TABLE {old_table_name} RENAME TO {new_table_name};"
         self.cursor.execute(query)
-        self.db_connection.commit()
+        self._commit(old_table_name, new_table_name)
+        self.invalidate_schema_cache(old_table_name)
+        self.invalidate_schema_cache(new_table_name)
 
+    @_borrows_connection
     def reset_table(self, table_name, reset_auto_increment=True):
         """
         This function erases the table and also resets the auto_increment if the bool is set to do so
@@ -247,15 +2586,16 @@ class SqlHelper(classCommon.LukhedAuth):
         # Delete all rows from the table
         delete_query = f"DELETE FROM {table_name}"
         self.cursor.execute(delete_query)
-        self.db_connection.commit()
+        self._commit(table_name)
 
         # Reset the auto-increment value for the ID column
         if reset_auto_increment:
             reset_auto_increment_query = f"ALTER TABLE {table_name} AUTO_INCREMENT = 1"
             self.cursor.execute(reset_auto_increment_query)
-            self.db_connection.commit()
+            self._commit(table_name)
 
-    def remove_rows_from_table(self, table_name, rows=1, order_column="id"):
+    @_borrows_connection
+    def remove_rows_from_table(self, table_name, rows=1, order_column="id", chunk_size=None):
         """
         This function removes a row for the named table by default. It will remove more rows if you specify. This
         function works by ordering the table by the order_column, by default "id". If you have an id column that is
@@ -269,15 +2609,21 @@ class SqlHelper(classCommon.LukhedAuth):
             Number of rows to remove (default is 1)
         order_column : str, optional
             Column by which to order the table for row removal (default is "id")
+        chunk_size : int, optional
+            If given, rows are removed in separately committed chunks of this size via purge_rows, by default None
         """
+        if chunk_size:
+            return self.purge_rows(table_name, order_column, max_rows=rows, chunk_size=chunk_size, descending=True)
+
         self._check_connect_db()
         delete_query = f"DELETE FROM {table_name} ORDER BY {order_column} DESC LIMIT {rows}"
         self.cursor.execute(delete_query)
-        self.db_connection.commit()
+        self._commit(table_name)
 
 
     ########################
     # Table Data Management: Data Checks and Queries
+    @_borrows_connection
     def display_table_in_console(self, table_name, max_rows=20, min_column_width=15):
         """
         Display a formatted table in the console with proper alignment and borders.
@@ -334,6 +2680,8 @@ class SqlHelper(classCommon.LukhedAuth):
         if max_rows and len(data) == max_rows:
             print(f"Note: Showing first {max_rows} rows only.")
     
+    @_borrows_connection
+    @_idempotent_read
     def get_table_as_list(self, table_name, max_rows=None):
         self._check_connect_db()
         select_query = f"SELECT * FROM {table_name}"
@@ -349,6 +2697,8 @@ class SqlHelper(classCommon.LukhedAuth):
 
         return result
     
+    @_borrows_connection
+    @_idempotent_read
     def get_last_x_entries(self, table_name, x):
         """
         This function assumes a column has an "id" column to order by.
@@ -373,7 +2723,128 @@ class SqlHelper(classCommon.LukhedAuth):
             result.append(list(row))
 
         return result
+
+    def iter_query(self, query, params=None, batch_size=1000, as_batches=False, include_header=False):
+        """
+        Stream the results of a SELECT query without loading the whole result set into memory.
+
+        Rows are read from an unbuffered cursor, so the server streams them as they are consumed and only one batch
+        is held in memory at a time. Without a connection pool the stream occupies the helper's connection: consume
+        or close the generator before running other queries. With a pool the stream uses its own connection.
+
+        Parameters
+        ----------
+        query : str
+            The SELECT query to run
+        params : tuple or list, optional
+            Parameters to be passed to the query
+        batch_size : int, optional
+            Number of rows fetched from the server per round, by default 1000
+        as_batches : bool, optional
+            If True, yields lists of rows (one list per batch) instead of single rows, by default False
+        include_header : bool, optional
+            If True, the first item yielded is the list of column names, by default False
+
+        Yields
+        ------
+        list
+            A row (list of values), or a batch of rows if as_batches is True
+        """
+        stream = self._stream_query(query, params, batch_size)
+        try:
+            description = next(stream)
+            if include_header:
+                yield [column[0] for column in description]
+
+            for rows in stream:
+                if as_batches:
+                    yield [list(row) for row in rows]
+                else:
+                    for row in rows:
+                        yield list(row)
+        finally:
+            stream.close()
+
+    def _stream_query(self, query, params, batch_size):
+        """
+        Yields the cursor description first, then each non-empty batch of rows (tuples) as fetched from the server.
+        """
+        with self._dedicated_connection() as connection:
+            stream_cursor = self._instrument_cursor(connection.cursor(buffered=False), label='iter_query',
+                                                    explainable=False)
+            try:
+                stream_cursor.execute(query, params)
+                yield stream_cursor.description
+
+                while True:
+                    rows = stream_cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield rows
+            finally:
+                stream_cursor.close()
+
+    def iter_table(self, table_name, *condition_tuples, columns=None, batch_size=1000, as_batches=False,
+                   include_header=False):
+        """
+        Stream the rows of a table (optionally filtered) in constant memory. See iter_query for details.
+
+        Parameters
+        ----------
+        table_name : str
+            Name of the table
+        condition_tuples : tuple(s) or list of tuples, optional
+            Column-value conditions, same format as query_table_by_columns. If not given, all rows are streamed.
+        columns : list of str, optional
+            Columns to select, by default all columns
+        batch_size : int, optional
+            Number of rows fetched from the server per round, by default 1000
+        as_batches : bool, optional
+            If True, yields lists of rows instead of single rows, by default False
+        include_header : bool, optional
+            If True, the first item yielded is the list of column names, by default False
+
+        Yields
+        ------
+        list
+            A row (list of values), or a batch of rows if as_batches is True
+
+        Example
+        -------
+        >>> for batch in db.iter_table('games', ('season', 2024), batch_size=5000, as_batches=True):
+        ...     process(batch)
+        """
+        query, values = self._build_table_select(table_name, condition_tuples, columns)
+        yield from self.iter_query(query, values or None, batch_size=batch_size, as_batches=as_batches,
+                                   include_header=include_header)
+
+    def _build_table_select(self, table_name, condition_tuples, columns=None):
+        columns_sql = ", ".join(columns) if columns else "*"
+        query = f"SELECT {columns_sql} FROM {table_name}"
+        where_sql, values = _build_where_clause(condition_tuples)
+        if where_sql:
+            query += f" WHERE {where_sql}"
+        return query, values
+
+    def _build_page_query(self, table_name, order_columns, condition_tuples, columns, descending, after_key,
+                          inclusive=False):
+        columns_sql = ", ".join(columns) if columns else "*"
+        where_sql, values = _build_where_clause(condition_tuples)
+        clauses = [f"({where_sql})"] if where_sql else []
+        if after_key:
+            placeholders = ", ".join(["%s"] * len(order_columns))
+            operator = ('<' if descending else '>') + ('=' if inclusive else '')
+            clauses.append(f"({', '.join(order_columns)}) {operator} ({placeholders})")
+
+        direction = " DESC" if descending else ""
+        query = f"SELECT {columns_sql} FROM {table_name}"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY " + ", ".join(column + direction for column in order_columns) + " LIMIT %s"
+        return query, values
     
+    @_borrows_connection
+    @_idempotent_read
     def query_table_by_columns(self, table_name, *condition_tuples):
         """
         Query the table by specified columns and conditions.
@@ -390,28 +2861,23 @@ class SqlHelper(classCommon.LukhedAuth):
         list
             A list of rows matching the query conditions
         """
-        self._check_connect_db()
-
-        if isinstance(condition_tuples[0][0], (tuple, list)):
-            conditions_list = [
-                " AND ".join([f"{column} = %s" for column, _ in tuple]) for tuple in condition_tuples
-            ]
-            values = [value for tuple in condition_tuples for _, value in tuple]
-        else:
-            conditions_list = [
-                " AND ".join([f"{column} = %s" for column, _ in condition_tuples])
-            ]
-            values = [value for _, value in condition_tuples]
+        groups, values = _split_condition_groups(condition_tuples)
+        statement_key = ('query_table_by_columns', table_name, groups)
+        query = self._statement(statement_key, lambda: (
+            f"SELECT * FROM {table_name} WHERE {' OR '.join(_and_conditions(group) for group in groups)};"))
 
-        conditions_sql = " OR ".join(conditions_list)
-        query = f"SELECT * FROM {table_name} WHERE {conditions_sql};"
+        cached = self._result_cache_lookup(table_name, query, values)
+        if cached is not _CACHE_MISS:
+            return cached
 
-        self.cursor.execute(query, values)
-        rows = self.cursor.fetchall()
+        self._check_connect_db()
+        rows = self._execute_statement(statement_key, query, values)
         rows_as_lists = [list(row) for row in rows]
 
-        return rows_as_lists
+        return self._result_cache_store(table_name, query, values, rows_as_lists)
     
+    @_borrows_connection
+    @_idempotent_read
     def query_by_month_day(self, table_name, date_column, date_string):
         """
         Query records where the date matches the month and day.
@@ -445,6 +2911,8 @@ class SqlHelper(classCommon.LukhedAuth):
 
         return rows_as_lists
     
+    @_borrows_connection
+    @_idempotent_read
     def get_columns_with_null_values(self, table_name, *lookup_condition_tuples):
         """
         Get columns with null values in the specified table and conditions.
@@ -485,6 +2953,8 @@ class SqlHelper(classCommon.LukhedAuth):
         else:
             return []
         
+    @_borrows_connection
+    @_idempotent_read
     def is_value_null(self, table_name, to_check_column, *lookup_condition_tuples):
         """
         Check if a value is null in the specified table and conditions.
@@ -511,6 +2981,8 @@ class SqlHelper(classCommon.LukhedAuth):
         else:
             return False
     
+    @_borrows_connection
+    @_idempotent_read
     def check_if_data_exists(self, table_name, columns, values):
         """
         Checks if the specified data exists in the table.
@@ -531,13 +3003,16 @@ class SqlHelper(classCommon.LukhedAuth):
         """
 
         self._check_connect_db()
-        query = f"SELECT COUNT(*) FROM {table_name} WHERE {' AND '.join([f'{col} = %s' for col in columns])}"
+        statement_key = ('check_if_data_exists', table_name, tuple(columns))
+        query = self._statement(statement_key, lambda: (
+            f"SELECT COUNT(*) FROM {table_name} WHERE {_and_conditions(columns)}"))
 
-        self.cursor.execute(query, values)
-        count = self.cursor.fetchone()[0]
+        count = self._execute_statement(statement_key, query, values)[0][0]
 
         return count > 0
     
+    @_borrows_connection
+    @_idempotent_read
     def check_if_value_exists_in_column(self, table_name, column, value_to_check):
         """
         Check if a value exists in the specified column of the table.
@@ -558,14 +3033,59 @@ class SqlHelper(classCommon.LukhedAuth):
         """
         self._check_connect_db()
 
-        query = f"SELECT COUNT(*) FROM {table_name} WHERE {column} = %s"
-        self.cursor.execute(query, (value_to_check,))
-        count = self.cursor.fetchone()[0]
+        statement_key = ('check_if_value_exists_in_column', table_name, column)
+        query = self._statement(statement_key, lambda: f"SELECT COUNT(*) FROM {table_name} WHERE {column} = %s")
+        count = self._execute_statement(statement_key, query, (value_to_check,))[0][0]
 
         return count > 0
     
+    @_borrows_connection
+    @_idempotent_read
+    def filter_existing(self, table_name, columns, rows, chunk_size=1000):
+        """
+        Return which of many candidate rows already exist in the table, checking chunk_size candidates per query
+        instead of one SELECT COUNT(*) per candidate.
+
+        Parameters
+        ----------
+        table_name : str
+            Name of the table to check
+        columns : str or list of str
+            Key column(s) to match. With a single column name as a string, rows are plain values.
+        rows : iterable
+            Candidate keys: lists/tuples of values in columns order, or plain values for a single column
+        chunk_size : int, optional
+            Candidates checked per query, by default 1000
+
+        Returns
+        -------
+        set
+            Key tuples (or plain values for a single column) that exist, as returned by the database. Candidates
+            containing None never match.
+
+        Example
+        -------
+        >>> existing = db.filter_existing('games', ['season', 'game_id'], incoming_keys)
+        >>> new_rows = [row for row in incoming if (row[0], row[1]) not in existing]
+        """
+        columns, keys, single_column = _prepare_existence_keys(columns, rows)
+        columns_sql = ", ".join(columns)
+        row_placeholder = "(" + ", ".join(["%s"] * len(columns)) + ")" if len(columns) > 1 else "%s"
+
+        self._check_connect_db()
+        existing = set()
+        for start in range(0, len(keys), chunk_size):
+            chunk = keys[start:start + chunk_size]
+            query = (f"SELECT DISTINCT {columns_sql} FROM {table_name} "
+                     f"WHERE ({columns_sql}) IN ({', '.join([row_placeholder] * len(chunk))})")
+            self.cursor.execute(query, [value for key in chunk for value in key])
+            existing.update(self.cursor.fetchall())
+
+        return {key[0] for key in existing} if single_column else {tuple(key) for key in existing}
+    
     #######################
     # Table Data Management: Inserts and Updates
+    @_borrows_connection
     def insert_data(self, table_name, columns, values, check_for_unique=False):
         """
 
@@ -593,20 +3113,31 @@ class SqlHelper(classCommon.LukhedAuth):
 
         if add_data:
             self._check_connect_db()
-            placeholders = ', '.join(['%s'] * len(values))
-            column_names = ', '.join(columns)
-            query = f"INSERT INTO {table_name} ({column_names}) VALUES ({placeholders})"
+            statement_key = ('insert_data', table_name, tuple(columns), len(values))
+            query = self._statement(statement_key, lambda: (
+                f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(values))})"))
 
-            self.cursor.execute(query, values)
-            self.db_connection.commit()
+            self._execute_statement(statement_key, query, values, fetch=False)
+            self._commit(table_name)
             return True
         else:
             print("Data already exists in the table matching the information you are trying to add.")
             return False
         
-    def insert_data_as_table(self, table_name, table_columns, table_rows_list_of_list):
+    @_borrows_connection
+    def insert_data_as_table(self, table_name, table_columns, table_rows_list_of_list, max_statement_bytes=None,
+                             commit_every=None, start_row=0, progress_callback=None):
         """
-        Insert data into a table.
+        Insert data into a table using multi-row INSERT statements.
+
+        Rows are read lazily from any iterable and packed into INSERT ... VALUES (...), (...) statements whose size
+        stays under max_statement_bytes, so large loads never exceed the server's max_allowed_packet and only one
+        statement's worth of rows is held in memory.
+
+        By default everything is committed once at the end (all or nothing). Set commit_every to commit after every
+        N statements; if a statement then fails, the rows already committed stay in the table and the returned
+        'resume_from' tells you which start_row to pass to continue the load. Inside transaction()/batch() a
+        failure is raised instead, so the enclosing block is rolled back as a whole.
 
         Parameters
         ----------
@@ -614,26 +3145,147 @@ class SqlHelper(classCommon.LukhedAuth):
             Name of the table
         table_columns : list of str
             Column names
-        table_rows_list_of_list : list of lists
+        table_rows_list_of_list : iterable of lists or tuples
             Each inner list contains values for a row
+        max_statement_bytes : int, optional
+            Byte budget for a single INSERT statement. By default 90% of the server's max_allowed_packet, capped at
+            16 MiB.
+        commit_every : int, optional
+            Commit after this many statements, by default None (single commit at the end)
+        start_row : int, optional
+            Number of rows at the start of the input to skip, used to resume a failed load, by default 0
+        progress_callback : callable, optional
+            Called after each commit as progress_callback(rows_committed, elapsed_seconds), by default None
+
+        Returns
+        -------
+        dict
+            {'rows': rows committed, 'statements': int, 'seconds': float, 'rows_per_second': float,
+            'resume_from': None, or the start_row to resume from if the load failed}
         """
         self._check_connect_db()
 
-        # Construct the SQL query for insertion
-        placeholders = ", ".join(["%s"] * len(table_columns))
+        if max_statement_bytes is None:
+            max_statement_bytes = self._get_statement_byte_budget()
+
         columns_str = ", ".join(table_columns)
-        query = f"INSERT INTO {table_name} ({columns_str}) VALUES ({placeholders})"
+        query_prefix = f"INSERT INTO {table_name} ({columns_str}) VALUES "
+        row_placeholders = "(" + ", ".join(["%s"] * len(table_columns)) + ")"
+        row_overhead = 2 + len(table_columns) * 2
+
+        rows = itertools.islice(table_rows_list_of_list, start_row, None)
+        stats = {'rows': 0, 'statements': 0, 'seconds': 0.0, 'rows_per_second': 0.0, 'resume_from': None}
+        start_time = time.perf_counter()
+        committed_row = start_row
+        pending_rows = 0
+        pending_statements = 0
 
         try:
-            # Use executemany for bulk insert - much faster than individual executes
-            self.cursor.executemany(query, table_rows_list_of_list)
-            self.db_connection.commit()
-            print(f"Successfully inserted {len(table_rows_list_of_list)} rows into {table_name}")
+            for chunk in _chunk_rows_by_size(rows, max_statement_bytes - len(query_prefix), row_overhead):
+                query = query_prefix + ", ".join([row_placeholders] * len(chunk))
+                self.cursor.execute(query, [value for row in chunk for value in row])
+                stats['statements'] += 1
+                pending_rows += len(chunk)
+                pending_statements += 1
+
+                if commit_every is not None and pending_statements >= commit_every:
+                    self._commit(table_name)
+                    committed_row += pending_rows
+                    stats['rows'] += pending_rows
+                    pending_rows = 0
+                    pending_statements = 0
+                    if progress_callback is not None:
+                        progress_callback(stats['rows'], time.perf_counter() - start_time)
+
+            self._commit(table_name)
+            stats['rows'] += pending_rows
+            if progress_callback is not None and pending_rows:
+                progress_callback(stats['rows'], time.perf_counter() - start_time)
 
         except Exception as e:
-            self.db_connection.rollback()
+            self._rollback(e)
+            if self._get_transaction() is not None:
+                raise
+            stats['resume_from'] = committed_row
             print(f"An error occurred: {e}")
+            print(f"{stats['rows']} rows were committed. Resume with start_row={committed_row}")
+
+        stats['seconds'] = time.perf_counter() - start_time
+        stats['rows_per_second'] = stats['rows'] / stats['seconds'] if stats['seconds'] > 0 else 0.0
+        if stats['resume_from'] is None:
+            print(f"Successfully inserted {stats['rows']} rows into {table_name} "
+                  f"({stats['rows_per_second']:,.0f} rows/sec)")
+        return stats
+
+    @_borrows_connection
+    def upsert_rows(self, table_name, columns, rows, conflict_columns=None, update_columns=None, chunk_size=1000,
+                    max_statement_bytes=None):
+        """
+        Insert rows, updating the existing row instead when a row with the same unique key already exists.
+
+        Uses batched INSERT ... ON DUPLICATE KEY UPDATE statements, so each chunk of rows costs a single round trip
+        and the insert-or-update decision is made atomically by the server (no separate existence check).
+
+        Parameters
+        ----------
+        table_name : str
+            Name of the table
+        columns : list of str
+            Columns being written, in the order values appear in each row
+        rows : iterable of lists or tuples
+            Rows to upsert. Consumed lazily, one chunk at a time.
+        conflict_columns : list of str, optional
+            Columns forming the unique key. MySQL resolves conflicts against every PRIMARY/UNIQUE key of the table,
+            so this is only used to leave these columns out of the default update_columns.
+        update_columns : list of str, optional
+            Columns to overwrite when the row exists, by default all columns not in conflict_columns. If empty,
+            existing rows are left untouched.
+        chunk_size : int, optional
+            Maximum rows per statement, by default 1000
+        max_statement_bytes : int, optional
+            Byte budget for a single statement, by default derived from the server's max_allowed_packet
+
+        Returns
+        -------
+        dict
+            {'rows': rows processed, 'statements': int, 'affected_rows': int}. MySQL counts 1 affected row per
+            insert and 2 per update.
+        """
+        self._check_connect_db()
+
+        conflict_columns = conflict_columns or []
+        if update_columns is None:
+            update_columns = [col for col in columns if col not in conflict_columns]
+        if max_statement_bytes is None:
+            max_statement_bytes = self._get_statement_byte_budget()
+
+        if update_columns:
+            update_sql = ", ".join([f"{col} = VALUES({col})" for col in update_columns])
+        else:
+            # No-op update so existing rows are kept as they are
+            update_sql = f"{columns[0]} = {columns[0]}"
+
+        query_prefix = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES "
+        query_suffix = f" ON DUPLICATE KEY UPDATE {update_sql}"
+        row_placeholders = "(" + ", ".join(["%s"] * len(columns)) + ")"
 
+        stats = {'rows': 0, 'statements': 0, 'affected_rows': 0}
+        budget = max_statement_bytes - len(query_prefix) - len(query_suffix)
+        try:
+            for chunk in _chunk_rows_by_size(rows, budget, 2 + len(columns) * 2, max_rows=chunk_size):
+                query = query_prefix + ", ".join([row_placeholders] * len(chunk)) + query_suffix
+                self.cursor.execute(query, [value for row in chunk for value in row])
+                stats['rows'] += len(chunk)
+                stats['statements'] += 1
+                stats['affected_rows'] += max(self.cursor.rowcount, 0)
+            self._commit(table_name)
+        except Exception as e:
+            self._rollback(e)
+            raise e
+
+        return stats
+
+    @_borrows_connection
     def update_single_value_in_table(self, table_name, column_to_update, new_value, *lookup_condition_tuples):
         """
         Update a single value in the specified table.
@@ -656,22 +3308,16 @@ class SqlHelper(classCommon.LukhedAuth):
 
         self._check_connect_db()
 
-        if isinstance(lookup_condition_tuples[0][0], (tuple, list)):
-            lookup_conditions = [
-                f"{column} = %s" for column, _ in lookup_condition_tuples[0]
-            ]
-            values = [value for _, value in lookup_condition_tuples[0]]
-        else:
-            lookup_conditions = [f"{column} = %s" for column, _ in lookup_condition_tuples]
-            values = [value for _, value in lookup_condition_tuples]
-
-        lookup_conditions_sql = " AND ".join(lookup_conditions)
-        query = f"UPDATE {table_name} SET {column_to_update} = %s WHERE {lookup_conditions_sql};"
+        lookup_columns, values = _split_lookup_conditions(lookup_condition_tuples)
+        statement_key = ('update_single_value_in_table', table_name, column_to_update, lookup_columns)
+        query = self._statement(statement_key, lambda: (
+            f"UPDATE {table_name} SET {column_to_update} = %s WHERE {_and_conditions(lookup_columns)};"))
 
         values = [new_value] + values
-        self.cursor.execute(query, values)
-        self.db_connection.commit()
+        self._execute_statement(statement_key, query, values, fetch=False)
+        self._commit(table_name)
 
+    @_borrows_connection
     def update_multiple_values_in_table(self, table_name, columns_to_update_list, values_to_update_list,
                                         *lookup_condition_tuples):
         """
@@ -714,11 +3360,13 @@ class SqlHelper(classCommon.LukhedAuth):
 
         values = values_to_update_list + values
         self.cursor.execute(query, values)
-        self.db_connection.commit()
+        self._commit(table_name)
         
     
     #######################
     # Table Data Management: Columns
+    @_borrows_connection
+    @_idempotent_read
     def get_columns_in_table(self, table_name):
         """
         Get the list of column names in the specified table.
@@ -733,14 +3381,19 @@ class SqlHelper(classCommon.LukhedAuth):
         list of str
             Column names
         """
+        cached = self._schema_cache_lookup('columns', table_name)
+        if cached is not None:
+            return cached
+
         self._check_connect_db()
 
         query = f"SHOW COLUMNS FROM {table_name};"
         self.cursor.execute(query)
         columns = [column[0] for column in self.cursor.fetchall()]
 
-        return columns
+        return self._schema_cache_store('columns', table_name, columns)
     
+    @_borrows_connection
     def add_column_to_table(self, table_name, column_name, column_type, after_column=None):
         """
         Add a column to the specified table.
@@ -765,8 +3418,10 @@ class SqlHelper(classCommon.LukhedAuth):
         if after_column is not None:
             alter_query += f" AFTER {after_column}"
         self.cursor.execute(alter_query)
-        self.db_connection.commit()
+        self._commit(table_name)
+        self.invalidate_schema_cache(table_name)
 
+    @_borrows_connection
     def rename_column(self, table_name, old_column_name, new_column_name):
         """
         Rename a column in a table.
@@ -788,8 +3443,10 @@ class SqlHelper(classCommon.LukhedAuth):
 
         query = f"ALTER TABLE {table_name} CHANGE {old_column_name} {new_column_name};"
         self.cursor.execute(query)
-        self.db_connection.commit()
+        self._commit(table_name)
+        self.invalidate_schema_cache(table_name)
 
+    @_borrows_connection
     def change_column_type(self, table_name, column_name, new_type):
         """
         Change the data type of a column.
@@ -811,8 +3468,10 @@ class SqlHelper(classCommon.LukhedAuth):
 
         query = f"ALTER TABLE {table_name} MODIFY COLUMN {column_name} {new_type};"
         self.cursor.execute(query)
-        self.db_connection.commit()
+        self._commit(table_name)
+        self.invalidate_schema_cache(table_name)
 
+    @_borrows_connection
     def change_column_charset(self, table_name, column_name, new_charset, new_collation):
         """
         Change the character set and collation of a column.
@@ -837,8 +3496,10 @@ class SqlHelper(classCommon.LukhedAuth):
         query = f"ALTER TABLE {table_name} MODIFY COLUMN {column_name} VARCHAR(500) CHARACTER SET " \
                 f"{new_charset} COLLATE {new_collation};"
         self.cursor.execute(query)
-        self.db_connection.commit()
+        self._commit(table_name)
+        self.invalidate_schema_cache(table_name)
 
+    @_borrows_connection
     def delete_column(self, table_name, column_name):
         """
         Delete a column from a table.
@@ -858,8 +3519,11 @@ class SqlHelper(classCommon.LukhedAuth):
 
         query = f"ALTER TABLE {table_name} DROP COLUMN {column_name};"
         self.cursor.execute(query)
-        self.db_connection.commit()
+        self._commit(table_name)
+        self.invalidate_schema_cache(table_name)
 
+    @_borrows_connection
+    @_idempotent_read
     def get_column_data_as_list(self, table_name, column_name):
         """
         Retrieve data from a column as a list.
@@ -876,14 +3540,19 @@ class SqlHelper(classCommon.LukhedAuth):
         list
             Data in the column as a list
         """
-        self._check_connect_db()
 
         query = f"SELECT {column_name} FROM {table_name}"
+        cached = self._result_cache_lookup(table_name, query, None)
+        if cached is not _CACHE_MISS:
+            return cached
+
+        self._check_connect_db()
         self.cursor.execute(query)
         column_data = [row[0] for row in self.cursor.fetchall()]
 
-        return column_data
+        return self._result_cache_store(table_name, query, None, column_data)
     
+    @_borrows_connection
     def initialize_values_in_column_to_provided_value(self, table, column_name, value):
         """
         This function initializes all values in a column to a provided value.
@@ -900,7 +3569,9 @@ class SqlHelper(classCommon.LukhedAuth):
         self._check_connect_db()
         query = f"UPDATE {table} SET {column_name} = {value}"
         self.cursor.execute(query)
+        self._commit(table)
     
+    @_borrows_connection
     def append_value_to_column(self, table_name, column_to_append, value_to_append, *lookup_condition_tuples):
         """
         This function is used to append a value to a JSON array stored in a column.
@@ -947,8 +3618,9 @@ class SqlHelper(classCommon.LukhedAuth):
 
         values = [value_to_append] + values
         self.cursor.execute(query, values)
-        self.db_connection.commit()
+        self._commit(table_name)
 
+    @_borrows_connection
     def append_values_to_columns(self, table_name, columns_to_append_to, values_to_append, *lookup_condition_tuples):
         """
         Append values to multiple columns in the specified table.
@@ -960,7 +3632,7 @@ class SqlHelper(classCommon.LukhedAuth):
         columns_to_append_to : list of str
             Columns whose lists you want to append to
         values_to_append : list of str
-            Values to append to the lists in the specified columns
+            Values to append to the lists in the specified columns, one per column (ValueError otherwise)
         lookup_condition_tuples : tuple(s) or list of tuples
             Conditions to find the row
 
@@ -968,31 +3640,25 @@ class SqlHelper(classCommon.LukhedAuth):
         -------
         None
         """
+        if len(values_to_append) != len(columns_to_append_to):
+            raise ValueError(f"Got {len(values_to_append)} values to append for {len(columns_to_append_to)} columns")
         self._check_connect_db()
 
-        if isinstance(lookup_condition_tuples[0][0], (tuple, list)):
-            lookup_conditions = [
-                f"{column} = %s" for column, _ in lookup_condition_tuples[0]
-            ]
-            values = [value for _, value in lookup_condition_tuples[0]]
-        else:
-            lookup_conditions = [f"{column} = %s" for column, _ in lookup_condition_tuples]
-            values = [value for _, value in lookup_condition_tuples]
-
-        lookup_conditions_sql = " AND ".join(lookup_conditions)
-        query_parts = []
-
-        for column_to_append, value_to_append in zip(columns_to_append_to, values_to_append):
-            query_part = f"{column_to_append} = JSON_ARRAY_APPEND({column_to_append}, '$', %s)"
-            query_parts.append(query_part)
+        lookup_columns, lookup_values = _split_lookup_conditions(lookup_condition_tuples)
+        statement_key = ('append_values_to_columns', table_name, tuple(columns_to_append_to), lookup_columns)
 
-            values.append(value_to_append)
+        def build_query():
+            query_parts = [f"{column} = JSON_ARRAY_APPEND({column}, '$', %s)" for column in columns_to_append_to]
+            return f"UPDATE {table_name} SET {', '.join(query_parts)} WHERE {_and_conditions(lookup_columns)};"
 
-        query = f"UPDATE {table_name} SET {', '.join(query_parts)} WHERE {lookup_conditions_sql};"
+        query = self._statement(statement_key, build_query)
 
-        self.cursor.execute(query, values)
-        self.db_connection.commit()
+        # SET placeholders come before the WHERE placeholders
+        values = list(values_to_append) + lookup_values
+        self._execute_statement(statement_key, query, values, fetch=False)
+        self._commit(table_name)
     
+    @_borrows_connection
     def append_values_to_columns_concat(self, table_name, columns_to_append_to, values_to_append,
                                         *lookup_condition_tuples):
         """
@@ -1027,10 +3693,96 @@ class SqlHelper(classCommon.LukhedAuth):
         for column, value in zip(columns_to_append_to, values_to_append):
             query = f"UPDATE {table_name} SET {column} = CONCAT({column}, ', {json.dumps(value)}') WHERE {lookup_conditions_sql};"
             self.cursor.execute(query, values)
-            self.db_connection.commit()
+            self._commit(table_name)
+
+    @_borrows_connection
+    def bulk_append_values_to_columns(self, table_name, columns_to_append_to, key_columns, key_value_pairs,
+                                      chunk_size=5000):
+        """
+        Append values to the JSON arrays of many rows at once, the bulk version of append_values_to_columns.
+
+        Each chunk of pairs is grouped by key (several appends to the same row keep their order), loaded into a
+        temporary staging table with multi-row inserts and applied with a single UPDATE ... JOIN using
+        JSON_MERGE_PRESERVE. Every chunk is committed on its own, so a large run costs one commit per chunk rather
+        than one per row. If a chunk fails it is rolled back and the error is raised; earlier chunks stay committed.
+
+        Parameters
+        ----------
+        table_name : str
+            Table where the update should occur
+        columns_to_append_to : list of str
+            JSON columns whose arrays you want to append to
+        key_columns : str or list of str
+            Column(s) identifying the row to update
+        key_value_pairs : iterable of (key, values)
+            key is the lookup value (a tuple of values when there are several key_columns) and values is a list
+            with one value to append per column in columns_to_append_to
+        chunk_size : int, optional
+            Number of pairs applied and committed per batch, by default 5000
+
+        Returns
+        -------
+        dict
+            {'pairs': pairs applied, 'chunks': int, 'affected_rows': rows updated}
+
+        Example
+        -------
+        >>> db.bulk_append_values_to_columns('players', ['ratings', 'teams'], 'player_id',
+        ...                                  [(12, [88, 'NYG']), (40, [75, 'DAL'])])
+        """
+        self._check_connect_db()
+
+        single_key = isinstance(key_columns, str)
+        key_columns = [key_columns] if single_key else list(key_columns)
+        stage_columns = key_columns + list(columns_to_append_to)
+        stage_table = f"lukhed_stage_{time.monotonic_ns()}"
+        byte_budget = self._get_statement_byte_budget()
+
+        insert_prefix = f"INSERT INTO {stage_table} ({', '.join(stage_columns)}) VALUES "
+        row_placeholders = "(" + ", ".join(["%s"] * len(stage_columns)) + ")"
+        join_sql = " AND ".join([f"target.{col} = source.{col}" for col in key_columns])
+        set_sql = ", ".join([f"target.{col} = JSON_MERGE_PRESERVE(COALESCE(target.{col}, JSON_ARRAY()), source.{col})"
+                             for col in columns_to_append_to])
+        update_query = f"UPDATE {table_name} AS target JOIN {stage_table} AS source ON {join_sql} SET {set_sql}"
+
+        stats = {'pairs': 0, 'chunks': 0, 'affected_rows': 0}
+        pairs = iter(key_value_pairs)
+
+        index_sql = self._staging_index_clause(table_name, key_columns)
+        self.cursor.execute(f"CREATE TEMPORARY TABLE {stage_table}{index_sql} AS "
+                            f"SELECT {', '.join(stage_columns)} FROM {table_name} WHERE 1 = 0")
+        try:
+            while True:
+                chunk = list(itertools.islice(pairs, chunk_size))
+                if not chunk:
+                    break
+
+                stage_rows = [row[:len(key_columns)] + [json.dumps(array, default=_export_json_default)
+                                                        for array in row[len(key_columns):]]
+                              for row in _group_append_values(chunk, single_key, len(columns_to_append_to))]
+                for statement_rows in _chunk_rows_by_size(stage_rows, byte_budget - len(insert_prefix),
+                                                          2 + len(stage_columns) * 2):
+                    self.cursor.execute(insert_prefix + ", ".join([row_placeholders] * len(statement_rows)),
+                                        [value for row in statement_rows for value in row])
+
+                self.cursor.execute(update_query)
+                stats['affected_rows'] += max(self.cursor.rowcount, 0)
+                self.cursor.execute(f"DELETE FROM {stage_table}")
+                self._commit(table_name)
+                stats['pairs'] += len(chunk)
+                stats['chunks'] += 1
+        except Exception as e:
+            self._rollback(e)
+            raise e
+        finally:
+            self._drop_staging_table(stage_table, f"DROP TEMPORARY TABLE IF EXISTS {stage_table}")
+
+        return stats
     
     #######################
     # Table Data Management: Rows
+    @_borrows_connection
+    @_idempotent_read
     def get_total_rows(self, table_name):
         """
         Get the total number of rows in the specified table.
@@ -1057,7 +3809,8 @@ class SqlHelper(classCommon.LukhedAuth):
         except Exception as e:
             raise e
         
-    def delete_first_rows(self, table_name, x):
+    @_borrows_connection
+    def delete_first_rows(self, table_name, x, chunk_size=None, order_column="id"):
         """
         Delete the first x rows from the specified table.
 
@@ -1067,7 +3820,15 @@ class SqlHelper(classCommon.LukhedAuth):
             Name of the table
         x : int
             Number of rows to delete
+        chunk_size : int, optional
+            If given, the rows with the lowest order_column values are deleted in separately committed chunks of
+            this size via purge_rows, by default None (one DELETE)
+        order_column : str, optional
+            Column that orders the rows in chunked mode, by default "id"
         """
+        if chunk_size:
+            return self.purge_rows(table_name, order_column, max_rows=x, chunk_size=chunk_size)
+
         try:
             self._check_connect_db()
 
@@ -1076,11 +3837,32 @@ class SqlHelper(classCommon.LukhedAuth):
 
             # Executing the query
             self.cursor.execute(query)
-            self.db_connection.commit()
+            self._commit(table_name)
         except Exception as e:
-            self.db_connection.rollback()
+            self._rollback(e)
             raise e
     
+    @_borrows_connection
+    def _delete_key_range(self, table_name, order_column, condition_tuples, from_key, through_key, descending,
+                          limit):
+        # Deletes the first `limit` matching rows in order_column order between from_key and through_key (inclusive)
+        where_sql, values = _build_where_clause(condition_tuples)
+        clauses = [f"({where_sql})"] if where_sql else []
+        if from_key is not None:
+            clauses.append(f"{order_column} {'<=' if descending else '>='} %s")
+            values.append(from_key)
+        clauses.append(f"{order_column} {'>=' if descending else '<='} %s")
+        values.append(through_key)
+
+        self._check_connect_db()
+        self.cursor.execute(f"DELETE FROM {table_name} WHERE " + " AND ".join(clauses) +
+                            f" ORDER BY {order_column}{' DESC' if descending else ''} LIMIT %s", values + [limit])
+        deleted = self.cursor.rowcount
+        self._commit(table_name)
+        return deleted
+
+    @_borrows_connection
+    @_idempotent_read
     def get_single_value_from_table(self, table_name, column_to_retrieve, *lookup_condition_tuples):
         """
         Retrieve a single value from the specified table.
@@ -1098,70 +3880,100 @@ class SqlHelper(classCommon.LukhedAuth):
         -------
         The value of the specified column in the matching row, or None if not found
         """
-        self._check_connect_db()
+        lookup_columns, values = _split_lookup_conditions(lookup_condition_tuples)
+        statement_key = ('get_single_value_from_table', table_name, column_to_retrieve, lookup_columns)
+        query = self._statement(statement_key, lambda: (
+            f"SELECT {column_to_retrieve} FROM {table_name} WHERE {_and_conditions(lookup_columns)} LIMIT 1;"))
 
-        if isinstance(lookup_condition_tuples[0][0], (tuple, list)):
-            lookup_conditions = [
-                f"{column} = %s" for column, _ in lookup_condition_tuples[0]
-            ]
-            values = [value for _, value in lookup_condition_tuples[0]]
-        else:
-            lookup_conditions = [f"{column} = %s" for column, _ in lookup_condition_tuples]
-            values = [value for _, value in lookup_condition_tuples]
+        cached = self._result_cache_lookup(table_name, query, values)
+        if cached is not _CACHE_MISS:
+            return cached
 
-        lookup_conditions_sql = " AND ".join(lookup_conditions)
-        query = f"SELECT {column_to_retrieve} FROM {table_name} WHERE {lookup_conditions_sql} LIMIT 1;"
+        self._check_connect_db()
+        rows = self._execute_statement(statement_key, query, values)
+        result = rows[0] if rows else None
 
-        self.cursor.execute(query, values)
-        result = self.cursor.fetchone()
+        if result is not None and len(result) == 1:
+            result = result[0]
 
-        if result is None:
-            return result
-        else:
-            if len(result) == 1:
-                return result[0]
-            else:
-                return result
+        return self._result_cache_store(table_name, query, values, result)
     
-    def bulk_update_rows(self, table_name, columns_to_update, rows_to_update):
+    @_borrows_connection
+    def bulk_update_rows(self, table_name, columns_to_update, rows_to_update, key_columns=None, chunk_size=10000):
         """
         Perform a bulk update of rows in the specified table.
 
+        The new values are loaded into a temporary staging table with multi-row inserts and applied with a single
+        UPDATE ... JOIN per chunk, so the statement size stays bounded no matter how many rows are updated. All
+        chunks are committed together at the end, or with the enclosing transaction()/batch() block.
+
         Parameters
         ----------
         table_name : str
             Name of the table
         columns_to_update : list of str
-            Columns to be updated
-        rows_to_update : list of lists
+            Columns present in each row, including the key column(s)
+        rows_to_update : iterable of lists
             Each inner list contains values for the corresponding columns
+        key_columns : list of str, optional
+            Columns used to match rows in the table, by default the first column in columns_to_update
+        chunk_size : int, optional
+            Number of rows staged and applied per UPDATE, by default 10000
 
         Returns
         -------
-        None
+        dict
+            {'rows': rows staged, 'chunks': int, 'affected_rows': rows changed by the updates}
         """
         self._check_connect_db()
 
-        values = []
+        key_columns = key_columns or columns_to_update[:1]
+        set_columns = [col for col in columns_to_update if col not in key_columns]
+        stage_table = f"lukhed_stage_{time.monotonic_ns()}"
+        byte_budget = self._get_statement_byte_budget()
 
-        update_query = f"UPDATE {table_name} AS target\nJOIN (VALUES\n"
+        insert_prefix = f"INSERT INTO {stage_table} ({', '.join(columns_to_update)}) VALUES "
+        row_placeholders = "(" + ", ".join(["%s"] * len(columns_to_update)) + ")"
+        join_sql = " AND ".join([f"target.{col} = source.{col}" for col in key_columns])
+        set_sql = ", ".join([f"target.{col} = source.{col}" for col in set_columns])
+        update_query = f"UPDATE {table_name} AS target JOIN {stage_table} AS source ON {join_sql} SET {set_sql}"
 
-        for row in rows_to_update:
-            placeholders = ', '.join(['%s'] * len(row))
-            update_query += f"    ({placeholders}),\n"
-            values.extend(row)
+        stats = {'rows': 0, 'chunks': 0, 'affected_rows': 0}
+        rows = iter(rows_to_update)
 
-        update_query = update_query.rstrip(',\n') + "\n) AS source (" + ', '.join(columns_to_update) + ")\n"
-        update_query += f"ON " + ' AND '.join([f"target.{col} = source.{col}" for col in columns_to_update]) + "\n"
-        update_query += f"SET\n"
-        update_query += ', '.join([f"target.{col} = source.{col}" for col in columns_to_update]) + ";"
+        index_sql = self._staging_index_clause(table_name, key_columns)
+        self.cursor.execute(f"CREATE TEMPORARY TABLE {stage_table}{index_sql} AS "
+                            f"SELECT {', '.join(columns_to_update)} FROM {table_name} WHERE 1 = 0")
+        try:
+            while True:
+                chunk = list(itertools.islice(rows, chunk_size))
+                if not chunk:
+                    break
+
+                for statement_rows in _chunk_rows_by_size(chunk, byte_budget - len(insert_prefix),
+                                                          2 + len(columns_to_update) * 2):
+                    self.cursor.execute(insert_prefix + ", ".join([row_placeholders] * len(statement_rows)),
+                                        [value for row in statement_rows for value in row])
+
+                self.cursor.execute(update_query)
+                stats['affected_rows'] += max(self.cursor.rowcount, 0)
+                stats['rows'] += len(chunk)
+                stats['chunks'] += 1
+                self.cursor.execute(f"DELETE FROM {stage_table}")
+
+            self._commit(table_name)
+        except Exception as e:
+            self._rollback(e)
+            raise e
+        finally:
+            self._drop_staging_table(stage_table, f"DROP TEMPORARY TABLE IF EXISTS {stage_table}")
 
-        self.cursor.execute(update_query, values)
-        self.db_connection.commit()
+        return stats
 
     
     ###################
     # General Query Execution
+    @_borrows_connection
     def execute_query(self, query, params=None):
         """
         Execute a SQL query with optional parameters.
@@ -1191,12 +4003,17 @@ class SqlHelper(classCommon.LukhedAuth):
             return self.cursor
         
         # For other queries (UPDATE, INSERT, etc), commit and return None
-        self.db_connection.commit()
+        self._commit()
+        self.invalidate_result_cache()
+        if _is_ddl_statement(query):
+            self.invalidate_schema_cache()
         return None
 
 
     ###################
     # Datbase Key Management
+    @_borrows_connection
+    @_idempotent_read
     def get_foreign_keys(self, table_name):
         """
         Get a list of foreign key constraints for a given table.
@@ -1211,6 +4028,10 @@ class SqlHelper(classCommon.LukhedAuth):
         list of dicts
             Each dict containing information about a foreign key constraint
         """
+        cached = self._schema_cache_lookup('foreign_keys', table_name)
+        if cached is not None:
+            return cached
+
         self._check_connect_db()
 
         query = f"SELECT constraint_name FROM information_schema.key_column_usage " \
@@ -1218,8 +4039,9 @@ class SqlHelper(classCommon.LukhedAuth):
         self.cursor.execute(query)
         foreign_keys = [{'constraint_name': foreign_key[0]} for foreign_key in self.cursor.fetchall()]
 
-        return foreign_keys
+        return self._schema_cache_store('foreign_keys', table_name, foreign_keys)
     
+    @_borrows_connection
     def add_foreign_key(self, table_name, foreign_key_name, column_name, referenced_table, referenced_column):
         """
         Add a foreign key constraint to a table.
@@ -1251,9 +4073,214 @@ class SqlHelper(classCommon.LukhedAuth):
         )
 
         self.cursor.execute(alter_query)
-        self.db_connection.commit()
+        self._commit(table_name)
+        self.invalidate_schema_cache(referenced_table)
+
+###################
+# PostgreSQL COPY encoding
+_COPY_TEXT_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+_PG_EPOCH_DATE = datetime.date(2000, 1, 1)
+_PG_EPOCH_DATETIME = datetime.datetime(2000, 1, 1)
+_PG_BINARY_COPY_HEADER = b'PGCOPY\n\xff\r\n\x00' + struct.pack('!ii', 0, 0)
+_PG_BINARY_COPY_TRAILER = struct.pack('!h', -1)
+
+
+def _copy_text_value(value):
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (dict, list)):
+        return json.dumps(value).translate(_COPY_TEXT_ESCAPES)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        # bytea hex input (\x...) with the backslash escaped for the text format
+        return '\\\\x' + bytes(value).hex()
+    return str(value).translate(_COPY_TEXT_ESCAPES)
+
+
+def _copy_csv_value(value):
+    # In CSV format an unquoted empty field is NULL and a quoted empty string is ''
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (int, float, decimal.Decimal)):
+        return str(value)
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        value = '\\x' + bytes(value).hex()
+    else:
+        value = str(value)
+    return '"' + value.replace('"', '""') + '"'
+
+
+def _encode_copy_text_row(row):
+    return '\t'.join([_copy_text_value(value) for value in row]) + '\n'
+
+
+def _encode_copy_csv_row(row):
+    return ','.join([_copy_csv_value(value) for value in row]) + '\n'
+
+
+def _to_json_text(value):
+    return value if isinstance(value, str) else json.dumps(value)
+
+
+def _binary_numeric(value):
+    number = decimal.Decimal(str(value)) if isinstance(value, float) else decimal.Decimal(value)
+    if number.is_nan():
+        return struct.pack('!hhHH', 0, 0, 0xC000, 0)
+    if number.is_infinite():
+        raise ValueError("Binary COPY does not support infinite numeric values, use copy_format='text'")
+
+    sign, digits, exponent = number.as_tuple()
+    digit_str = ''.join(map(str, digits))
+    dscale = max(0, -exponent)
+
+    if exponent >= 0:
+        int_part, frac_part = digit_str + '0' * exponent, ''
+    elif len(digit_str) > -exponent:
+        int_part, frac_part = digit_str[:exponent], digit_str[exponent:]
+    else:
+        int_part, frac_part = '', '0' * (-exponent - len(digit_str)) + digit_str
+
+    # PostgreSQL stores numerics as base-10000 digit groups aligned on the decimal point
+    int_part = int_part.lstrip('0')
+    int_part = '0' * (-len(int_part) % 4) + int_part
+    frac_part = frac_part + '0' * (-len(frac_part) % 4)
+    groups = [int(int_part[i:i + 4]) for i in range(0, len(int_part), 4)] + \
+             [int(frac_part[i:i + 4]) for i in range(0, len(frac_part), 4)]
+    weight = len(int_part) // 4 - 1
+
+    while groups and groups[0] == 0:
+        groups.pop(0)
+        weight -= 1
+    while groups and groups[-1] == 0:
+        groups.pop()
+    if not groups:
+        weight = 0
+
+    return struct.pack(f'!hhHH{len(groups)}H', len(groups), weight, 0x4000 if sign else 0, dscale, *groups)
+
+
+def _binary_date(value):
+    if isinstance(value, str):
+        value = datetime.date.fromisoformat(value)
+    if isinstance(value, datetime.datetime):
+        value = value.date()
+    return struct.pack('!i', (value - _PG_EPOCH_DATE).days)
+
+
+def _binary_timestamp(value, with_time_zone):
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value)
+    elif not isinstance(value, datetime.datetime):
+        value = datetime.datetime(value.year, value.month, value.day)
+    if with_time_zone and value.tzinfo is not None:
+        value = value.astimezone(datetime.timezone.utc)
+    # Naive values are sent as-is, which PostgreSQL reads as UTC for timestamptz columns
+    delta = value.replace(tzinfo=None) - _PG_EPOCH_DATETIME
+    return struct.pack('!q', (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds)
+
+
+def _binary_bytes(value):
+    if isinstance(value, str):
+        return value.encode('utf-8')
+    return bytes(value)
+
+
+# Binary COPY encoders by PostgreSQL type OID (as reported in cursor.description)
+_PG_BINARY_ENCODERS = {
+    16: lambda v: b'\x01' if v else b'\x00',                                # bool
+    17: _binary_bytes,                                                      # bytea
+    19: lambda v: str(v).encode('utf-8'),                                   # name
+    20: lambda v: struct.pack('!q', int(v)),                                # int8
+    21: lambda v: struct.pack('!h', int(v)),                                # int2
+    23: lambda v: struct.pack('!i', int(v)),                                # int4
+    25: lambda v: str(v).encode('utf-8'),                                   # text
+    114: lambda v: _to_json_text(v).encode('utf-8'),                        # json
+    700: lambda v: struct.pack('!f', float(v)),                             # float4
+    701: lambda v: struct.pack('!d', float(v)),                             # float8
+    1042: lambda v: str(v).encode('utf-8'),                                 # bpchar
+    1043: lambda v: str(v).encode('utf-8'),                                 # varchar
+    1082: _binary_date,                                                     # date
+    1114: lambda v: _binary_timestamp(v, False),                            # timestamp
+    1184: lambda v: _binary_timestamp(v, True),                             # timestamptz
+    1700: _binary_numeric,                                                  # numeric
+    2950: lambda v: uuid.UUID(str(v)).bytes,                                # uuid
+    3802: lambda v: b'\x01' + _to_json_text(v).encode('utf-8'),             # jsonb
+}
+
+
+def _build_copy_binary_row_encoder(column_names, type_oids):
+    encoders = []
+    for column_name, type_oid in zip(column_names, type_oids):
+        if type_oid not in _PG_BINARY_ENCODERS:
+            raise ValueError(f"Binary COPY does not support column '{column_name}' (type oid {type_oid}), "
+                             "use copy_format='text' or 'csv' instead")
+        encoders.append(_PG_BINARY_ENCODERS[type_oid])
+
+    field_count = struct.pack('!h', len(encoders))
+    null_field = struct.pack('!i', -1)
+
+    def encode_row(row):
+        parts = [field_count]
+        for encoder, value in zip(encoders, row):
+            if value is None:
+                parts.append(null_field)
+            else:
+                data = encoder(value)
+                parts.append(struct.pack('!i', len(data)))
+                parts.append(data)
+        return b''.join(parts)
+
+    return encode_row
+
+
+class _CopyStream:
+    """
+    Read-only file-like object fed to cursor.copy_expert that pulls encoded chunks from a generator on demand, so
+    only one chunk of the COPY payload is in memory at a time.
+    """
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = b''
+        self._position = 0
+
+    def read(self, size=-1):
+        if self._position >= len(self._buffer):
+            self._buffer = next(self._chunks, b'')
+            self._position = 0
+            if not self._buffer:
+                return b''
+
+        if size is None or size < 0:
+            end = len(self._buffer)
+        else:
+            end = min(self._position + size, len(self._buffer))
+        data = self._buffer[self._position:end]
+        self._position = end
+        return data
+
+    readline = read
+
+
+_PREPARED_STATEMENT_IDS = itertools.count(1)
+
+
+def _to_positional_parameters(query):
+    """
+    Convert a psycopg2 query with %s placeholders to PREPARE syntax ($1, $2, ...). Returns (query, parameter count).
+    """
+    count = itertools.count(1)
+    converted = re.sub(r"%%|%s", lambda match: "%" if match.group() == "%%" else f"${next(count)}", query)
+    return converted, next(count) - 1
+
+
+class PostgresSqlHelper(_PooledConnectionMixin, classCommon.LukhedAuth):
+    _column_dtypes = _PG_COLUMN_DTYPES
 
-class PostgresSqlHelper(classCommon.LukhedAuth):
     def __init__(self, datbase_project, datbase_name, key_management='github', auth_type='basic',
                  auth_dict=None):
         """
@@ -1295,6 +4322,7 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
         if self._auth_data is None:
             self._auth_setup()
 
+        self._init_connection_state()
         self.db_connection = None
         self.cursor = None
         atexit.register(self.close_connection)
@@ -1325,28 +4353,94 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
             raise ValueError(f"Unsupported auth_type: {self.auth_type}")
 
     def _check_connect_db(self):
-        if self.db_connection is None or self.cursor is None or self.cursor.closed:
+        if self._pool is not None:
+            self._bind_lease()
+        elif self.db_connection is None or self.cursor is None or self.cursor.closed:
             self.connect()
         elif not self.db_connection.closed:
             pass  # Connection is good
         else:
             self.connect()
 
-    def connect(self):
-        self.db_connection = psycopg2.connect(
+    def _connection_lost(self, error):
+        # psycopg2 marks the connection closed as soon as it notices the server is gone
+        if not isinstance(error, (psycopg2.OperationalError, psycopg2.InterfaceError)):
+            return False
+        return self.db_connection is None or bool(self.db_connection.closed)
+
+    def _open_connection(self):
+        return psycopg2.connect(
             host=self._auth_data['host'],
             user=self._auth_data['user'],
             password=self._auth_data['password'],
             dbname=self.database_name,
             port=self._auth_data['port']
         )
+
+    def _open_cursor(self, connection):
+        return connection.cursor()
+
+    def _ping_connection(self, connection):
+        if connection.closed:
+            return False
+        with connection.cursor() as ping_cursor:
+            ping_cursor.execute("SELECT 1")
+        connection.rollback()
+        return True
+
+    def _reset_connection(self, connection):
+        if connection.closed:
+            raise psycopg2.InterfaceError("connection already closed")
+        # End the implicit transaction psycopg2 opens on the first statement so the connection is idle in the pool
+        if connection.get_transaction_status() != pg_extensions.TRANSACTION_STATUS_IDLE:
+            connection.rollback()
+
+    def _explain_statement(self, query_text, params):
+        # Runs inside a savepoint so a failing EXPLAIN cannot abort the caller's transaction
+        with self.db_connection.cursor() as explain_cursor:
+            explain_cursor.execute("SAVEPOINT lukhed_explain")
+            try:
+                explain_cursor.execute("EXPLAIN " + query_text, params)
+                plan = [row[0] for row in explain_cursor.fetchall()]
+                explain_cursor.execute("RELEASE SAVEPOINT lukhed_explain")
+                return plan
+            except psycopg2.Error as e:
+                explain_cursor.execute("ROLLBACK TO SAVEPOINT lukhed_explain")
+                return f"EXPLAIN failed: {e}"
+
+    def _prepare_statement(self, query):
+        if isinstance(query, sql.Composable):
+            query = query.as_string(self.db_connection)
+        positional_query, parameter_count = _to_positional_parameters(query)
+        name = f"lukhed_stmt_{next(_PREPARED_STATEMENT_IDS)}"
+        self.cursor.execute(f"PREPARE {name} AS {positional_query}")
+        if parameter_count:
+            return f"EXECUTE {name} ({', '.join(['%s'] * parameter_count)})"
+        return f"EXECUTE {name}"
+
+    def _execute_prepared(self, execute_query, query, params, fetch):
+        self.cursor.execute(execute_query, params or None)
+        return self.cursor.fetchall() if fetch else self.cursor.rowcount
+
+    def _drop_prepared_statements(self, execute_queries):
+        for execute_query in execute_queries:
+            try:
+                self.cursor.execute("DEALLOCATE " + execute_query.split()[1])
+            except psycopg2.Error:
+                pass
+
+    def connect(self):
+        self.db_connection = self._open_connection()
         self.cursor = self.db_connection.cursor()
 
+    @_borrows_connection
     def test_connection(self):
         self._check_connect_db()
         print(f"Connected to the database {self.database_name}")
 
     def close_connection(self):
+        if self._pool is not None:
+            self._pool.close_all()
         if self.cursor:
             self.cursor.close()
         if self.db_connection:
@@ -1355,6 +4449,7 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
 
     def change_database(self, database_name):
         self.close_connection()
+        self.invalidate_schema_cache()
         self.database_name = database_name
         print("New database is: " + self.database_name)
 
@@ -1366,7 +4461,13 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
     
     ##################
     # Table Management
+    @_borrows_connection
+    @_idempotent_read
     def get_all_tables(self):
+        cached = self._schema_cache_lookup('tables', None)
+        if cached is not None:
+            return cached
+
         self._check_connect_db()
         query = """
             SELECT tablename
@@ -1375,8 +4476,9 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
         """
         self.cursor.execute(query)
         tables = [table[0] for table in self.cursor.fetchall()]
-        return tables
+        return self._schema_cache_store('tables', None, tables)
 
+    @_borrows_connection
     def create_table(self, table_name, *column_tuples, include_id=False):
         self._check_connect_db()
 
@@ -1394,15 +4496,24 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
         )
 
         self.cursor.execute(query)
-        self.db_connection.commit()
+        self._commit(table_name)
+        self.invalidate_schema_cache(table_name)
 
+    @_borrows_connection
     def delete_table(self, table_name):
         self._check_connect_db()
         query = sql.SQL("DROP TABLE IF EXISTS {} CASCADE").format(sql.Identifier(table_name))
         self.cursor.execute(query)
-        self.db_connection.commit()
+        self._commit(table_name)
+        self.invalidate_schema_cache(table_name)
 
+    @_borrows_connection
+    @_idempotent_read
     def table_exists(self, table_name):
+        cached = self._schema_cache_lookup('exists', table_name)
+        if cached is not None:
+            return cached
+
         self._check_connect_db()
         query = """
             SELECT EXISTS (
@@ -1412,8 +4523,9 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
             );
         """
         self.cursor.execute(query, (table_name,))
-        return self.cursor.fetchone()[0]
+        return self._schema_cache_store('exists', table_name, self.cursor.fetchone()[0])
 
+    @_borrows_connection
     def rename_table(self, old_table_name, new_table_name):
         self._check_connect_db()
         query = sql.SQL("ALTER TABLE {} RENAME TO {}").format(
@@ -1421,8 +4533,11 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
             sql.Identifier(new_table_name)
         )
         self.cursor.execute(query)
-        self.db_connection.commit()
+        self._commit(old_table_name, new_table_name)
+        self.invalidate_schema_cache(old_table_name)
+        self.invalidate_schema_cache(new_table_name)
 
+    @_borrows_connection
     def reset_table(self, table_name, reset_auto_increment=True):
         """
         This function deletes all rows from a table and optionally resets the auto-increment (SERIAL) sequence.
@@ -1439,16 +4554,17 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
         # Delete all rows from the table
         query = sql.SQL("DELETE FROM {}").format(sql.Identifier(table_name))
         self.cursor.execute(query)
-        self.db_connection.commit()
+        self._commit(table_name)
 
         # Reset auto-increment sequence if requested
         if reset_auto_increment:
             sequence_name = f"{table_name}_id_seq"
             reset_query = sql.SQL("ALTER SEQUENCE {} RESTART WITH 1").format(sql.Identifier(sequence_name))
             self.cursor.execute(reset_query)
-            self.db_connection.commit()
+            self._commit(table_name)
 
-    def remove_rows_from_table(self, table_name, rows=1, order_column="id"):
+    @_borrows_connection
+    def remove_rows_from_table(self, table_name, rows=1, order_column="id", chunk_size=None):
         """
         Removes a number of rows from a table by ordering with a specified column.
 
@@ -1460,7 +4576,12 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
             Number of rows to remove (default is 1)
         order_column : str, optional
             Column by which to order the table for row removal (default is "id")
+        chunk_size : int, optional
+            If given, rows are removed in separately committed chunks of this size via purge_rows, by default None
         """
+        if chunk_size:
+            return self.purge_rows(table_name, order_column, max_rows=rows, chunk_size=chunk_size, descending=True)
+
         self._check_connect_db()
 
         query = sql.SQL(
@@ -1471,11 +4592,12 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
             sql.Identifier(order_column)
         )
         self.cursor.execute(query, (rows,))
-        self.db_connection.commit()
+        self._commit(table_name)
 
 
     ########################
     # Table Data Management: Data Checks and Queries
+    @_borrows_connection
     def display_table_in_console(self, table_name, max_rows=20, min_column_width=15):
         """
         Display a formatted table in the console with proper alignment and borders.
@@ -1526,6 +4648,8 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
         if max_rows and len(data) == max_rows:
             print(f"Note: Showing first {max_rows} rows only.")
 
+    @_borrows_connection
+    @_idempotent_read
     def get_table_as_list(self, table_name, max_rows=None):
         self._check_connect_db()
         select_query = f'SELECT * FROM "{table_name}"'
@@ -1536,6 +4660,8 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
 
         return [columns] + [list(row) for row in data]
 
+    @_borrows_connection
+    @_idempotent_read
     def get_last_x_entries(self, table_name, x):
         """
         This function assumes the table has an 'id' column to order by.
@@ -1560,6 +4686,141 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
         data = self.cursor.fetchall()
         return [columns] + [list(row) for row in data]
 
+    def iter_query(self, query, params=None, batch_size=1000, as_batches=False, include_header=False):
+        """
+        Stream the results of a SELECT query without loading the whole result set into memory.
+
+        Uses a server-side (named) cursor, so PostgreSQL only sends batch_size rows per round trip and only one batch
+        is held in memory at a time. Without a connection pool the stream runs inside the helper's connection
+        transaction; avoid committing on the helper until the generator is consumed or closed. With a pool the
+        stream uses its own connection.
+
+        Parameters
+        ----------
+        query : str or psycopg2.sql.Composable
+            The SELECT query to run
+        params : tuple or list, optional
+            Parameters to be passed to the query
+        batch_size : int, optional
+            Number of rows fetched from the server per round, by default 1000
+        as_batches : bool, optional
+            If True, yields lists of rows (one list per batch) instead of single rows, by default False
+        include_header : bool, optional
+            If True, the first item yielded is the list of column names, by default False
+
+        Yields
+        ------
+        list
+            A row (list of values), or a batch of rows if as_batches is True
+        """
+        stream = self._stream_query(query, params, batch_size)
+        try:
+            description = next(stream)
+            if include_header:
+                yield [desc[0] for desc in description]
+
+            for rows in stream:
+                if as_batches:
+                    yield [list(row) for row in rows]
+                else:
+                    for row in rows:
+                        yield list(row)
+        finally:
+            stream.close()
+
+    def _stream_query(self, query, params, batch_size):
+        """
+        Yields the cursor description first, then each non-empty batch of rows (tuples) as fetched from the server.
+        """
+        with self._dedicated_connection() as connection:
+            stream_cursor = connection.cursor(name=f"lukhed_stream_{id(connection)}_{time.monotonic_ns()}")
+            stream_cursor.itersize = batch_size
+            stream_cursor = self._instrument_cursor(stream_cursor, label='iter_query', explainable=False)
+            try:
+                stream_cursor.execute(query, params)
+                rows = stream_cursor.fetchmany(batch_size)
+
+                # A named cursor only has a description once the first rows are fetched
+                yield stream_cursor.description
+
+                while rows:
+                    yield rows
+                    rows = stream_cursor.fetchmany(batch_size)
+            finally:
+                if not connection.closed:
+                    stream_cursor.close()
+
+    def iter_table(self, table_name, *condition_tuples, columns=None, batch_size=1000, as_batches=False,
+                   include_header=False):
+        """
+        Stream the rows of a table (optionally filtered) in constant memory. See iter_query for details.
+
+        Parameters
+        ----------
+        table_name : str
+            Name of the table
+        condition_tuples : tuple(s) or list of tuples, optional
+            Column-value conditions, same format as query_table_by_columns. If not given, all rows are streamed.
+        columns : list of str, optional
+            Columns to select, by default all columns
+        batch_size : int, optional
+            Number of rows fetched from the server per round, by default 1000
+        as_batches : bool, optional
+            If True, yields lists of rows instead of single rows, by default False
+        include_header : bool, optional
+            If True, the first item yielded is the list of column names, by default False
+
+        Yields
+        ------
+        list
+            A row (list of values), or a batch of rows if as_batches is True
+
+        Example
+        -------
+        >>> for batch in db.iter_table('games', ('season', 2024), batch_size=5000, as_batches=True):
+        ...     process(batch)
+        """
+        query, values = self._build_table_select(table_name, condition_tuples, columns)
+        yield from self.iter_query(query, values or None, batch_size=batch_size, as_batches=as_batches,
+                                   include_header=include_header)
+
+    def _build_table_select(self, table_name, condition_tuples, columns=None):
+        if columns:
+            columns_sql = sql.SQL(', ').join(map(sql.Identifier, columns))
+        else:
+            columns_sql = sql.SQL('*')
+        query = sql.SQL("SELECT {} FROM {}").format(columns_sql, sql.Identifier(table_name))
+
+        where_sql, values = _build_where_clause(condition_tuples)
+        if where_sql:
+            query = query + sql.SQL(" WHERE " + where_sql)
+        return query, values
+
+    def _build_page_query(self, table_name, order_columns, condition_tuples, columns, descending, after_key,
+                          inclusive=False):
+        if columns:
+            columns_sql = sql.SQL(', ').join(map(sql.Identifier, columns))
+        else:
+            columns_sql = sql.SQL('*')
+        order_sql = sql.SQL(', ').join(map(sql.Identifier, order_columns))
+
+        where_sql, values = _build_where_clause(condition_tuples)
+        clauses = [sql.SQL("(" + where_sql + ")")] if where_sql else []
+        if after_key:
+            clauses.append(sql.SQL("(ROW({}) {} ROW({}))").format(
+                order_sql, sql.SQL(('<' if descending else '>') + ('=' if inclusive else '')),
+                sql.SQL(', ').join(sql.Placeholder() * len(order_columns))))
+
+        query = sql.SQL("SELECT {} FROM {}").format(columns_sql, sql.Identifier(table_name))
+        if clauses:
+            query = query + sql.SQL(" WHERE ") + sql.SQL(" AND ").join(clauses)
+        direction = sql.SQL(" DESC" if descending else "")
+        query = query + sql.SQL(" ORDER BY ") + sql.SQL(', ').join(
+            sql.Identifier(column) + direction for column in order_columns) + sql.SQL(" LIMIT %s")
+        return query, values
+
+    @_borrows_connection
+    @_idempotent_read
     def query_table_by_columns(self, table_name, *condition_tuples):
         """
         Query the table by specified columns and conditions.
@@ -1576,23 +4837,21 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
         list
             A list of rows matching the query conditions
         """
-        self._check_connect_db()
-
-        if isinstance(condition_tuples[0][0], (tuple, list)):
-            conditions_list = [
-                " AND ".join([f"{col} = %s" for col, _ in group]) for group in condition_tuples
-            ]
-            values = [val for group in condition_tuples for _, val in group]
-        else:
-            conditions_list = [" AND ".join([f"{col} = %s" for col, _ in condition_tuples])]
-            values = [val for _, val in condition_tuples]
+        groups, values = _split_condition_groups(condition_tuples)
+        statement_key = ('query_table_by_columns', table_name, groups)
+        query = self._statement(statement_key, lambda: (
+            f'SELECT * FROM "{table_name}" WHERE {" OR ".join(_and_conditions(group) for group in groups)};'))
 
-        conditions_sql = " OR ".join(conditions_list)
-        query = f'SELECT * FROM "{table_name}" WHERE {conditions_sql};'
+        cached = self._result_cache_lookup(table_name, query, values)
+        if cached is not _CACHE_MISS:
+            return cached
 
-        self.cursor.execute(query, values)
-        return [list(row) for row in self.cursor.fetchall()]
+        self._check_connect_db()
+        rows = [list(row) for row in self._execute_statement(statement_key, query, values)]
+        return self._result_cache_store(table_name, query, values, rows)
 
+    @_borrows_connection
+    @_idempotent_read
     def query_by_month_day(self, table_name, date_column, date_string):
         """
         Query records where the date matches the month and day.
@@ -1622,6 +4881,8 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
         self.cursor.execute(query, (date_string, date_string))
         return [list(row) for row in self.cursor.fetchall()]
 
+    @_borrows_connection
+    @_idempotent_read
     def get_columns_with_null_values(self, table_name, *lookup_condition_tuples):
         """
         Get columns with null values in the specified row.
@@ -1657,6 +4918,8 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
         columns = [desc[0] for desc in self.cursor.description]
         return [col for col, val in zip(columns, row) if val is None]
 
+    @_borrows_connection
+    @_idempotent_read
     def is_value_null(self, table_name, to_check_column, *lookup_condition_tuples):
         """
         Check if a value is NULL in the specified table and column.
@@ -1678,6 +4941,8 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
         result = self.get_single_value_from_table(table_name, to_check_column, *lookup_condition_tuples)
         return result is None
 
+    @_borrows_connection
+    @_idempotent_read
     def check_if_data_exists(self, table_name, columns, values):
         """
         Check if a specific row exists based on multiple column values.
@@ -1698,11 +4963,13 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
         """
         self._check_connect_db()
 
-        conditions = ' AND '.join([f"{col} = %s" for col in columns])
-        query = f'SELECT COUNT(*) FROM "{table_name}" WHERE {conditions}'
-        self.cursor.execute(query, values)
-        return self.cursor.fetchone()[0] > 0
+        statement_key = ('check_if_data_exists', table_name, tuple(columns))
+        query = self._statement(statement_key, lambda: (
+            f'SELECT COUNT(*) FROM "{table_name}" WHERE {_and_conditions(columns)}'))
+        return self._execute_statement(statement_key, query, values)[0][0] > 0
 
+    @_borrows_connection
+    @_idempotent_read
     def check_if_value_exists_in_column(self, table_name, column, value_to_check):
         """
         Check if a value exists in a specific column of a table.
@@ -1723,12 +4990,58 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
         """
         self._check_connect_db()
 
-        query = f'SELECT COUNT(*) FROM "{table_name}" WHERE {column} = %s'
-        self.cursor.execute(query, (value_to_check,))
-        return self.cursor.fetchone()[0] > 0
+        statement_key = ('check_if_value_exists_in_column', table_name, column)
+        query = self._statement(statement_key, lambda: f'SELECT COUNT(*) FROM "{table_name}" WHERE {column} = %s')
+        return self._execute_statement(statement_key, query, (value_to_check,))[0][0] > 0
+
+    @_borrows_connection
+    @_idempotent_read
+    def filter_existing(self, table_name, columns, rows, chunk_size=1000):
+        """
+        Return which of many candidate rows already exist in the table, checking chunk_size candidates per query
+        instead of one SELECT COUNT(*) per candidate.
+
+        Parameters
+        ----------
+        table_name : str
+            Name of the table to check
+        columns : str or list of str
+            Key column(s) to match. With a single column name as a string, rows are plain values.
+        rows : iterable
+            Candidate keys: lists/tuples of values in columns order, or plain values for a single column
+        chunk_size : int, optional
+            Candidates checked per query, by default 1000
+
+        Returns
+        -------
+        set
+            Key tuples (or plain values for a single column) that exist, as returned by the database. Candidates
+            containing None never match.
+
+        Example
+        -------
+        >>> existing = db.filter_existing('games', ['season', 'game_id'], incoming_keys)
+        >>> new_rows = [row for row in incoming if (row[0], row[1]) not in existing]
+        """
+        columns, keys, single_column = _prepare_existence_keys(columns, rows)
+        columns_sql = sql.SQL(', ').join(map(sql.Identifier, columns))
+        row_placeholder = "(" + ", ".join(["%s"] * len(columns)) + ")" if len(columns) > 1 else "%s"
+
+        self._check_connect_db()
+        existing = set()
+        for start in range(0, len(keys), chunk_size):
+            chunk = keys[start:start + chunk_size]
+            query = sql.SQL("SELECT DISTINCT {} FROM {} WHERE ({}) IN ({})").format(
+                columns_sql, sql.Identifier(table_name), columns_sql,
+                sql.SQL(', '.join([row_placeholder] * len(chunk))))
+            self.cursor.execute(query, [value for key in chunk for value in key])
+            existing.update(self.cursor.fetchall())
+
+        return {key[0] for key in existing} if single_column else {tuple(key) for key in existing}
 
     #######################
     # Table Data Management: Inserts and Updates
+    @_borrows_connection
     def insert_data(self, table_name, columns, values, check_for_unique=False):
         """
         Inserts a row into a PostgreSQL table. Optionally checks for uniqueness.
@@ -1750,34 +5063,274 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
 
         if add_data:
             self._check_connect_db()
-            query = sql.SQL("INSERT INTO {} ({}) VALUES ({})").format(
+            statement_key = ('insert_data', table_name, tuple(columns), len(values))
+            query = self._statement(statement_key, lambda: sql.SQL("INSERT INTO {} ({}) VALUES ({})").format(
                 sql.Identifier(table_name),
                 sql.SQL(', ').join(map(sql.Identifier, columns)),
                 sql.SQL(', ').join(sql.Placeholder() * len(values))
-            )
-            self.cursor.execute(query, values)
-            self.db_connection.commit()
+            ))
+            self._execute_statement(statement_key, query, values, fetch=False)
+            self._commit(table_name)
             return True
         else:
             print("Data already exists in the table matching the information you are trying to add.")
             return False
 
-    def insert_data_as_table(self, table_name, table_columns, table_rows_list_of_list):
+    def export_table(self, table_name, path, format=None, where=None, columns=None, batch_size=10000,
+                     compress=None, progress_callback=None):
+        """
+        Stream a table (optionally filtered) into a CSV, JSON Lines or Parquet file with bounded memory.
+
+        CSV exports run COPY (SELECT ...) TO STDOUT, so PostgreSQL formats the file itself and the rows are written
+        to disk as they arrive; progress_callback is called once at the end for them. JSONL and Parquet stream
+        through a server-side cursor in batch_size batches. Like iter_query, the export runs on its own connection
+        (a single pool connection in pooled mode).
+
+        Parameters
+        ----------
+        table_name : str
+            Name of the table to export
+        path : str
+            Output file. The format and gzip compression are inferred from the name if not given, e.g. 'x.csv.gz'.
+        format : str, optional
+            'csv', 'jsonl' or 'parquet', by default inferred from path
+        where : tuple or list of tuples, optional
+            Column-value conditions in the same format as query_table_by_columns, by default all rows
+        columns : list of str, optional
+            Columns to export, by default all
+        batch_size : int, optional
+            Rows fetched and written per batch for jsonl/parquet, by default 10000
+        compress : bool, optional
+            gzip the csv/jsonl output, by default inferred from a '.gz' suffix
+        progress_callback : callable, optional
+            Called with the number of rows written so far
+
+        Returns
+        -------
+        dict
+            rows, path, format, seconds and rows_per_second
+        """
+        file_format, compress = _resolve_export_format(path, format, compress)
+        if file_format != 'csv':
+            return super().export_table(table_name, path, format=file_format, where=where, columns=columns,
+                                        batch_size=batch_size, compress=compress,
+                                        progress_callback=progress_callback)
+
+        query, values = self._build_table_select(table_name, tuple(where or ()), columns)
+        start_time = time.perf_counter()
+
+        with self._dedicated_connection() as connection:
+            copy_cursor = connection.cursor()
+            try:
+                # COPY does not take query parameters, so the SELECT is bound client-side first
+                encoding = pg_extensions.encodings[connection.encoding]
+                select_sql = copy_cursor.mogrify(query, values or None).decode(encoding)
+                copy_query = f"COPY ({select_sql}) TO STDOUT WITH (FORMAT csv, HEADER, ENCODING 'UTF8')"
+                with _open_export_file(path, compress, binary=True) as export_file:
+                    copy_cursor.copy_expert(copy_query, export_file, size=1 << 16)
+                rows = max(copy_cursor.rowcount, 0)
+            finally:
+                if not connection.closed:
+                    copy_cursor.close()
+        if progress_callback is not None:
+            progress_callback(rows)
+
+        return self._export_stats(table_name, path, file_format, rows, start_time)
+
+    def _copy_rows(self, table_name, table_columns, rows, copy_format='text', chunk_rows=10000,
+                   progress_callback=None):
+        # Streams rows into table_name with COPY FROM STDIN without committing. Returns the number of rows sent.
+        copy_format = copy_format.lower()
+        columns_sql = sql.SQL(', ').join(map(sql.Identifier, table_columns))
+
+        if copy_format == 'text':
+            encode_row = _encode_copy_text_row
+        elif copy_format == 'csv':
+            encode_row = _encode_copy_csv_row
+        elif copy_format == 'binary':
+            self.cursor.execute(sql.SQL("SELECT {} FROM {} LIMIT 0").format(columns_sql, sql.Identifier(table_name)))
+            encode_row = _build_copy_binary_row_encoder(table_columns, [d[1] for d in self.cursor.description])
+        else:
+            raise ValueError(f"Unsupported copy_format: {copy_format}")
+
+        sent = {'rows': 0}
+        start_time = time.perf_counter()
+
+        def encoded_chunks():
+            if copy_format == 'binary':
+                yield _PG_BINARY_COPY_HEADER
+            chunk = []
+            for row in rows:
+                chunk.append(encode_row(row))
+                if len(chunk) >= chunk_rows:
+                    sent['rows'] += len(chunk)
+                    yield b''.join(chunk) if copy_format == 'binary' else ''.join(chunk).encode('utf-8')
+                    chunk = []
+                    if progress_callback is not None:
+                        progress_callback(sent['rows'], time.perf_counter() - start_time)
+            if chunk:
+                sent['rows'] += len(chunk)
+                yield b''.join(chunk) if copy_format == 'binary' else ''.join(chunk).encode('utf-8')
+                if progress_callback is not None:
+                    progress_callback(sent['rows'], time.perf_counter() - start_time)
+            if copy_format == 'binary':
+                yield _PG_BINARY_COPY_TRAILER
+
+        copy_query = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT {})").format(
+            sql.Identifier(table_name),
+            columns_sql,
+            sql.SQL(copy_format)
+        )
+        self.cursor.copy_expert(copy_query, _CopyStream(encoded_chunks()), size=1 << 16)
+        return sent['rows']
+
+    def _column_type_codes(self, table_name, columns):
+        self.cursor.execute(sql.SQL("SELECT {} FROM {} LIMIT 0").format(
+            sql.SQL(', ').join(map(sql.Identifier, columns)), sql.Identifier(table_name)))
+        return [column[1] for column in self.cursor.description]
+
+    def _build_insert_statement(self, table_name, columns):
+        return sql.SQL("INSERT INTO {} ({}) VALUES ({})").format(
+            sql.Identifier(table_name),
+            sql.SQL(', ').join(map(sql.Identifier, columns)),
+            sql.SQL(', ').join(sql.Placeholder() * len(columns))
+        )
+
+    def _bulk_load_rows(self, table_name, table_columns, rows):
+        self._copy_rows(table_name, table_columns, rows, chunk_rows=max(len(rows), 1))
+
+    @_borrows_connection
+    def insert_data_as_table(self, table_name, table_columns, table_rows_list_of_list, copy_format='text',
+                             chunk_rows=10000, progress_callback=None):
+        """
+        Bulk insert rows using PostgreSQL COPY, streaming the data to the server in chunks.
+
+        Rows are encoded incrementally, so any iterable (including a generator) can be loaded without holding the
+        full dataset in memory. Values are escaped for the chosen COPY format and None is sent as NULL. The whole
+        load runs in a single transaction and is rolled back if anything fails. Inside transaction()/batch() the
+        error is raised instead, so the enclosing block is rolled back as a whole.
+
+        Parameters
+        ----------
+        table_name : str
+            Name of the table
+        table_columns : list of str
+            Column names, in the order values appear in each row
+        table_rows_list_of_list : iterable of lists or tuples
+            Each inner list contains values for a row
+        copy_format : str, optional
+            'text', 'csv' or 'binary', by default 'text'. Binary is the fastest for numeric and timestamp heavy
+            data; the column types are read from the table and values must be compatible with them.
+        chunk_rows : int, optional
+            Number of rows encoded per chunk sent to the server, by default 10000
+        progress_callback : callable, optional
+            Called after each chunk as progress_callback(rows_sent, elapsed_seconds), by default None
+
+        Returns
+        -------
+        dict or None
+            {'rows': int, 'seconds': float, 'rows_per_second': float} on success, None if the load failed
+        """
         self._check_connect_db()
-        
-        # Create CSV-like string buffer
-        output = io.StringIO()
-        for row in table_rows_list_of_list:
-            output.write('\t'.join(str(v) for v in row) + '\n')
-        output.seek(0)
-        
+
+        if copy_format.lower() not in ('text', 'csv', 'binary'):
+            raise ValueError(f"Unsupported copy_format: {copy_format}")
+
+        stats = {'rows': 0, 'seconds': 0.0, 'rows_per_second': 0.0}
+        start_time = time.perf_counter()
+
         try:
-            self.cursor.copy_from(output, table_name, columns=table_columns, sep='\t')
-            self.db_connection.commit()
+            stats['rows'] = self._copy_rows(table_name, table_columns, table_rows_list_of_list, copy_format,
+                                            chunk_rows, progress_callback)
+            self._commit(table_name)
         except Exception as e:
-            self.db_connection.rollback()
+            self._rollback(e)
+            if self._get_transaction() is not None:
+                raise
             print(f"An error occurred: {e}")
+            return None
+
+        stats['seconds'] = time.perf_counter() - start_time
+        stats['rows_per_second'] = stats['rows'] / stats['seconds'] if stats['seconds'] > 0 else 0.0
+        print(f"Successfully inserted {stats['rows']} rows into {table_name} "
+              f"({stats['rows_per_second']:,.0f} rows/sec)")
+        return stats
+
+    @_borrows_connection
+    def upsert_rows(self, table_name, columns, rows, conflict_columns, update_columns=None, chunk_size=1000):
+        """
+        Insert rows, updating the existing row instead when a row with the same conflict key already exists.
+
+        Uses batched INSERT ... ON CONFLICT (...) DO UPDATE statements, so each chunk of rows costs a single round trip
+        and the insert-or-update decision is made atomically by the server (no separate existence check).
+
+        Parameters
+        ----------
+        table_name : str
+            Name of the table
+        columns : list of str
+            Columns being written, in the order values appear in each row
+        rows : iterable of lists or tuples
+            Rows to upsert. Consumed lazily, one chunk at a time.
+        conflict_columns : list of str
+            Columns of the unique index or primary key used to detect existing rows
+        update_columns : list of str, optional
+            Columns to overwrite when the row exists, by default all columns not in conflict_columns. If empty,
+            existing rows are left untouched (ON CONFLICT DO NOTHING).
+        chunk_size : int, optional
+            Maximum rows per statement, by default 1000
+
+        Returns
+        -------
+        dict
+            {'rows': input rows processed, 'statements': int, 'affected_rows': int, 'duplicates': int}. A chunk
+            may not touch the same row twice, so of several rows with the same conflict key in one chunk only the
+            last is sent; 'duplicates' counts the rows dropped that way.
+        """
+        self._check_connect_db()
+
+        if update_columns is None:
+            update_columns = [col for col in columns if col not in conflict_columns]
+
+        if update_columns:
+            conflict_action = sql.SQL("DO UPDATE SET {}").format(sql.SQL(', ').join(
+                [sql.SQL("{} = EXCLUDED.{}").format(sql.Identifier(col), sql.Identifier(col))
+                 for col in update_columns]
+            ))
+        else:
+            conflict_action = sql.SQL("DO NOTHING")
+
+        query = sql.SQL("INSERT INTO {} ({}) VALUES %s ON CONFLICT ({}) {}").format(
+            sql.Identifier(table_name),
+            sql.SQL(', ').join(map(sql.Identifier, columns)),
+            sql.SQL(', ').join(map(sql.Identifier, conflict_columns)),
+            conflict_action
+        ).as_string(self.db_connection)
+
+        key_indexes = [columns.index(col) for col in conflict_columns]
+        stats = {'rows': 0, 'statements': 0, 'affected_rows': 0, 'duplicates': 0}
+        rows = iter(rows)
+        try:
+            while True:
+                chunk = list(itertools.islice(rows, chunk_size))
+                if not chunk:
+                    break
+
+                # ON CONFLICT cannot touch the same row twice in one statement, so keep the last row per key
+                deduplicated = {tuple(row[i] for i in key_indexes): row for row in chunk}
+                pg_extras.execute_values(self.cursor, query, list(deduplicated.values()), page_size=len(chunk))
+                stats['rows'] += len(chunk)
+                stats['duplicates'] += len(chunk) - len(deduplicated)
+                stats['statements'] += 1
+                stats['affected_rows'] += max(self.cursor.rowcount, 0)
+            self._commit(table_name)
+        except Exception as e:
+            self._rollback(e)
+            raise e
 
+        return stats
+
+    @_borrows_connection
     def update_single_value_in_table(self, table_name, column_to_update, new_value, *lookup_condition_tuples):
         """
         Update a single column's value in a specific row.
@@ -1791,21 +5344,18 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
         """
         self._check_connect_db()
 
-        if isinstance(lookup_condition_tuples[0][0], (tuple, list)):
-            conditions = [f"{col} = %s" for col, _ in lookup_condition_tuples[0]]
-            values = [val for _, val in lookup_condition_tuples[0]]
-        else:
-            conditions = [f"{col} = %s" for col, _ in lookup_condition_tuples]
-            values = [val for _, val in lookup_condition_tuples]
-
-        where_clause = " AND ".join(conditions)
-        query = sql.SQL("UPDATE {} SET {} = %s WHERE " + where_clause).format(
+        lookup_columns, values = _split_lookup_conditions(lookup_condition_tuples)
+        statement_key = ('update_single_value_in_table', table_name, column_to_update, lookup_columns)
+        query = self._statement(statement_key, lambda: sql.SQL(
+            "UPDATE {} SET {} = %s WHERE " + _and_conditions(lookup_columns)
+        ).format(
             sql.Identifier(table_name),
             sql.Identifier(column_to_update)
-        )
-        self.cursor.execute(query, [new_value] + values)
-        self.db_connection.commit()
+        ))
+        self._execute_statement(statement_key, query, [new_value] + values, fetch=False)
+        self._commit(table_name)
 
+    @_borrows_connection
     def update_multiple_values_in_table(self, table_name, columns_to_update_list, values_to_update_list, *lookup_condition_tuples):
         """
         Update multiple columns in a single row using WHERE conditions.
@@ -1833,11 +5383,13 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
             sql.Identifier(table_name)
         )
         self.cursor.execute(query, values_to_update_list + values)
-        self.db_connection.commit()
+        self._commit(table_name)
 
 
     #######################
     # Table Data Management: Columns
+    @_borrows_connection
+    @_idempotent_read
     def get_columns_in_table(self, table_name):
         """
         Get the list of column names in the specified PostgreSQL table.
@@ -1851,6 +5403,10 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
         list of str
             Column names
         """
+        cached = self._schema_cache_lookup('columns', table_name)
+        if cached is not None:
+            return cached
+
         self._check_connect_db()
         query = """
             SELECT column_name
@@ -1858,8 +5414,9 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
             WHERE table_schema = 'public' AND table_name = %s;
         """
         self.cursor.execute(query, (table_name,))
-        return [row[0] for row in self.cursor.fetchall()]
+        return self._schema_cache_store('columns', table_name, [row[0] for row in self.cursor.fetchall()])
     
+    @_borrows_connection
     def add_column_to_table(self, table_name, column_name, column_type, after_column=None):
         """
         Add a column to the specified PostgreSQL table.
@@ -1879,8 +5436,10 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
             sql.SQL(column_type)
         )
         self.cursor.execute(query)
-        self.db_connection.commit()
+        self._commit(table_name)
+        self.invalidate_schema_cache(table_name)
 
+    @_borrows_connection
     def rename_column(self, table_name, old_column_name, new_column_name):
         """
         Rename a column in a PostgreSQL table.
@@ -1898,8 +5457,10 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
             sql.Identifier(new_column_name)
         )
         self.cursor.execute(query)
-        self.db_connection.commit()
+        self._commit(table_name)
+        self.invalidate_schema_cache(table_name)
 
+    @_borrows_connection
     def change_column_type(self, table_name, column_name, new_type):
         """
         Change the data type of a column in PostgreSQL.
@@ -1917,8 +5478,10 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
             sql.SQL(new_type)
         )
         self.cursor.execute(query)
-        self.db_connection.commit()
+        self._commit(table_name)
+        self.invalidate_schema_cache(table_name)
 
+    @_borrows_connection
     def change_column_charset(self, table_name, column_name, new_charset, new_collation):
         """
         Change the collation of a column in PostgreSQL (character sets are cluster-level).
@@ -1937,8 +5500,10 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
             sql.Identifier(new_collation)
         )
         self.cursor.execute(query)
-        self.db_connection.commit()
+        self._commit(table_name)
+        self.invalidate_schema_cache(table_name)
 
+    @_borrows_connection
     def delete_column(self, table_name, column_name):
         """
         Delete a column from a PostgreSQL table.
@@ -1949,20 +5514,29 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
             sql.Identifier(column_name)
         )
         self.cursor.execute(query)
-        self.db_connection.commit()
+        self._commit(table_name)
+        self.invalidate_schema_cache(table_name)
 
+    @_borrows_connection
+    @_idempotent_read
     def get_column_data_as_list(self, table_name, column_name):
         """
         Retrieve data from a column as a list.
         """
-        self._check_connect_db()
         query = sql.SQL("SELECT {} FROM {}").format(
             sql.Identifier(column_name),
             sql.Identifier(table_name)
         )
+        cached = self._result_cache_lookup(table_name, query, None)
+        if cached is not _CACHE_MISS:
+            return cached
+
+        self._check_connect_db()
         self.cursor.execute(query)
-        return [row[0] for row in self.cursor.fetchall()]
+        column_data = [row[0] for row in self.cursor.fetchall()]
+        return self._result_cache_store(table_name, query, None, column_data)
 
+    @_borrows_connection
     def initialize_values_in_column_to_provided_value(self, table, column_name, value):
         """
         Initialize all values in a column to the provided value.
@@ -1973,8 +5547,9 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
             sql.Identifier(column_name)
         )
         self.cursor.execute(query, (value,))
-        self.db_connection.commit()
+        self._commit(table)
 
+    @_borrows_connection
     def append_value_to_column(self, table_name, column_to_append, value_to_append, *lookup_condition_tuples):
         """
         Append a value to a JSONB array in a PostgreSQL column.
@@ -1995,39 +5570,36 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
             WHERE {condition_sql}
         """
         self.cursor.execute(query, [json.dumps(value_to_append)] + values)
-        self.db_connection.commit()
+        self._commit(table_name)
 
+    @_borrows_connection
     def append_values_to_columns(self, table_name, columns_to_append_to, values_to_append, *lookup_condition_tuples):
         """
-        Append values to multiple JSONB columns in PostgreSQL.
+        Append values to multiple JSONB columns in PostgreSQL. values_to_append holds one value per column in
+        columns_to_append_to (ValueError otherwise).
         """
+        if len(values_to_append) != len(columns_to_append_to):
+            raise ValueError(f"Got {len(values_to_append)} values to append for {len(columns_to_append_to)} columns")
         self._check_connect_db()
 
-        if isinstance(lookup_condition_tuples[0][0], (tuple, list)):
-            conditions = [f"{col} = %s" for col, _ in lookup_condition_tuples[0]]
-            values = [val for _, val in lookup_condition_tuples[0]]
-        else:
-            conditions = [f"{col} = %s" for col, _ in lookup_condition_tuples]
-            values = [val for _, val in lookup_condition_tuples]
-
-        condition_sql = " AND ".join(conditions)
-        update_parts = []
-        value_placeholders = []
-
-        for col, val in zip(columns_to_append_to, values_to_append):
-            update_parts.append(
-                f"{col} = COALESCE({col}, '[]'::jsonb) || to_jsonb(%s::jsonb)"
-            )
-            value_placeholders.append(json.dumps(val))
+        lookup_columns, values = _split_lookup_conditions(lookup_condition_tuples)
+        statement_key = ('append_values_to_columns', table_name, tuple(columns_to_append_to), lookup_columns)
 
-        query = f"""
+        def build_query():
+            update_parts = [f"{col} = COALESCE({col}, '[]'::jsonb) || to_jsonb(%s::jsonb)"
+                            for col in columns_to_append_to]
+            return f"""
             UPDATE {table_name}
             SET {', '.join(update_parts)}
-            WHERE {condition_sql}
+            WHERE {_and_conditions(lookup_columns)}
         """
-        self.cursor.execute(query, value_placeholders + values)
-        self.db_connection.commit()
 
+        query = self._statement(statement_key, build_query)
+        value_placeholders = [json.dumps(val) for val in values_to_append]
+        self._execute_statement(statement_key, query, value_placeholders + values, fetch=False)
+        self._commit(table_name)
+
+    @_borrows_connection
     def append_values_to_columns_concat(self, table_name, columns_to_append_to, values_to_append, *lookup_condition_tuples):
         """
         Append values to multiple columns using string concatenation.
@@ -2050,10 +5622,88 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
                 WHERE {condition_sql}
             """
             self.cursor.execute(query, values)
-            self.db_connection.commit()
+            self._commit(table_name)
+
+    @_borrows_connection
+    def bulk_append_values_to_columns(self, table_name, columns_to_append_to, key_columns, key_value_pairs,
+                                      chunk_size=5000):
+        """
+        Append values to the JSONB arrays of many rows at once, the bulk version of append_values_to_columns.
+
+        Each chunk of pairs is grouped by key (several appends to the same row keep their order), streamed with
+        COPY into a temporary staging table and applied with a single UPDATE ... FROM. Every chunk is committed on
+        its own; if a chunk fails it is rolled back and the error is raised, earlier chunks stay committed.
+
+        Parameters
+        ----------
+        table_name : str
+            Table where the update should occur
+        columns_to_append_to : list of str
+            JSONB columns whose arrays you want to append to
+        key_columns : str or list of str
+            Column(s) identifying the row to update
+        key_value_pairs : iterable of (key, values)
+            key is the lookup value (a tuple of values when there are several key_columns) and values is a list
+            with one value to append per column in columns_to_append_to
+        chunk_size : int, optional
+            Number of pairs applied and committed per batch, by default 5000
+
+        Returns
+        -------
+        dict
+            {'pairs': pairs applied, 'chunks': int, 'affected_rows': rows updated}
+        """
+        self._check_connect_db()
+
+        single_key = isinstance(key_columns, str)
+        key_columns = [key_columns] if single_key else list(key_columns)
+        stage_columns = key_columns + list(columns_to_append_to)
+        stage_table = f"lukhed_stage_{time.monotonic_ns()}"
+
+        update_query = sql.SQL("UPDATE {} AS target SET {} FROM {} AS source WHERE {}").format(
+            sql.Identifier(table_name),
+            sql.SQL(', ').join([sql.SQL("{} = COALESCE(target.{}, '[]'::jsonb) || source.{}").format(
+                sql.Identifier(col), sql.Identifier(col), sql.Identifier(col)) for col in columns_to_append_to]),
+            sql.Identifier(stage_table),
+            sql.SQL(' AND ').join([sql.SQL("target.{} = source.{}").format(sql.Identifier(col), sql.Identifier(col))
+                                   for col in key_columns])
+        )
+
+        # The staging table is dropped by the commit (or rollback) that ends each chunk's transaction, and created
+        # again for the next chunk; inside transaction()/batch() it lives until the block commits
+        create_query = sql.SQL("CREATE TEMP TABLE IF NOT EXISTS {} ON COMMIT DROP AS SELECT {} FROM {} WITH NO DATA"
+                               ).format(sql.Identifier(stage_table),
+                                        sql.SQL(', ').join(map(sql.Identifier, stage_columns)),
+                                        sql.Identifier(table_name))
+
+        stats = {'pairs': 0, 'chunks': 0, 'affected_rows': 0}
+        pairs = iter(key_value_pairs)
+        try:
+            while True:
+                chunk = list(itertools.islice(pairs, chunk_size))
+                if not chunk:
+                    break
+
+                self.cursor.execute(create_query)
+                stage_rows = _group_append_values(chunk, single_key, len(columns_to_append_to))
+                self._copy_rows(stage_table, stage_columns, stage_rows, chunk_rows=chunk_size)
+                self.cursor.execute(sql.SQL("ANALYZE {}").format(sql.Identifier(stage_table)))
+                self.cursor.execute(update_query)
+                stats['affected_rows'] += max(self.cursor.rowcount, 0)
+                self.cursor.execute(sql.SQL("TRUNCATE {}").format(sql.Identifier(stage_table)))
+                self._commit(table_name)
+                stats['pairs'] += len(chunk)
+                stats['chunks'] += 1
+        except Exception as e:
+            self._rollback(e)
+            raise e
+
+        return stats
 
     #######################
     # Table Data Management: Rows
+    @_borrows_connection
+    @_idempotent_read
     def get_total_rows(self, table_name):
         """
         Get the total number of rows in the specified table.
@@ -2063,11 +5713,18 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
         self.cursor.execute(query)
         return self.cursor.fetchone()[0]
 
-    def delete_first_rows(self, table_name, x):
+    @_borrows_connection
+    def delete_first_rows(self, table_name, x, chunk_size=None, order_column="id"):
         """
         Delete the first x rows from the specified table.
         NOTE: Requires a primary key or ordering column for deterministic behavior.
+
+        With chunk_size, the x rows with the lowest order_column values are deleted in separately committed chunks
+        via purge_rows instead of one statement.
         """
+        if chunk_size:
+            return self.purge_rows(table_name, order_column, max_rows=x, chunk_size=chunk_size)
+
         self._check_connect_db()
         # Replace 'id' with your table's primary key if needed
         query = sql.SQL("""
@@ -2079,75 +5736,136 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
             )
         """).format(table=sql.Identifier(table_name))
         self.cursor.execute(query, (x,))
-        self.db_connection.commit()
+        self._commit(table_name)
+
+    @_borrows_connection
+    def _delete_key_range(self, table_name, order_column, condition_tuples, from_key, through_key, descending,
+                          limit):
+        # DELETE has no LIMIT in PostgreSQL, so the rows are picked by ctid in an ordered, limited subquery
+        where_sql, values = _build_where_clause(condition_tuples)
+        clauses = [sql.SQL("(" + where_sql + ")")] if where_sql else []
+        if from_key is not None:
+            clauses.append(sql.SQL("{} {} %s").format(sql.Identifier(order_column),
+                                                       sql.SQL('<=' if descending else '>=')))
+            values.append(from_key)
+        clauses.append(sql.SQL("{} {} %s").format(sql.Identifier(order_column), sql.SQL('>=' if descending else '<=')))
+        values.append(through_key)
+
+        self._check_connect_db()
+        query = sql.SQL("DELETE FROM {table} WHERE ctid IN (SELECT ctid FROM {table} WHERE {where} "
+                        "ORDER BY {order}{direction} LIMIT %s)").format(
+            table=sql.Identifier(table_name),
+            where=sql.SQL(" AND ").join(clauses),
+            order=sql.Identifier(order_column),
+            direction=sql.SQL(" DESC" if descending else "")
+        )
+        self.cursor.execute(query, values + [limit])
+        deleted = self.cursor.rowcount
+        self._commit(table_name)
+        return deleted
 
+    @_borrows_connection
+    @_idempotent_read
     def get_single_value_from_table(self, table_name, column_to_retrieve, *lookup_condition_tuples):
         """
         Retrieve a single value from the specified table.
         """
-        self._check_connect_db()
-
-        if isinstance(lookup_condition_tuples[0][0], (tuple, list)):
-            conditions = [f"{col} = %s" for col, _ in lookup_condition_tuples[0]]
-            values = [val for _, val in lookup_condition_tuples[0]]
-        else:
-            conditions = [f"{col} = %s" for col, _ in lookup_condition_tuples]
-            values = [val for _, val in lookup_condition_tuples]
-
-        condition_sql = " AND ".join(conditions)
-        query = sql.SQL("SELECT {} FROM {} WHERE {} LIMIT 1").format(
+        lookup_columns, values = _split_lookup_conditions(lookup_condition_tuples)
+        statement_key = ('get_single_value_from_table', table_name, column_to_retrieve, lookup_columns)
+        query = self._statement(statement_key, lambda: sql.SQL("SELECT {} FROM {} WHERE {} LIMIT 1").format(
             sql.Identifier(column_to_retrieve),
             sql.Identifier(table_name),
-            sql.SQL(condition_sql)
-        )
+            sql.SQL(_and_conditions(lookup_columns))
+        ))
 
-        self.cursor.execute(query, values)
-        result = self.cursor.fetchone()
+        cached = self._result_cache_lookup(table_name, query, values)
+        if cached is not _CACHE_MISS:
+            return cached
+
+        self._check_connect_db()
+        rows = self._execute_statement(statement_key, query, values)
+        result = rows[0] if rows else None
 
-        return result[0] if result and len(result) == 1 else result
+        result = result[0] if result and len(result) == 1 else result
+        return self._result_cache_store(table_name, query, values, result)
 
-    def bulk_update_rows(self, table_name, columns_to_update, rows_to_update):
+    @_borrows_connection
+    def bulk_update_rows(self, table_name, columns_to_update, rows_to_update, key_columns=None, chunk_size=10000):
         """
         Perform a bulk update of rows in the specified table.
-        This method assumes the first column in columns_to_update is the unique key.
-        """
-        self._check_connect_db()
+        This method assumes the first column in columns_to_update is the unique key unless key_columns is given.
+
+        The new values are streamed with COPY into a temporary staging table and applied with a single
+        UPDATE ... FROM per chunk, so planning cost and parameter counts stay constant no matter how many rows are
+        updated. All chunks are committed together at the end.
 
-        key_column = columns_to_update[0]
-        set_columns = columns_to_update[1:]
+        Parameters
+        ----------
+        table_name : str
+            Name of the table
+        columns_to_update : list of str
+            Columns present in each row, including the key column(s)
+        rows_to_update : iterable of lists
+            Each inner list contains values for the corresponding columns
+        key_columns : list of str, optional
+            Columns used to match rows in the table, by default the first column in columns_to_update
+        chunk_size : int, optional
+            Number of rows staged and applied per UPDATE, by default 10000
 
-        cases = {col: [] for col in set_columns}
-        ids = []
+        Returns
+        -------
+        dict
+            {'rows': rows staged, 'chunks': int, 'affected_rows': rows updated}
+        """
+        self._check_connect_db()
 
-        for row in rows_to_update:
-            row_dict = dict(zip(columns_to_update, row))
-            key = row_dict[key_column]
-            ids.append(key)
-            for col in set_columns:
-                cases[col].append((key, row_dict[col]))
+        key_columns = key_columns or columns_to_update[:1]
+        set_columns = [col for col in columns_to_update if col not in key_columns]
+        stage_table = f"lukhed_stage_{time.monotonic_ns()}"
 
-        set_clauses = []
-        values = []
+        update_query = sql.SQL("UPDATE {} AS target SET {} FROM {} AS source WHERE {}").format(
+            sql.Identifier(table_name),
+            sql.SQL(', ').join([sql.SQL("{} = source.{}").format(sql.Identifier(col), sql.Identifier(col))
+                                for col in set_columns]),
+            sql.Identifier(stage_table),
+            sql.SQL(' AND ').join([sql.SQL("target.{} = source.{}").format(sql.Identifier(col), sql.Identifier(col))
+                                   for col in key_columns])
+        )
 
-        for col, case_list in cases.items():
-            case_sql = f"{col} = CASE {key_column} " + \
-                ' '.join([f"WHEN %s THEN %s" for _ in case_list]) + " ELSE {col} END"
-            set_clauses.append(case_sql)
-            for pair in case_list:
-                values.extend(pair)
+        stats = {'rows': 0, 'chunks': 0, 'affected_rows': 0}
+        rows = iter(rows_to_update)
+        try:
+            # The staging table is dropped automatically when the transaction ends
+            self.cursor.execute(sql.SQL("CREATE TEMP TABLE {} ON COMMIT DROP AS SELECT {} FROM {} WITH NO DATA").format(
+                sql.Identifier(stage_table),
+                sql.SQL(', ').join(map(sql.Identifier, columns_to_update)),
+                sql.Identifier(table_name)
+            ))
+            while True:
+                chunk = list(itertools.islice(rows, chunk_size))
+                if not chunk:
+                    break
+
+                self._copy_rows(stage_table, columns_to_update, chunk, chunk_rows=chunk_size)
+                self.cursor.execute(sql.SQL("ANALYZE {}").format(sql.Identifier(stage_table)))
+                self.cursor.execute(update_query)
+                stats['affected_rows'] += max(self.cursor.rowcount, 0)
+                stats['rows'] += len(chunk)
+                stats['chunks'] += 1
+                self.cursor.execute(sql.SQL("TRUNCATE {}").format(sql.Identifier(stage_table)))
+
+            self._commit(table_name)
+        except Exception as e:
+            self._rollback(e)
+            raise e
 
-        query = f"""
-            UPDATE {table_name}
-            SET {', '.join(set_clauses)}
-            WHERE {key_column} IN ({', '.join(['%s'] * len(ids))});
-        """
-        values.extend(ids)
-        self.cursor.execute(query, values)
-        self.db_connection.commit()
+        return stats
 
 
     ###################
     # General Query Execution
+    @_borrows_connection
+    @_idempotent_read
     def get_distinct_column_values(self, table_name, column_name):
         """
         Get distinct values in a specified column.
@@ -2164,14 +5882,20 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
         list
             List of distinct values in the column
         """
-        self._check_connect_db()
         query = sql.SQL("SELECT DISTINCT {} FROM {}").format(
             sql.Identifier(column_name),
             sql.Identifier(table_name)
         )
+        cached = self._result_cache_lookup(table_name, query, None)
+        if cached is not _CACHE_MISS:
+            return cached
+
+        self._check_connect_db()
         self.cursor.execute(query)
-        return [row[0] for row in self.cursor.fetchall()]
+        column_data = [row[0] for row in self.cursor.fetchall()]
+        return self._result_cache_store(table_name, query, None, column_data)
     
+    @_borrows_connection
     def execute_query(self, query, params=None):
         """
         Execute a SQL query with optional parameters.
@@ -2200,5 +5924,224 @@ class PostgresSqlHelper(classCommon.LukhedAuth):
         if query.strip().upper().startswith('SELECT'):
             return self.cursor
 
-        self.db_connection.commit()
+        self._commit()
+        self.invalidate_result_cache()
+        if _is_ddl_statement(query):
+            self.invalidate_schema_cache()
         return None
+
+
+class _AsyncHelperMixin:
+    """
+    asyncio front end shared by AsyncSqlHelper and AsyncPostgresSqlHelper.
+
+    Every database method of the wrapped synchronous helper is exposed as a coroutine that runs the synchronous call
+    on a bounded worker thread pool, with the helper in pooled mode so each worker borrows its own connection.
+    Configuration methods (enable_result_cache, get_pool_status, ...) are passed through unchanged.
+    """
+    _sync_class = None
+    _extra_async_methods = ('query_to_arrays', 'get_table_as_frame', 'export_table', 'purge_rows')
+
+    def _init_async_helper(self, sync_helper, max_connections, min_connections, checkout_timeout):
+        self.sync_helper = sync_helper
+        self.max_connections = max_connections
+        sync_helper.enable_connection_pool(min_size=min_connections, max_size=max_connections,
+                                           checkout_timeout=checkout_timeout)
+        self._executor = ThreadPoolExecutor(max_workers=max_connections,
+                                            thread_name_prefix=f"{type(self).__name__}-worker")
+
+    def __getattr__(self, name):
+        if name == 'sync_helper':
+            raise AttributeError(name)
+        return getattr(self.sync_helper, name)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def _run(self, function, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(function, *args, **kwargs))
+
+    async def run_sync(self, function, *args, **kwargs):
+        """
+        Run function(sync_helper, *args, **kwargs) on a worker thread and return its result.
+
+        All helper calls made inside the function share one pooled connection, so this is the way to use
+        transaction() or batch() from async code.
+
+        Example
+        -------
+        >>> def move_points(db):
+        ...     with db.transaction():
+        ...         db.update_single_value_in_table('teams', 'points', 0, ('id', 1))
+        ...         db.update_single_value_in_table('teams', 'points', 3, ('id', 2))
+        >>> await async_db.run_sync(move_points)
+        """
+        return await self._run(function, self.sync_helper, *args, **kwargs)
+
+    async def gather_queries(self, *queries, return_exceptions=False):
+        """
+        Run independent queries concurrently, at most max_connections at a time, and return their results in order.
+
+        Parameters
+        ----------
+        queries : awaitable or tuple
+            Either coroutines of this helper (e.g. db.get_total_rows('games')) or (method_name, *args) tuples
+        return_exceptions : bool, optional
+            Same as asyncio.gather: if True, exceptions are returned in place of results instead of raised,
+            by default False
+
+        Returns
+        -------
+        list
+            One result per query, in the order given
+
+        Example
+        -------
+        >>> games, teams = await db.gather_queries(('query_table_by_columns', 'games', ('season', 2024)),
+        ...                                        db.get_table_as_list('teams'))
+        """
+        awaitables = []
+        for query in queries:
+            if isinstance(query, (tuple, list)):
+                method_name, *args = query
+                awaitables.append(getattr(self, method_name)(*args))
+            else:
+                awaitables.append(query)
+        return await asyncio.gather(*awaitables, return_exceptions=return_exceptions)
+
+    async def iter_query(self, query, params=None, batch_size=1000, as_batches=False, include_header=False):
+        """
+        Async version of iter_query. Batches are fetched on a worker thread; the stream holds one pooled connection
+        until it is exhausted or closed.
+        """
+        stream = self.sync_helper.iter_query(query, params, batch_size=batch_size, as_batches=True,
+                                             include_header=include_header)
+        try:
+            if include_header:
+                yield await self._run(next, stream)
+            while True:
+                rows = await self._run(next, stream, None)
+                if rows is None:
+                    break
+                if as_batches:
+                    yield rows
+                else:
+                    for row in rows:
+                        yield row
+        finally:
+            await self._run(stream.close)
+
+    async def iter_table(self, table_name, *condition_tuples, columns=None, batch_size=1000, as_batches=False,
+                         include_header=False):
+        """
+        Async version of iter_table, see iter_query.
+        """
+        query, values = self.sync_helper._build_table_select(table_name, condition_tuples, columns)
+        async for item in self.iter_query(query, values or None, batch_size=batch_size, as_batches=as_batches,
+                                          include_header=include_header):
+            yield item
+
+    async def iter_pages(self, table_name, order_columns, *condition_tuples, page_size=1000, columns=None,
+                         descending=False, start_after=None):
+        """
+        Async version of iter_pages. Each page is fetched on a worker thread.
+        """
+        pages = self.sync_helper.iter_pages(table_name, order_columns, *condition_tuples, page_size=page_size,
+                                            columns=columns, descending=descending, start_after=start_after)
+        while True:
+            page = await self._run(next, pages, None)
+            if page is None:
+                break
+            yield page
+
+    async def change_database(self, database_name):
+        await self._run(self.sync_helper.change_database, database_name)
+
+    async def close(self):
+        """
+        Close all pooled connections and stop the worker threads.
+        """
+        await self._run(self.sync_helper.close_connection)
+        self._executor.shutdown(wait=False)
+
+
+def _async_method(sync_method):
+    @functools.wraps(sync_method)
+    async def method(self, *args, **kwargs):
+        return await self._run(getattr(self.sync_helper, sync_method.__name__), *args, **kwargs)
+    return method
+
+
+def _add_async_methods(async_class):
+    """
+    Class decorator that gives an async helper a coroutine for every database method of its synchronous class.
+    """
+    for name in dir(async_class._sync_class):
+        if name.startswith('_') or name in async_class.__dict__ or name in _AsyncHelperMixin.__dict__:
+            continue
+        sync_method = getattr(async_class._sync_class, name)
+        if getattr(sync_method, 'borrows_connection', False) or name in async_class._extra_async_methods:
+            setattr(async_class, name, _async_method(sync_method))
+    return async_class
+
+
+@_add_async_methods
+class AsyncSqlHelper(_AsyncHelperMixin):
+    _sync_class = SqlHelper
+
+    def __init__(self, datbase_project, datbase_name, key_management='github', auth_type='basic', auth_dict=None,
+                 max_connections=10, min_connections=0, checkout_timeout=30):
+        """
+        asyncio version of SqlHelper with the same method surface. Database methods are coroutines, e.g.
+        `rows = await db.query_table_by_columns('games', ('season', 2024))`.
+
+        Calls run on up to max_connections worker threads, each with its own pooled MySQL connection, so many
+        overlapping requests can be served without blocking the event loop.
+
+        Parameters
+        ----------
+        datbase_project, datbase_name, key_management, auth_type, auth_dict
+            Same as SqlHelper
+        max_connections : int, optional
+            Maximum concurrent queries (worker threads and pooled connections), by default 10
+        min_connections : int, optional
+            Connections kept open while idle, by default 0 so construction does not connect
+        checkout_timeout : int or float, optional
+            Seconds to wait for a free pooled connection, by default 30
+        """
+        sync_helper = SqlHelper(datbase_project, datbase_name, key_management=key_management, auth_type=auth_type,
+                                auth_dict=auth_dict)
+        self._init_async_helper(sync_helper, max_connections, min_connections, checkout_timeout)
+
+
+@_add_async_methods
+class AsyncPostgresSqlHelper(_AsyncHelperMixin):
+    _sync_class = PostgresSqlHelper
+
+    def __init__(self, datbase_project, datbase_name, key_management='github', auth_type='basic', auth_dict=None,
+                 max_connections=10, min_connections=0, checkout_timeout=30):
+        """
+        asyncio version of PostgresSqlHelper with the same method surface. Database methods are coroutines, e.g.
+        `rows = await db.query_table_by_columns('games', ('season', 2024))`.
+
+        Calls run on up to max_connections worker threads, each with its own pooled PostgreSQL connection, so many
+        overlapping requests can be served without blocking the event loop.
+
+        Parameters
+        ----------
+        datbase_project, datbase_name, key_management, auth_type, auth_dict
+            Same as PostgresSqlHelper
+        max_connections : int, optional
+            Maximum concurrent queries (worker threads and pooled connections), by default 10
+        min_connections : int, optional
+            Connections kept open while idle, by default 0 so construction does not connect
+        checkout_timeout : int or float, optional
+            Seconds to wait for a free pooled connection, by default 30
+        """
+        sync_helper = PostgresSqlHelper(datbase_project, datbase_name, key_management=key_management,
+                                        auth_type=auth_type, auth_dict=auth_dict)
+        self._init_async_helper(sync_helper, max_connections, min_connections, checkout_timeout)
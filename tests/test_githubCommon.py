@@ -0,0 +1,335 @@
+import sys
+import types
+import base64
+import shutil
+import subprocess
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from lukhed_basic_utils.githubCommon import GithubHelper, _git_blob_sha
+
+Obj = types.SimpleNamespace
+
+
+def _offline_helper(repo):
+    # GithubHelper without the config/authentication setup of __init__, talking to a fake repo
+    helper = object.__new__(GithubHelper)
+    helper.essential_print_only = True
+    helper.repo = repo
+    helper._gh_object = None
+    helper._file_shas = {}
+    helper._repo_trees = {}
+    helper._content_cache = None
+    return helper
+
+
+def test_git_blob_sha_matches_git():
+    samples = [b"", b"hello\n", '{"x": 1, "name": "José"}'.encode('utf-8'), bytes(range(256)) * 3]
+    for data in samples:
+        if shutil.which('git'):
+            expected = subprocess.run(['git', 'hash-object', '--stdin'], input=data, capture_output=True,
+                                      check=True).stdout.decode().strip()
+            assert _git_blob_sha(data) == expected
+    assert _git_blob_sha(b"") == "e69de29bb2d1d6434b8b29ae775ad8c2e48c5391"
+    assert _git_blob_sha(b"hello\n") == "ce013625030ba8dba906f756967f9e9ca394464a"
+
+
+class _CommitRepo:
+    default_branch = 'main'
+
+    def __init__(self, files):
+        self.files = files
+        self.blobs = []
+        self.trees = []
+
+    def get_git_ref(self, name):
+        self.edited = None
+        ref = Obj(object=Obj(sha='head'))
+        ref.edit = lambda sha: setattr(self, 'edited', sha)
+        return ref
+
+    def get_git_commit(self, sha):
+        return Obj(sha=sha, tree=Obj(sha='base-tree'))
+
+    def get_git_tree(self, sha, recursive=False):
+        if recursive and getattr(self, 'truncated', False):
+            return Obj(truncated=True, tree=[])
+        return Obj(truncated=False, tree=[Obj(path=path, type='blob', mode=mode, sha=_git_blob_sha(data))
+                                          for path, (mode, data) in self.files.items()])
+
+    def create_git_blob(self, content, encoding):
+        self.blobs.append(base64.b64decode(content))
+        return Obj(sha=f"blob{len(self.blobs)}")
+
+    def create_git_tree(self, elements, base_tree):
+        self.trees.append([element._identity for element in elements])
+        return Obj(sha='new-tree')
+
+    def create_git_commit(self, message, tree, parents):
+        return Obj(sha='new-commit', message=message)
+
+
+def test_commit_files_builds_tree_elements():
+    repo = _CommitRepo({'same.json': ('100644', b'{"a": 1}'), 'run.sh': ('100755', b'echo 1'),
+                        'old.txt': ('100644', b'old')})
+    helper = _offline_helper(repo)
+
+    status = helper.commit_files({'same.json': {"a": 1}, 'run.sh': 'echo 2', ('data', 'new.txt'): 'x' * 10,
+                                  'big.txt': 'y' * 100, 'image.bin': b'\xff\xfe', 'old.txt': None,
+                                  'missing.txt': None}, 'Publish', max_inline_bytes=50)
+
+    assert status['unchanged'] == ['same.json', 'missing.txt'], "Identical files and missing deletions are skipped"
+    assert status['deleted'] == ['old.txt'] and repo.edited == 'new-commit'
+    elements = {element['path']: element for element in repo.trees[0]}
+    assert elements['run.sh'] == {'path': 'run.sh', 'mode': '100755', 'type': 'blob', 'content': 'echo 2'}, \
+        "Small text files are inline and keep their mode"
+    assert elements['data/new.txt']['content'] == 'x' * 10
+    assert elements['old.txt']['sha'] is None
+    assert sorted(repo.blobs) == [b'y' * 100, b'\xff\xfe'], "Large and binary files are uploaded as blobs"
+    assert {elements['big.txt']['sha'], elements['image.bin']['sha']} == {'blob1', 'blob2'}
+    assert helper._file_shas['big.txt'] == _git_blob_sha(b'y' * 100)
+
+    status = helper.commit_files({'same.json': {"a": 1}}, 'Nothing')
+    assert status['commit'] is None and len(repo.trees) == 1, "No commit is made when nothing changed"
+
+    status = helper.commit_files({'run.sh': 'echo 3', 'same.json': {"a": 1}, 'gone.txt': None}, 'Rewrite',
+                                 skip_unchanged=False)
+    elements = {element['path']: element for element in repo.trees[-1]}
+    assert elements['run.sh']['mode'] == '100755', "Modes are kept without skip_unchanged too"
+    assert 'same.json' in elements and 'gone.txt' not in elements, "Deletions of unknown paths are never sent"
+    assert status['unchanged'] == ['gone.txt']
+
+    repo.truncated = True
+    helper.commit_files({'run.sh': 'echo 4'}, 'Large repository')
+    assert repo.trees[-1][0]['mode'] == '100755', "Modes are read from a truncated tree as well"
+
+
+class _FileRepo:
+    def __init__(self, sha, fail_status=409):
+        self.sha = sha
+        self.fail_status = fail_status
+        self.gets = 0
+        self.writes = []
+
+    def get_contents(self, path, ref=None):
+        self.gets += 1
+        return Obj(path=path, sha=self.sha, encoding='base64', decoded_content=b'old')
+
+    def update_file(self, path, message, content, sha):
+        from github.GithubException import GithubException
+        self.writes.append(sha)
+        if sha != self.sha:
+            raise GithubException(self.fail_status, {"message": "sha does not match"}, {})
+        self.sha = f"after-{len(self.writes)}"
+        return {'content': Obj(sha=self.sha), 'commit': Obj(sha='c')}
+
+
+def test_with_fresh_sha_retries_once_with_a_fetched_sha():
+    from github.GithubException import GithubException
+
+    for status in (409, 422):
+        repo = _FileRepo('fresh', fail_status=status)
+        helper = _offline_helper(repo)
+        helper._file_shas['a.txt'] = 'stale'
+        helper.update_file('new', 'a.txt')
+        assert repo.writes == ['stale', 'fresh'] and repo.gets == 1, "A stale cached SHA is refetched once"
+        assert helper._file_shas['a.txt'] == 'after-2'
+
+    repo = _FileRepo('fresh', fail_status=500)
+    helper = _offline_helper(repo)
+    helper._file_shas['a.txt'] = 'stale'
+    try:
+        helper.update_file('new', 'a.txt')
+        assert False, "Other errors are raised"
+    except GithubException as e:
+        assert e.status == 500 and repo.writes == ['stale']
+
+    class ConflictingRepo(_FileRepo):
+        def update_file(self, path, message, content, sha):
+            self.writes.append(sha)
+            raise GithubException(409, {"message": "conflict"}, {})
+
+    repo = ConflictingRepo('fresh')
+    try:
+        _offline_helper(repo).update_file('new', 'a.txt')
+        assert False, "A conflict with a freshly fetched SHA is not retried"
+    except GithubException:
+        assert repo.gets == 1 and repo.writes == ['fresh']
+
+
+def test_content_cache_lru_and_disk_pruning(tmp_path):
+    import os
+    from lukhed_basic_utils.githubCommon import GithubContentCache
+
+    cache = GithubContentCache(max_memory_bytes=100)
+    cache.set(('r', 'a', ''), 'ea', 'a' * 40)
+    cache.set(('r', 'b', ''), 'eb', 'b' * 40)
+    assert cache.get(('r', 'a', ''))['etag'] == 'ea'
+    cache.set(('r', 'c', ''), 'ec', 'c' * 40)
+    assert cache.get(('r', 'b', '')) is None, "The least recently used entry is evicted past the byte cap"
+    assert cache.get_stats()['entries'] == 2 and cache.get_stats()['memory_bytes'] <= 100
+    cache.set(('r', 'huge', ''), 'eh', 'h' * 500)
+    assert cache.get(('r', 'huge', '')) is None, "Entries larger than the cap are not kept in memory"
+    assert (cache.stats['hits'], cache.stats['misses'], cache.stats['evictions']) == (1, 2, 1)
+
+    cache = GithubContentCache(cache_dir=str(tmp_path), max_disk_bytes=10 ** 6)
+    cache.set(('r', 'old', ''), 'e1', 'o' * 100)
+    cache.set(('r', 'new', ''), 'e2', 'n' * 100)
+    os.utime(cache._disk_path(('r', 'old', '')), (1, 1))
+    file_size = os.path.getsize(cache._disk_path(('r', 'new', '')))
+    cache.max_disk_bytes = file_size * 2
+    cache.set(('r', 'newest', ''), 'e3', 'x' * 100)
+    assert not os.path.exists(cache._disk_path(('r', 'old', ''))), "The least recently used file is pruned"
+    assert os.path.exists(cache._disk_path(('r', 'new', '')))
+
+    reloaded = GithubContentCache(cache_dir=str(tmp_path))
+    entry = reloaded.get(('r', 'new', ''))
+    assert (entry['etag'], entry['data']) == ('e2', 'n' * 100), "The disk cache survives between instances"
+
+
+class _ConditionalRequester:
+    is_not_lazy = True
+
+    def __init__(self, data, etag):
+        self.data = data
+        self.etag = etag
+        self.requests = []
+
+    def requestJsonAndCheck(self, verb, url, parameters=None, headers=None, follow_302_redirect=False):
+        self.requests.append(headers)
+        if headers and headers.get("If-None-Match") == self.etag:
+            return {}, None
+        return {'etag': self.etag}, self.data
+
+
+def test_content_cache_revalidates_with_etag():
+    data = {'type': 'file', 'name': 'a.json', 'path': 'a.json', 'sha': 's1', 'encoding': 'base64',
+            'content': base64.b64encode(b'{"x": 1}').decode('ascii')}
+    requester = _ConditionalRequester(data, '"v1"')
+    helper = _offline_helper(Obj(full_name='me/repo', url='https://api.github.com/repos/me/repo',
+                                 requester=requester))
+    cache = helper.enable_content_cache()
+
+    assert helper.retrieve_file_content('a.json') == {'x': 1}
+    assert helper.retrieve_file_content('a.json') == {'x': 1}
+    assert requester.requests == [None, {"If-None-Match": '"v1"'}], "The second read is a conditional request"
+    stats = cache.get_stats()
+    assert (stats['hits'], stats['misses'], stats['not_modified']) == (1, 1, 1)
+
+    requester.data = dict(data, sha='s2', content=base64.b64encode(b'{"x": 2}').decode('ascii'))
+    requester.etag = '"v2"'
+    assert helper.retrieve_file_content('a.json') == {'x': 2}, "Changed content replaces the cached copy"
+    assert cache.get_stats()['not_modified'] == 1 and helper._file_shas['a.json'] == 's2'
+
+
+def test_content_cache_downloads_large_files_only_to_decode(monkeypatch):
+    from lukhed_basic_utils import githubCommon
+
+    downloads = []
+    monkeypatch.setattr(githubCommon.rC, 'make_request',
+                        lambda url: downloads.append(url) or Obj(content=b'{"big": true}', raise_for_status=lambda: None))
+    data = {'type': 'file', 'name': 'big.json', 'path': 'big.json', 'sha': 'b1', 'encoding': 'none',
+            'content': '', 'download_url': 'https://raw.example/big.json'}
+    requester = _ConditionalRequester(data, '"v1"')
+    helper = _offline_helper(Obj(full_name='me/repo', url='https://api.github.com/repos/me/repo',
+                                 requester=requester))
+    helper.enable_content_cache()
+
+    assert helper._get_file_sha('big.json') == 'b1'
+    assert helper.retrieve_file_content('big.json', decode=False).sha == 'b1'
+    assert downloads == [], "Reading the SHA or raw metadata never downloads the file"
+
+    assert helper.retrieve_file_content('big.json') == {'big': True}
+    assert helper.retrieve_file_content('big.json') == {'big': True}
+    assert downloads == ['https://raw.example/big.json'], "The first decode fills the cached entry"
+
+
+class _ManyFilesRepo:
+    default_branch = 'main'
+
+    def __init__(self, files):
+        self.files = files
+        self.tree_requests = 0
+
+    def get_contents(self, path, ref=None):
+        from github.GithubException import UnknownObjectException
+        if path not in self.files:
+            raise UnknownObjectException(404, {"message": "Not Found"}, {})
+        return Obj(path=path, sha='sha:' + path, encoding='base64', decoded_content=self.files[path])
+
+    def get_git_tree(self, ref, recursive=False):
+        self.tree_requests += 1
+        return Obj(truncated=False, tree=[Obj(path=path, type='blob', size=len(data), sha='sha:' + path)
+                                          for path, data in self.files.items()])
+
+    def get_git_blob(self, sha):
+        return Obj(content=base64.b64encode(self.files[sha[4:]]).decode('ascii'))
+
+
+def test_retrieve_many_yields_every_path(monkeypatch, capsys):
+    import time
+
+    files = {f'games/{week}.json': b'{"week": %d}' % week for week in range(1, 30)}
+    repo = _ManyFilesRepo(files)
+    helper = _offline_helper(repo)
+    paths = list(files) + [('games', 'missing.json')]
+
+    for use_tree in (False, True):
+        results = dict(helper.retrieve_many(paths, max_workers=4, use_tree=use_tree))
+        assert len(results) == 30 and results['games/missing.json'] is None
+        assert all(results[f'games/{week}.json'] == {'week': week} for week in range(1, 30))
+    assert repo.tree_requests == 1
+
+    sleeps = []
+    monkeypatch.setattr(time, 'sleep', sleeps.append)
+    helper._gh_object = Obj(rate_limiting=(10, 5000), rate_limiting_resettime=time.time() + 30)
+    assert dict(helper.retrieve_many(['games/1.json'], min_rate_limit_remaining=50)) == {'games/1.json': {'week': 1}}
+    assert len(sleeps) == 1 and sleeps[0] > 0, "Retrieval pauses until the rate limit resets"
+    assert capsys.readouterr().out == "", "essential_print_only silences the rate limit message"
+
+
+class _TreeRepo:
+    default_branch = 'main'
+
+    def __init__(self, truncate_root=False):
+        self.truncate_root = truncate_root
+        self.requests = []
+        self.entries = {
+            'main': [('a.txt', 'blob', 3, 'sha-a'), ('games', 'tree', None, 'sha-games'),
+                     ('games/2024', 'tree', None, 'sha-2024'), ('games/2024/w1.json', 'blob', 9, 'sha-w1'),
+                     ('games/notes.md', 'blob', 4, 'sha-notes'), ('gamesx.json', 'blob', 1, 'sha-gx')],
+            'sha-games': [('2024', 'tree', None, 'sha-2024'), ('2024/w1.json', 'blob', 9, 'sha-w1'),
+                          ('notes.md', 'blob', 4, 'sha-notes')],
+        }
+
+    def get_git_tree(self, sha, recursive=False):
+        self.requests.append((sha, recursive))
+        entries = self.entries[sha]
+        truncated = sha == 'main' and recursive and self.truncate_root
+        if sha == 'main' and not recursive:
+            entries = [entry for entry in entries if '/' not in entry[0]]
+        return Obj(truncated=truncated, tree=[Obj(path=path, type=kind, size=size, sha=sha_)
+                                              for path, kind, size, sha_ in entries])
+
+
+def test_recursive_listing_prefix_pattern_and_file_exists():
+    repo = _TreeRepo()
+    helper = _offline_helper(repo)
+
+    listing = helper.get_files_in_repo_path(['games'], recursive=True)
+    assert [entry['path'] for entry in listing] == ['games/2024', 'games/2024/w1.json', 'games/notes.md'], \
+        "Only entries below the directory are returned, not siblings sharing the prefix"
+    assert listing[1] == {'path': 'games/2024/w1.json', 'type': 'blob', 'size': 9, 'sha': 'sha-w1'}
+    assert [entry['path'] for entry in helper.get_files_in_repo_path(recursive=True, pattern='*.json')] == \
+        ['games/2024/w1.json', 'gamesx.json']
+
+    assert helper.file_exists('games/notes.md') and helper.file_exists('games')
+    assert not helper.file_exists(['games', 'missing.json'])
+    assert repo.requests == [('main', True)], "The cached listing answers file_exists"
+
+    repo = _TreeRepo(truncate_root=True)
+    helper = _offline_helper(repo)
+    paths = [entry['path'] for entry in helper.get_files_in_repo_path(recursive=True)]
+    assert sorted(paths) == sorted(path for path, _, _, _ in repo.entries['main']), \
+        "A truncated tree is walked per subtree"
+    assert repo.requests == [('main', True), ('main', False), ('sha-games', True)]
@@ -0,0 +1,542 @@
+import sys
+import threading
+import inspect
+import datetime
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from lukhed_basic_utils.sqlCommon import SqlConnectionPool, _build_where_clause, _encode_copy_text_row, \
+    _encode_copy_csv_row, _chunk_rows_by_size, SchemaCache, \
+    QueryResultCache, _CACHE_MISS, _column_batch_to_array, _concatenate_column_batches, \
+    AsyncSqlHelper, AsyncPostgresSqlHelper, SqlHelper, _prepare_existence_keys, \
+    StatementCache, _to_positional_parameters, _split_condition_groups, _statement_shape, \
+    QueryInstrumentation, _resolve_export_format, _iter_import_records, _build_import_row_converter, \
+    _IMPORT_CONVERTERS, _group_append_values
+
+
+class _FakeConnection:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_connection_pool_reuses_connections():
+    pool = SqlConnectionPool(_FakeConnection, lambda c: not c.closed, min_size=1, max_size=2)
+    first = pool.checkout()
+    pool.checkin(first)
+    second = pool.checkout()
+    assert first is second, "Pool should hand back the idle connection instead of opening a new one"
+    pool.checkin(second)
+    assert pool.get_pool_status()['created'] == 1
+
+
+def test_connection_pool_max_size_and_timeout():
+    pool = SqlConnectionPool(_FakeConnection, lambda c: True, min_size=0, max_size=1, checkout_timeout=0.05)
+    held = pool.checkout()
+    try:
+        pool.checkout()
+        assert False, "Checkout beyond max_size should time out"
+    except TimeoutError:
+        pass
+
+    # A waiting thread gets the connection as soon as it is checked in
+    results = []
+    pool.checkout_timeout = 5
+    waiter = threading.Thread(target=lambda: results.append(pool.checkout()))
+    waiter.start()
+    pool.checkin(held)
+    waiter.join(5)
+    assert results == [held]
+
+
+def test_connection_pool_health_check_and_idle_timeout():
+    pool = SqlConnectionPool(_FakeConnection, lambda c: not c.closed, min_size=0, max_size=2,
+                             idle_timeout=0, health_check_interval=0)
+    connection = pool.checkout()
+    connection.closed = True
+    pool.checkin(connection)
+    replacement = pool.checkout()
+    assert replacement is not connection, "Dead or expired connections should not be handed out"
+    pool.checkin(replacement, discard=True)
+    assert pool.get_pool_status()['size'] == 0
+
+
+def test_build_where_clause():
+    assert _build_where_clause(()) == ("", [])
+    assert _build_where_clause((('a', 1), ('b', 2))) == ("a = %s AND b = %s", [1, 2])
+    assert _build_where_clause(([('a', 1)], [('a', 2), ('b', 3)])) == \
+        ("(a = %s) OR (a = %s AND b = %s)", [1, 2, 3])
+
+
+def test_copy_row_encoding():
+    row = [1, None, 'a\tb\nc\\d', True, {'k': 'v'}, b'\x00\xff', '']
+    assert _encode_copy_text_row(row) == '1\t\\N\ta\\tb\\nc\\\\d\tt\t{"k": "v"}\t\\\\x00ff\t\n'
+    assert _encode_copy_csv_row(row) == '1,,"a\tb\nc\\d",t,"{""k"": ""v""}","\\x00ff",""\n'
+
+
+def test_chunk_rows_by_size():
+    rows = ([i, 'x' * 10] for i in range(10))
+    chunks = list(_chunk_rows_by_size(rows, max_bytes=50))
+    assert sum(len(chunk) for chunk in chunks) == 10
+    assert all(len(chunk) == 3 for chunk in chunks[:-1]), "Each row is estimated at 15 bytes"
+
+    # A row bigger than the budget still gets sent, on its own
+    assert list(_chunk_rows_by_size([['y' * 100], [1]], max_bytes=50)) == [[['y' * 100]], [[1]]]
+    assert len(list(_chunk_rows_by_size([[1]] * 5, max_bytes=1000, max_rows=2))) == 3
+
+
+def test_schema_cache_invalidation():
+    cache = SchemaCache(ttl=None)
+    cache.set('db', None, 'tables', ['a', 'b'])
+    cache.set('db', 'a', 'columns', ['id'])
+    cache.set('db', 'b', 'columns', ['id'])
+    cache.set('other_db', 'a', 'columns', ['x'])
+
+    cache.invalidate('db', 'a')
+    assert cache.get('db', 'a', 'columns') is None
+    assert cache.get('db', None, 'tables') is None, "Table list must be dropped with any table of the database"
+    assert cache.get('db', 'b', 'columns') == ['id']
+    assert cache.get('other_db', 'a', 'columns') == ['x']
+
+    expired = SchemaCache(ttl=-1)
+    expired.set('db', 'a', 'columns', ['id'])
+    assert expired.get('db', 'a', 'columns') is None
+
+
+def test_query_result_cache_lru_and_invalidation():
+    cache = QueryResultCache(max_entries=2, ttl=None)
+    cache.set('db', 'a', 'SELECT * FROM a WHERE id = %s', [1], [[1, 'x']])
+    cache.set('db', 'b', 'SELECT   name FROM b', None, None)
+    assert cache.get('db', 'SELECT name FROM b', None) is None, "Cached None must be distinguishable from a miss"
+    assert cache.get('db', 'SELECT * FROM a WHERE id = %s', [2]) is _CACHE_MISS
+
+    cache.get('db', 'SELECT * FROM a WHERE id = %s', [1])
+    cache.set('db', 'c', 'SELECT * FROM c', None, [])
+    assert cache.get('db', 'SELECT name FROM b', None) is _CACHE_MISS, "Least recently used entry is evicted"
+
+    cached = cache.get('db', 'SELECT * FROM a WHERE id = %s', [1])
+    cached.append('mutated')
+    assert cache.get('db', 'SELECT * FROM a WHERE id = %s', [1]) == [[1, 'x']]
+
+    cache.invalidate('db', 'a')
+    assert cache.get('db', 'SELECT * FROM a WHERE id = %s', [1]) is _CACHE_MISS
+    assert cache.get('db', 'SELECT * FROM c', None) == []
+    assert cache.get_stats()['evictions'] == 1
+
+
+def test_column_batch_to_array():
+    assert _column_batch_to_array([1, 2], 'int64').dtype == 'int64'
+    with_null = _column_batch_to_array([1, None], 'int64')
+    assert with_null.dtype == 'float64' and str(with_null[1]) == 'nan', "Integer NULLs are widened to NaN"
+    assert _column_batch_to_array([True, None], 'bool').tolist() == [True, None], "NULL must not become False"
+    assert _column_batch_to_array([datetime.date(2024, 1, 2), None], 'datetime64[D]').dtype == 'datetime64[D]'
+
+    nested = _column_batch_to_array([[1, 2], [3, 4]], None)
+    assert nested.shape == (2,) and nested[0] == [1, 2], "Object columns keep list values as single cells"
+
+    column = _concatenate_column_batches([_column_batch_to_array([1], 'int64'),
+                                          _column_batch_to_array([None], 'int64')], 'int64')
+    assert column.dtype == 'float64' and column[0] == 1
+    assert _concatenate_column_batches([], 'int64').dtype == 'int64'
+
+
+def test_async_helpers_mirror_sync_surface():
+    for async_class in (AsyncSqlHelper, AsyncPostgresSqlHelper):
+        for name in ('query_table_by_columns', 'insert_data', 'get_table_as_list', 'get_table_as_frame',
+                     'purge_rows', 'export_table'):
+            assert inspect.iscoroutinefunction(getattr(async_class, name)), f"{async_class.__name__}.{name}"
+        assert inspect.isasyncgenfunction(async_class.iter_table)
+        assert not hasattr(async_class, 'enable_result_cache'), "Configuration methods are passed through, not wrapped"
+
+
+def test_keyset_page_query():
+    helper = object.__new__(SqlHelper)
+    assert helper._build_page_query('games', ['id'], (), None, False, after_key=False) == \
+        ("SELECT * FROM games ORDER BY id LIMIT %s", [])
+    assert helper._build_page_query('games', ['season', 'id'], (('league', 'nfl'),), ['season', 'id'], True,
+                                    after_key=True) == \
+        ("SELECT season, id FROM games WHERE (league = %s) AND (season, id) < (%s, %s) "
+         "ORDER BY season DESC, id DESC LIMIT %s", ['nfl'])
+
+
+def test_prepare_existence_keys():
+    assert _prepare_existence_keys(['a', 'b'], [[1, 2], (1, 2), [3, None], [4, 5]]) == \
+        (['a', 'b'], [(1, 2), (4, 5)], False)
+    assert _prepare_existence_keys('a', [1, 1, None, 2]) == (['a'], [(1,), (2,)], True)
+
+
+def test_statement_cache_returns_same_statement():
+    cache = StatementCache(max_entries=1)
+    first = cache.get_or_build(('m', 't', ('id',)), lambda: "SELECT * FROM t WHERE " + "id = %s")
+    assert cache.get_or_build(('m', 't', ('id',)), lambda: "rebuilt") is first
+    cache.get_or_build(('m', 't', ('name',)), lambda: "SELECT * FROM t WHERE name = %s")
+    assert cache.get_or_build(('m', 't', ('id',)), lambda: "rebuilt") == "rebuilt"
+    assert cache.get_stats() == {"hits": 1, "misses": 3, "entries": 1}
+
+    assert _split_condition_groups((('a', 1), ('b', 2))) == ((('a', 'b'),), [1, 2])
+    assert _split_condition_groups(([('a', 1)], [('b', 2)])) == ((('a',), ('b',)), [1, 2])
+    assert _to_positional_parameters("SELECT %s, '5%%' WHERE a = %s") == ("SELECT $1, '5%' WHERE a = $2", 2)
+
+
+def test_statement_shape_and_instrumentation_stats():
+    assert _statement_shape("INSERT INTO t (a, b)\n  VALUES (%s, %s), (%s, %s), (%s, %s)") == \
+        "INSERT INTO t (a, b) VALUES (%s, %s), ..."
+    assert _statement_shape("SELECT * FROM t1 WHERE name = 'it''s' AND id IN (1, 2, 3, 4, 5) LIMIT 10") == \
+        "SELECT * FROM t1 WHERE name = ? AND id IN (?, ...) LIMIT ?"
+
+    events = []
+    instrumentation = QueryInstrumentation(slow_query_threshold=0.5, log_slow_queries=False)
+    instrumentation.hooks.append(events.append)
+    with instrumentation.method_scope('get_total_rows'):
+        assert instrumentation.current_method() == 'get_total_rows'
+        instrumentation.record({"method": 'get_total_rows', "statement": "SELECT COUNT(*) FROM t", "seconds": 1.0})
+    assert instrumentation.current_method() is None
+    stats = instrumentation.get_stats()['get_total_rows']
+    assert stats['calls'] == 1 and stats['statements'] == 1 and sum(stats['histogram'].values()) == 1
+    assert len(events) == 1 and len(instrumentation.slow_queries) == 1
+
+
+def test_resolve_export_format():
+    assert _resolve_export_format('games.csv') == ('csv', False)
+    assert _resolve_export_format('games.jsonl.gz') == ('jsonl', True)
+    assert _resolve_export_format('games.out', 'PARQUET') == ('parquet', False)
+    assert _resolve_export_format('games.json', compress=True) == ('jsonl', True)
+    for bad in (('games.xml',), ('games.parquet.gz',)):
+        try:
+            _resolve_export_format(*bad)
+            assert False, f"{bad} should be rejected"
+        except ValueError:
+            pass
+
+
+def test_import_records_and_conversion(tmp_path):
+    path = tmp_path / 'games.csv'
+    path.write_text('id,active,day\n1,yes,2024-01-02\n\n2,no\n3,maybe,\n', encoding='utf-8')
+    records = list(_iter_import_records(path, 'csv', False, 10))
+    assert records[0] == (2, {'id': '1', 'active': 'yes', 'day': '2024-01-02'}, None)
+    assert records[1][2] == "Expected 3 fields, found 2" and len(records) == 3
+
+    convert_row = _build_import_row_converter(
+        [_IMPORT_CONVERTERS[dtype] for dtype in ('int64', 'bool', 'datetime64[D]')], frozenset(['']))
+    assert convert_row(['1', 'yes', '2024-01-02']) == [1, True, datetime.date(2024, 1, 2)]
+    assert convert_row([' 7 ', 'F', '']) == [7, False, None]
+    for bad in (['x', 'yes', ''], ['1', 'maybe', ''], [1.5, True, None]):
+        try:
+            convert_row(bad)
+            assert False, f"{bad} should be rejected"
+        except ValueError:
+            pass
+
+    helper = _scripted_helper()
+    try:
+        helper.import_file('games', str(path), column_map={'id': 'game_id', 'Active': 'active'})
+        assert False, "Unknown column_map keys are rejected"
+    except ValueError as e:
+        assert 'Active' in str(e)
+    assert not any(query.startswith('INSERT') for query, _ in helper.db_connection.statements)
+
+
+def test_group_append_values():
+    pairs = [(1, ['a', 10]), (2, ['b', 20]), (1, ['c', 30])]
+    assert _group_append_values(pairs, True, 2) == [[1, ['a', 'c'], [10, 30]], [2, ['b'], [20]]]
+    assert _group_append_values([((1, 2024), ['x'])], False, 1) == [[1, 2024, ['x']]]
+    try:
+        _group_append_values([(1, ['a'])], True, 2)
+        assert False, "Each pair needs one value per column"
+    except ValueError:
+        pass
+
+
+def test_lost_connection_retries_reads_only():
+    import mysql.connector
+
+    class DroppingConnection:
+        opened = 0
+
+        def __init__(self):
+            DroppingConnection.opened += 1
+            self.alive = True
+            self.pings = 0
+
+        def is_connected(self):
+            self.pings += 1
+            return self.alive
+
+        def cursor(self, **kwargs):
+            connection = self
+
+            class Cursor:
+                rowcount = 1
+
+                def execute(self, query, params=None):
+                    if not connection.alive:
+                        raise mysql.connector.errors.OperationalError("Lost connection", errno=2013)
+
+                def fetchall(self):
+                    return [(1,)]
+            return Cursor()
+
+        def commit(self):
+            pass
+
+        def close(self):
+            self.alive = False
+
+    helper = object.__new__(SqlHelper)
+    helper._init_connection_state()
+    helper.database_name = 'db'
+    helper._open_connection = DroppingConnection
+    helper.db_connection = DroppingConnection()
+    helper.cursor = helper.db_connection.cursor()
+
+    helper.query_table_by_columns('t', ('id', 1))
+    helper.query_table_by_columns('t', ('id', 1))
+    assert helper.db_connection.pings == 1, "A verified connection is trusted for the liveness interval"
+
+    helper.db_connection.alive = False
+    assert helper.query_table_by_columns('t', ('id', 1)) == [[1]], "Reads are retried on a new connection"
+    helper.db_connection.alive = False
+    try:
+        helper.update_single_value_in_table('t', 'v', 1, ('id', 1))
+        assert False, "Writes are not retried"
+    except mysql.connector.errors.OperationalError:
+        pass
+    assert helper.db_connection is None, "The lost connection is dropped so the next call reconnects"
+
+
+def test_failed_insert_inside_batch_fails_the_block():
+    class RecordingConnection:
+        def __init__(self):
+            self.commits = 0
+            self.rollbacks = 0
+
+        def is_connected(self):
+            return True
+
+        def cursor(self, **kwargs):
+            class Cursor:
+                rowcount = 1
+
+                def execute(self, query, params=None):
+                    if 'bad' in query:
+                        raise ValueError("insert failed")
+            return Cursor()
+
+        def commit(self):
+            self.commits += 1
+
+        def rollback(self):
+            self.rollbacks += 1
+
+    helper = object.__new__(SqlHelper)
+    helper._init_connection_state()
+    helper.database_name = 'db'
+    helper.db_connection = RecordingConnection()
+    helper.cursor = helper.db_connection.cursor()
+    connection = helper.db_connection
+
+    try:
+        with helper.batch():
+            helper.update_single_value_in_table('t', 'v', 1, ('id', 1))
+            helper.insert_data_as_table('bad', ['a'], [[1]], max_statement_bytes=1000)
+        assert False, "A failed insert inside batch() is raised"
+    except ValueError:
+        pass
+    assert (connection.commits, connection.rollbacks) == (0, 1), "The block is rolled back once, as a whole"
+
+    try:
+        with helper.batch():
+            helper.update_single_value_in_table('t', 'v', 1, ('id', 1))
+            try:
+                helper.insert_data_as_table('bad', ['a'], [[1]], max_statement_bytes=1000)
+            except ValueError:
+                pass
+            assert connection.rollbacks == 1, "The helper does not roll back the enclosing block itself"
+            helper.update_single_value_in_table('t', 'v', 2, ('id', 2))
+        assert False, "Leaving a failed block raises even if the error was caught"
+    except RuntimeError:
+        pass
+    assert (connection.commits, connection.rollbacks) == (0, 2)
+
+    helper.insert_data_as_table('bad', ['a'], [[1]], max_statement_bytes=1000)
+    assert connection.rollbacks == 3, "Outside a block the failed insert is still rolled back and reported"
+
+
+def test_busy_connection_is_not_pinged(monkeypatch):
+    class CountingConnection:
+        pings = 0
+
+        def is_connected(self):
+            self.pings += 1
+            return True
+
+        def cursor(self, **kwargs):
+            class Cursor:
+                rowcount = 1
+
+                def execute(self, query, params=None):
+                    pass
+
+                def fetchall(self):
+                    return [(1,)]
+            return Cursor()
+
+    clock = [1000.0]
+    monkeypatch.setattr(time, 'monotonic', lambda: clock[0])
+    helper = object.__new__(SqlHelper)
+    helper._init_connection_state()
+    helper.database_name = 'db'
+    helper.db_connection = CountingConnection()
+    helper.cursor = helper.db_connection.cursor()
+    helper.set_liveness_check_interval(10)
+
+    for _ in range(20):
+        helper.query_table_by_columns('t', ('id', 1))
+        clock[0] += 5
+    assert helper.db_connection.pings == 1, "A connection used within the interval is never pinged again"
+
+    clock[0] += 60
+    helper.query_table_by_columns('t', ('id', 1))
+    assert helper.db_connection.pings == 2, "An idle connection is pinged before it is used"
+
+
+class _ScriptedConnection:
+    """MySQL-like fake connection that records statements and fails those containing any of fail_on."""
+    def __init__(self, fail_on=(), rows=None, description=None):
+        self.fail_on = list(fail_on)
+        self.rows = rows if rows is not None else []
+        self.description = description
+        self.rowcount = 1
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def is_connected(self):
+        return True
+
+    def cursor(self, **kwargs):
+        connection = self
+
+        class Cursor:
+            @property
+            def rowcount(self):
+                return connection.rowcount
+
+            @property
+            def description(self):
+                return connection.description
+
+            def execute(self, query, params=None):
+                connection.statements.append((query, list(params or ())))
+                for text in connection.fail_on:
+                    if text in query:
+                        raise ValueError(f"statement failed: {text}")
+
+            def fetchone(self):
+                return (1 << 20,)
+
+            def fetchall(self):
+                return connection.rows
+        return Cursor()
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def _scripted_helper(**kwargs):
+    helper = object.__new__(SqlHelper)
+    helper._init_connection_state()
+    helper.database_name = 'db'
+    helper.db_connection = _ScriptedConnection(**kwargs)
+    helper.cursor = helper.db_connection.cursor()
+    return helper
+
+
+def test_upsert_rows_batches_on_duplicate_key():
+    helper = _scripted_helper()
+    stats = helper.upsert_rows('t', ['id', 'v'], [[1, 'a'], [1, 'b'], [3, 'c']], conflict_columns=['id'],
+                               chunk_size=2, max_statement_bytes=10000)
+    # MySQL resolves repeated keys within a statement itself, so every input row is sent
+    upserts = [statement for statement in helper.db_connection.statements if statement[0].startswith('INSERT')]
+    assert [params for _, params in upserts] == [[1, 'a', 1, 'b'], [3, 'c']]
+    assert upserts[0][0].endswith("ON DUPLICATE KEY UPDATE v = VALUES(v)")
+    assert (stats['rows'], stats['statements'], helper.db_connection.commits) == (3, 2, 1)
+
+    helper.upsert_rows('t', ['id', 'v'], [[1, 'a']], conflict_columns=['id'], update_columns=[],
+                       max_statement_bytes=10000)
+    assert helper.db_connection.statements[-1][0].endswith("ON DUPLICATE KEY UPDATE id = id")
+
+
+def test_staging_table_cleanup_never_masks_the_error():
+    helper = _scripted_helper(fail_on=['UPDATE', 'DROP'], description=[('id', 3)])
+    try:
+        helper.bulk_append_values_to_columns('t', ['v'], 'id', [(1, [2])])
+        assert False, "The failing UPDATE is raised"
+    except ValueError as e:
+        assert 'UPDATE' in str(e), "A failing cleanup does not replace the original error"
+    statements = [query for query, _ in helper.db_connection.statements]
+    assert statements[-1].startswith('DROP TEMPORARY TABLE')
+    assert not any(query.startswith('ALTER') for query in statements), "ALTER TABLE would commit implicitly"
+    assert any(query.startswith('CREATE TEMPORARY TABLE') and '(INDEX (id))' in query for query in statements)
+
+
+def test_bulk_update_rows_staging_index_and_cleanup():
+    from mysql.connector.constants import FieldType
+
+    helper = _scripted_helper(description=[('k', FieldType.BLOB)])
+    with helper.transaction():
+        stats = helper.bulk_update_rows('t', ['k', 'v'], [['a', 1], ['b', 2]], chunk_size=1)
+        assert helper.db_connection.commits == 0
+    statements = [query for query, _ in helper.db_connection.statements]
+    assert not any(query.startswith('ALTER') for query in statements), "ALTER TABLE would commit the block"
+    assert any(query.startswith("CREATE TEMPORARY TABLE") and " (INDEX (k(191))) AS SELECT" in query
+               for query in statements), "TEXT keys are indexed on a prefix"
+    assert sum(query.startswith('UPDATE t AS target JOIN') for query in statements) == 2
+    assert statements[-1].startswith('DROP TEMPORARY TABLE')
+    assert (stats['rows'], stats['chunks'], helper.db_connection.commits) == (2, 2, 1)
+
+    helper = _scripted_helper(description=[('k', FieldType.JSON)], fail_on=['UPDATE', 'DROP'])
+    try:
+        helper.bulk_update_rows('t', ['k', 'v'], [['a', 1]])
+        assert False, "The failing UPDATE is raised"
+    except ValueError as e:
+        assert 'UPDATE' in str(e), "A failing cleanup does not replace the original error"
+    statements = [query for query, _ in helper.db_connection.statements]
+    assert not any('INDEX' in query for query in statements), "JSON keys cannot be indexed"
+    assert helper.db_connection.rollbacks == 1
+
+
+def test_append_values_to_columns_parameter_order():
+    helper = _scripted_helper()
+    helper.append_values_to_columns('t', ['a', 'b'], [1, 2], ('id', 5), ('season', 2024))
+    query, params = helper.db_connection.statements[-1]
+    assert query.index("JSON_ARRAY_APPEND(b") < query.index("WHERE")
+    assert params == [1, 2, 5, 2024], "SET values are bound before the WHERE values"
+
+    for values in ([1], [1, 2, 3]):
+        try:
+            helper.append_values_to_columns('t', ['a', 'b'], values, ('id', 5))
+            assert False, "One value per column is required"
+        except ValueError:
+            pass
+
+
+def test_purge_rows_caps_chunks_with_limit():
+    helper = _scripted_helper(rows=[[1], [1], [1]], description=[('k', 3)])
+    helper.db_connection.rowcount = 3
+    helper.purge_rows('log', 'k', ('level', 'debug'), max_rows=3, chunk_size=5, pause=0)
+    deletes = [statement for statement in helper.db_connection.statements if statement[0].startswith('DELETE')]
+    assert len(deletes) == 1, "max_rows is reached after one chunk"
+    query, params = deletes[0]
+    assert query.endswith("ORDER BY k LIMIT %s") and params == ['debug', 1, 3], "Ties at the boundary are capped"
+
+    helper.purge_rows('log', 'k', max_rows=3, chunk_size=5, pause=0, resume_from=1, descending=True)
+    query, params = helper.db_connection.statements[-1]
+    assert "k <= %s AND k >= %s ORDER BY k DESC LIMIT %s" in query and params == [1, 1, 3], \
+        "A resumed purge includes the last key, whose leftover ties were not deleted yet"